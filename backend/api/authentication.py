@@ -0,0 +1,70 @@
+"""
+Rol ve takım bilgisini taşıyan JWT kimlik doğrulaması.
+
+Access token'a kullanıcının rolü, takımı, yetki bayrakları ve sicil numarası
+claim olarak eklenir. JWT_STATELESS_AUTH açıkken API istekleri
+`JWTStatelessUserAuthentication` ile doğrulanır ve request.user, veritabanına
+gitmeden token'dan okunan `ClaimsTokenUser` nesnesi olur. Rol değişiklikleri
+ve hesap kapatma en geç access token süresi dolduğunda geçerli olur: token
+yenilenirken claim'ler veritabanından tekrar okunur.
+"""
+from functools import cached_property
+
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+USER_CLAIMS = ('role', 'team', 'employee_id', 'is_staff', 'is_superuser')
+
+
+def add_user_claims(token, user):
+    """Kullanıcının rol/takım claim'lerini token'a ekle"""
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class ClaimsTokenUser(TokenUser):
+    """
+    Token claim'lerinden oluşturulan kullanıcı. Claim içermeyen eski token'lar
+    en düşük yetkiyle (rolü boş) değerlendirilir.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', '')
+
+    @cached_property
+    def team(self):
+        return self.token.get('team', '')
+
+    @cached_property
+    def employee_id(self):
+        return self.token.get('employee_id', '')
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Giriş sırasında üretilen token çiftine kullanıcı claim'lerini ekler"""
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Yeni access token'ın claim'lerini refresh token'dan kopyalamak yerine
+    kullanıcı kaydından yeniden okur; pasif kullanıcılar token yenileyemez.
+    (Refresh token rotasyonu kullanılmıyor.)
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.payload.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        return {'access': str(add_user_claims(refresh.access_token, user))}
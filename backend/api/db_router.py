@@ -0,0 +1,85 @@
+"""
+Birincil / okuma replikası veritabanı yönlendiricisi.
+
+Okumalar varsayılan olarak birincil veritabanına gider. Liste, dışa aktarım
+ve rapor gibi ağır okumalar `replica_reads()` bağlamında (API'de
+ReplicaReadMixin ile) çalıştırıldığında replikaya yönlendirilir. Yazmalar her
+zaman birincil veritabanına gider ve aynı bağlamdaki sonraki okumaları da
+birincile sabitler. Bir kullanıcı yazma yaptıktan sonra REPLICA_PIN_SECONDS
+boyunca onun okumaları da birincilden yapılır (replikasyon gecikmesi nedeniyle
+kendi yazdığını göremediği durumlar olmasın diye).
+
+Replika tanımlı değilse (settings.DATABASES içinde DATABASE_REPLICA_ALIAS
+yoksa) tüm sorgular birincil veritabanına gider.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+_pinned = contextvars.ContextVar('replica_pinned', default=False)
+
+
+def replica_configured():
+    return settings.DATABASE_REPLICA_ALIAS in settings.DATABASES
+
+
+def read_alias():
+    """Mevcut bağlamda okumaların gideceği veritabanı"""
+    if _replica_reads.get() and not _pinned.get() and replica_configured():
+        return settings.DATABASE_REPLICA_ALIAS
+    return DEFAULT_DB_ALIAS
+
+
+def start_replica_reads():
+    """Bağlamda replika okumalarını aç; `stop_replica_reads` için jeton döndürür"""
+    return _replica_reads.set(True), _pinned.set(False)
+
+
+def stop_replica_reads(tokens):
+    replica_token, pinned_token = tokens
+    _pinned.reset(pinned_token)
+    _replica_reads.reset(replica_token)
+
+
+@contextmanager
+def replica_reads():
+    tokens = start_replica_reads()
+    try:
+        yield
+    finally:
+        stop_replica_reads(tokens)
+
+
+def pin_key(user_id):
+    return f'db-router:pin:{user_id}'
+
+
+def pin_user(user_id):
+    """Kullanıcının okumalarını bir süre birincil veritabanına sabitle"""
+    if replica_configured():
+        cache.set(pin_key(user_id), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_user_pinned(user_id):
+    return replica_configured() and bool(cache.get(pin_key(user_id)))
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        # Yazmadan sonra aynı bağlamdaki okumalar yazılanı görebilmeli
+        _pinned.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replika birincilin kopyasıdır; iki veritabanındaki nesneler ilişkilendirilebilir
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != settings.DATABASE_REPLICA_ALIAS
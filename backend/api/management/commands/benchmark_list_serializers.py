@@ -0,0 +1,82 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from backend.api.v1.serializers import (
+    CallSerializer, CallValuesSerializer, EvaluationSerializer, EvaluationValuesSerializer, parse_field_names,
+)
+from backend.core.models import Call, Evaluation
+
+TARGETS = {
+    'calls': (
+        lambda: Call.objects.select_related('agent').order_by('-call_date', '-id'),
+        CallSerializer, CallValuesSerializer,
+    ),
+    'evaluations': (
+        lambda: Evaluation.objects.select_related('evaluator', 'call__agent').order_by('-created_at', '-id'),
+        EvaluationSerializer, EvaluationValuesSerializer,
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = ('Liste yanıtlarında ModelSerializer ile values() tabanlı serializer\'ı karşılaştırır: '
+            'sayfa okuma + serileştirme + JSON render süresi. Mevcut veritabanındaki verileri kullanır '
+            '(bkz. generate_synthetic_data).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=sorted(TARGETS), action='append',
+                            help='Ölçülecek liste (varsayılan: hepsi)')
+        parser.add_argument('--page-size', type=int, action='append',
+                            help='Sayfa boyutu (birden fazla verilebilir; varsayılan 20 ve 500)')
+        parser.add_argument('--repeat', type=int, default=20, help='Her ölçümün tekrar sayısı')
+        parser.add_argument('--fields', help='?fields= seçimi (örn. id,total_score,created_at)')
+        parser.add_argument('--expand', help='?expand= seçimi (örn. agent_details)')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat pozitif olmalıdır')
+        request = APIRequestFactory().get('/api/v1/')
+        renderer = JSONRenderer()
+        context = {
+            'request': request,
+            'fields': parse_field_names(options['fields']) if options['fields'] else None,
+            'expand': parse_field_names(options['expand'] or ''),
+        }
+
+        for target in options['target'] or sorted(TARGETS):
+            queryset, serializer_class, values_serializer_class = TARGETS[target]
+            for page_size in options['page_size'] or [20, 500]:
+                def model_path():
+                    rows = list(queryset()[:page_size])
+                    return renderer.render(serializer_class(rows, many=True, context=context).data)
+
+                def values_path():
+                    serializer = values_serializer_class(context=context)
+                    rows = list(serializer.prepare(queryset())[:page_size])
+                    return renderer.render(serializer.serialize(rows))
+
+                content = values_path()
+                if json.loads(model_path()) != json.loads(content):
+                    raise CommandError(f'{target}: values() çıktısı ModelSerializer çıktısından farklı')
+                baseline = self.measure(model_path, options['repeat'])
+                fast = self.measure(values_path, options['repeat'])
+                self.stdout.write(
+                    f'{target:<12} sayfa={page_size:<5} ModelSerializer {baseline:8.2f} ms   '
+                    f'values() {fast:8.2f} ms   {baseline / fast:5.1f}x   {len(content):,} bayt'
+                )
+
+    @staticmethod
+    def measure(function, repeat):
+        """Medyan süre (ms); ilk çalıştırma ısınma olarak sayılmaz"""
+        function()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
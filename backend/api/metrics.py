@@ -0,0 +1,241 @@
+"""
+İstek başına performans metrikleri ve Prometheus metin biçiminde /metrics.
+
+MetricsMiddleware her istek için rota (URL adı, örn. 'call-list') ve metot
+etiketleriyle şunları kaydeder: toplam süre, SQL sorgu sayısı ve süresi
+(connection.execute_wrapper), serializer süresi (`timed('serializer')` ile
+işaretlenen bölümler), yanıtın render süresi ve yanıt boyutu. Kayıt süreç içi
+bir sözlükte tek kilit altında tutulur; istek başına maliyet birkaç
+mikrosaniyedir.
+
+Birden fazla worker süreci (gunicorn) için METRICS_MULTIPROC_DIR tanımlanır:
+her süreç kendi sayaçlarını en fazla METRICS_FLUSH_INTERVAL saniyede bir bu
+dizine `<pid>.json` olarak yazar, /metrics dizindeki tüm dosyaları toplar.
+Kapanan süreçlerin dosyaları silinmez (sayaçlar geri gitmez); dizin sunucu
+başlatılırken temizlenmelidir.
+
+/metrics METRICS_TOKEN ile korunur (Authorization: Bearer <token>); token
+tanımlı değilse endpoint 404 döner.
+"""
+import atexit
+import contextvars
+import glob
+import hmac
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# ad -> (tip, açıklama, kovalar)
+METRICS = {
+    'qm_http_requests_total': ('counter', 'İstek sayısı', None),
+    'qm_http_request_duration_seconds': ('histogram', 'İsteğin toplam süresi', DURATION_BUCKETS),
+    'qm_db_queries_per_request': ('histogram', 'İstek başına SQL sorgu sayısı', QUERY_COUNT_BUCKETS),
+    'qm_db_query_duration_seconds': ('histogram', 'İstek başına toplam SQL süresi', DURATION_BUCKETS),
+    'qm_serializer_duration_seconds': ('histogram', 'İstek başına serializer süresi', DURATION_BUCKETS),
+    'qm_render_duration_seconds': ('histogram', 'Yanıtın render (JSON/CSV) süresi', DURATION_BUCKETS),
+    'qm_http_response_size_bytes': ('histogram', 'Yanıt gövdesi boyutu', SIZE_BUCKETS),
+}
+
+
+class RequestMetrics:
+    """Bir isteğin süre bileşenleri (middleware doldurur)"""
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'render_started')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+current = contextvars.ContextVar('request_metrics', default=None)
+
+
+@contextmanager
+def timed(phase):
+    """Bölümün süresini mevcut isteğin `<phase>_time` bileşenine ekle (istek dışında etkisiz)"""
+    metrics = current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(metrics, f'{phase}_time', getattr(metrics, f'{phase}_time') + time.perf_counter() - started)
+
+
+class Registry:
+    """
+    Süreç içi metrik deposu. Örnekler (ad, etiketler) anahtarıyla tutulur;
+    sayaçta değer, histogramda [kova sayıları..., +Inf, toplam, adet] listesi.
+    Kova sayıları kümülatif değildir (gözlem başına tek artış); render toplar.
+    """
+
+    def __init__(self, directory='', flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.pid = os.getpid()
+        self.flushed_at = time.monotonic()
+
+    def _check_fork(self):
+        # Fork edilen süreç ebeveynin sayaçlarını kendi sayaçları gibi yazmamalı
+        if os.getpid() != self.pid:
+            self.samples = {}
+            self.pid = os.getpid()
+            self.flushed_at = time.monotonic()
+
+    def record(self, observations):
+        """`observations`: [(metrik adı, etiketler, değer)]; sayaçlar değer kadar artar"""
+        with self.lock:
+            self._check_fork()
+            for name, labels, value in observations:
+                kind, _, buckets = METRICS[name]
+                key = (name, labels)
+                if kind == 'counter':
+                    self.samples[key] = self.samples.get(key, 0) + value
+                    continue
+                sample = self.samples.get(key)
+                if sample is None:
+                    sample = self.samples[key] = [0] * (len(buckets) + 3)
+                sample[bisect_left(buckets, value)] += 1
+                sample[-2] += value
+                sample[-1] += 1
+            due = self.directory and time.monotonic() - self.flushed_at >= self.flush_interval
+        if due:
+            self.flush()
+
+    def snapshot(self):
+        with self.lock:
+            self._check_fork()
+            return [[name, list(labels), value if not isinstance(value, list) else list(value)]
+                    for (name, labels), value in self.samples.items()]
+
+    def snapshot_path(self):
+        return os.path.join(self.directory, f'{os.getpid()}.json')
+
+    def flush(self):
+        """Sayaçları süreç dosyasına yaz (geçici dosya + rename ile atomik); yazılan örnekleri döndür"""
+        data = self.snapshot()
+        if not self.directory:
+            return data
+        path = self.snapshot_path()
+        temporary = f'{path}.{threading.get_ident()}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temporary, path)
+        self.flushed_at = time.monotonic()
+        return data
+
+    def collect(self):
+        """Tüm süreçlerin örneklerini topla: {(ad, etiketler): değer}"""
+        snapshots = [self.flush()]
+        if self.directory:
+            own_path = self.snapshot_path()
+            for path in glob.glob(os.path.join(self.directory, '*.json')):
+                if path == own_path:
+                    continue
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    # Yazılmakta olan ya da bozuk dosya bir sonraki toplamada okunur
+                    continue
+        merged = {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot:
+                if name not in METRICS:
+                    continue
+                key = (name, tuple(tuple(pair) for pair in labels))
+                if isinstance(value, list):
+                    total = merged.setdefault(key, [0] * len(value))
+                    for index, item in enumerate(value):
+                        total[index] += item
+                else:
+                    merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def clear(self):
+        with self.lock:
+            self.samples = {}
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(samples):
+    """Örnekleri Prometheus metin biçimine (0.0.4) çevir"""
+    lines = []
+    for name, (kind, description, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for (sample_name, labels), value in sorted(samples.items()):
+            if sample_name != name:
+                continue
+            if kind == 'counter':
+                lines.append(f'{name}{_format_labels(labels)} {_format_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {value[-1]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_number(value[-2])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {value[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = Registry(
+    getattr(settings, 'METRICS_MULTIPROC_DIR', ''), getattr(settings, 'METRICS_FLUSH_INTERVAL', 5.0),
+)
+if registry.directory:
+    os.makedirs(registry.directory, exist_ok=True)
+    # Kapanışta son sayaçlar da dosyaya yazılsın
+    atexit.register(registry.flush)
+
+
+def metrics_view(request):
+    """Prometheus kazıma endpointi (Bearer METRICS_TOKEN ile)"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        raise Http404
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if not hmac.compare_digest(header.encode(), f'Bearer {token}'.encode()):
+        response = HttpResponse('Unauthorized', status=401, content_type='text/plain')
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+    return HttpResponse(render(registry.collect()), content_type=CONTENT_TYPE)
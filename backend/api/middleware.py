@@ -0,0 +1,98 @@
+"""
+İstek başına ölçüm middleware'leri.
+
+- MetricsMiddleware: rota bazında süre, SQL, serializer, render ve yanıt
+  boyutu metrikleri (backend/api/metrics.py, /metrics).
+- QueryCountHeaderMiddleware: yük testleri için API_QUERY_COUNT_HEADER
+  açıkken her yanıta isteğin çalıştırdığı sorgu sayısı (X-DB-Query-Count) ve
+  toplam süresi (X-DB-Query-Time, ms) eklenir.
+
+Akış halindeki yanıtlarda sadece yanıt başlamadan önce çalışan sorgular sayılır.
+"""
+import time
+
+from django.db import connections
+
+from backend.api import metrics
+
+
+class MetricsMiddleware:
+    # Çözümlenemeyen URL'ler tek etiket altında toplanır (etiket sayısı sınırlı kalsın)
+    unmatched_route = 'unmatched'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.current.set(request_metrics)
+        wrapped = list(connections.all())
+        for connection in wrapped:
+            connection.execute_wrappers.append(request_metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            for connection in wrapped:
+                connection.execute_wrappers.remove(request_metrics)
+            metrics.current.reset(token)
+        finished = time.perf_counter()
+
+        match = request.resolver_match
+        labels = (('route', match.view_name if match else self.unmatched_route), ('method', request.method))
+        observations = [
+            ('qm_http_requests_total', labels + (('status', str(response.status_code)),), 1),
+            ('qm_http_request_duration_seconds', labels, finished - started),
+            ('qm_db_queries_per_request', labels, request_metrics.queries),
+            ('qm_db_query_duration_seconds', labels, request_metrics.db_time),
+            ('qm_serializer_duration_seconds', labels, request_metrics.serializer_time),
+        ]
+        if request_metrics.render_started is not None:
+            observations.append(('qm_render_duration_seconds', labels, finished - request_metrics.render_started))
+        size = self.response_size(response)
+        if size is not None:
+            observations.append(('qm_http_response_size_bytes', labels, size))
+        metrics.registry.record(observations)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF Response'ları view döndükten sonra render edilir; bu kanca render'dan hemen önce çalışır
+        request_metrics = metrics.current.get()
+        if request_metrics is not None:
+            request_metrics.render_started = time.perf_counter()
+        return response
+
+    @staticmethod
+    def response_size(response):
+        if not response.streaming:
+            return len(response.content)
+        length = response.get('Content-Length')
+        return int(length) if length else None
+
+
+class QueryCountHeaderMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = {'count': 0, 'time': 0.0}
+
+        def count_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                stats['count'] += 1
+                stats['time'] += time.perf_counter() - started
+
+        wrapped = list(connections.all())
+        for connection in wrapped:
+            connection.execute_wrappers.append(count_query)
+        try:
+            response = self.get_response(request)
+        finally:
+            for connection in wrapped:
+                connection.execute_wrappers.remove(count_query)
+        response['X-DB-Query-Count'] = str(stats['count'])
+        response['X-DB-Query-Time'] = f"{stats['time'] * 1000:.2f}"
+        return response
@@ -85,26 +85,53 @@ WSGI_APPLICATION = 'backend.api.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+# DB_ENGINE=postgresql ile POSTGRES_* değişkenlerinden PostgreSQL kullanılır;
+# aksi halde geliştirme için SQLite.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+# Okuma replikasının alias'ı (POSTGRES_REPLICA_HOST tanımlıysa eklenir)
+DATABASE_REPLICA_ALIAS = 'replica'
 
-# Veritabanı ayarları - PostgreSQL (yoruma alındı, test için SQLite kullanıyoruz)
-"""
-DATABASES = {
-    'default': {
+
+def postgres_database(host, port):
+    return {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': os.getenv('POSTGRES_DB', 'callcenter'),
         'USER': os.getenv('POSTGRES_USER', 'postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'postgres'),
-        'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
-        'PORT': os.getenv('POSTGRES_PORT', '5432'),
+        'HOST': host,
+        'PORT': port,
+        # Kalıcı bağlantılar: her istekte yeniden bağlanma maliyeti olmasın
+        'CONN_MAX_AGE': int(os.getenv('POSTGRES_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        # PgBouncer (transaction pooling) arkasında sunucu taraflı cursor kullanılamaz
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('POSTGRES_PGBOUNCER', 'False') == 'True',
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('POSTGRES_CONNECT_TIMEOUT', '5')),
+        },
     }
-}
-"""
+
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': postgres_database(os.getenv('POSTGRES_HOST', 'localhost'), os.getenv('POSTGRES_PORT', '5432')),
+    }
+    if os.getenv('POSTGRES_REPLICA_HOST'):
+        DATABASES[DATABASE_REPLICA_ALIAS] = postgres_database(
+            os.getenv('POSTGRES_REPLICA_HOST'), os.getenv('POSTGRES_REPLICA_PORT', '5432'))
+        # Testlerde replika ayrı bir veritabanı değil, birincilin aynasıdır
+        DATABASES[DATABASE_REPLICA_ALIAS]['TEST'] = {'MIRROR': 'default'}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+
+# Liste, dışa aktarım ve rapor okumalarını replikaya yönlendirir (backend/api/db_router.py)
+DATABASE_ROUTERS = ['backend.api.db_router.PrimaryReplicaRouter']
+# Yazma yapan kullanıcının okumaları bu süre boyunca birincil veritabanından yapılır
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
 
 
 # Password validation
@@ -147,7 +174,7 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_ROOT = os.getenv('DJANGO_MEDIA_ROOT', BASE_DIR / 'media')
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -157,10 +184,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom user model
 AUTH_USER_MODEL = 'core.User'
 
+# JWT doğrulama modu: True ise request.user token claim'lerinden oluşturulur
+# ve API istekleri kullanıcı tablosuna sorgu atmaz (backend/api/authentication.py)
+JWT_STATELESS_AUTH = os.getenv('JWT_STATELESS_AUTH', 'True') == 'True'
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication'
+        if JWT_STATELESS_AUTH else 'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -173,9 +205,13 @@ REST_FRAMEWORK = {
 }
 
 # JWT settings
+# Rol/takım claim'leri en fazla access token süresi kadar eski kalabilir
 SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_LIFETIME_MINUTES', '60'))),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    'TOKEN_USER_CLASS': 'backend.api.authentication.ClaimsTokenUser',
+    'TOKEN_OBTAIN_SERIALIZER': 'backend.api.authentication.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'backend.api.authentication.ClaimsTokenRefreshSerializer',
 }
 
 # CORS settings
@@ -185,3 +221,82 @@ CORS_ALLOW_CREDENTIALS = True
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+
+# API sorgu bütçesi (N+1 koruması): 'off', 'log' veya 'raise'
+API_QUERY_BUDGET_MODE = os.getenv('API_QUERY_BUDGET_MODE', 'log')
+
+# Toplu çağrı aktarımı (/api/v1/calls/bulk/) grup boyutları
+CALL_BULK_INGEST_BATCH_SIZE = int(os.getenv('CALL_BULK_INGEST_BATCH_SIZE', '1000'))
+CALL_BULK_INGEST_MAX_BATCH_SIZE = 5000
+
+# Parça parça ses kaydı yükleme (/api/v1/uploads/)
+CALL_UPLOAD_CHUNK_SIZE = int(os.getenv('CALL_UPLOAD_CHUNK_SIZE', str(5 * 1024 * 1024)))  # 5MB
+CALL_UPLOAD_MAX_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+CALL_UPLOAD_MAX_FILE_SIZE = int(os.getenv('CALL_UPLOAD_MAX_FILE_SIZE', str(2 * 1024 * 1024 * 1024)))  # 2GB
+
+# Ses kayıtlarının sunulması (/api/v1/calls/{id}/audio/)
+# '' : dosya Python'dan Range desteğiyle sunulur (geliştirme ortamı)
+# 'nginx' : X-Accel-Redirect; nginx'te AUDIO_SENDFILE_URL_PREFIX için MEDIA_ROOT'u
+#           gösteren `internal` bir location tanımlanmalıdır
+# 'xsendfile' : Apache mod_xsendfile / lighttpd için X-Sendfile
+AUDIO_SENDFILE_BACKEND = os.getenv('AUDIO_SENDFILE_BACKEND', '')
+AUDIO_SENDFILE_URL_PREFIX = os.getenv('AUDIO_SENDFILE_URL_PREFIX', '/protected-media/')
+
+# Ses kaydı analizi (dalga formu ve gerçek süre); ffmpeg gerektirir
+AUDIO_ANALYSIS_ENABLED = os.getenv('AUDIO_ANALYSIS_ENABLED', 'True') == 'True'
+AUDIO_ANALYSIS_WORKERS = int(os.getenv('AUDIO_ANALYSIS_WORKERS', '2'))
+AUDIO_ANALYSIS_SAMPLE_RATE = 8000
+AUDIO_ANALYSIS_PEAKS_PER_SECOND = 20
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+
+# Performans özetleri (PerformanceRollup) artımlı yenilemesi: watermark'tan bu
+# kadar öncesi de yeniden taranır (uzun süren işlemlerin geç commit'leri için)
+ROLLUP_WATERMARK_OVERLAP = timedelta(minutes=int(os.getenv('ROLLUP_WATERMARK_OVERLAP_MINUTES', '5')))
+
+# Önbellek. Süreç içi referans veri önbelleklerinin (backend/core/reference_data.py)
+# sürüm damgaları burada tutulur; birden fazla süreçli kurulumlarda REDIS_URL
+# ile paylaşılan bir önbellek kullanılmalıdır (redis paketi gerekir).
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Referans verilerinin sürüm damgasının en fazla kaç saniyede bir kontrol edileceği
+REFERENCE_DATA_CHECK_INTERVAL = float(os.getenv('REFERENCE_DATA_CHECK_INTERVAL', '1.0'))
+# Süreç içi kopyanın damgadan bağımsız olarak en fazla kaç saniye kullanılacağı
+# (0: sınırsız). Süreç içi önbellekte (REDIS_URL yok) diğer süreçlerin damga
+# yenilemeleri görünmediği için eski veri en fazla bu kadar süre kalır.
+REFERENCE_DATA_MAX_AGE = float(os.getenv('REFERENCE_DATA_MAX_AGE', '0' if REDIS_URL else '60'))
+
+# Değerlendirme kuyruğu (/api/v1/calls/claim/): bu süre içinde değerlendirilmeyen
+# üstlenmeler terk edilmiş sayılır ve başka bir uzman tarafından alınabilir
+CALL_CLAIM_TIMEOUT = timedelta(minutes=int(os.getenv('CALL_CLAIM_TIMEOUT_MINUTES', '30')))
+
+# Ülke kodu olmadan yazılan telefon numaraları bu ülkeye ait sayılır (E.164 normalizasyonu)
+PHONE_DEFAULT_COUNTRY_CODE = os.getenv('PHONE_DEFAULT_COUNTRY_CODE', '90')
+PHONE_NATIONAL_NUMBER_LENGTH = int(os.getenv('PHONE_NATIONAL_NUMBER_LENGTH', '10'))
+
+# Rota bazında performans metrikleri (backend/api/metrics.py). /metrics sadece
+# METRICS_TOKEN tanımlıysa açılır; çok süreçli kurulumlarda (gunicorn) süreçler
+# sayaçlarını METRICS_MULTIPROC_DIR dizininde paylaşır (başlatılırken temizlenmeli).
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', '')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '5'))
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'backend.api.middleware.MetricsMiddleware')
+
+# Yük testleri (logs/test_script.py): yanıtlara istek başına sorgu sayısı/süresi başlıkları ekle
+API_QUERY_COUNT_HEADER = os.getenv('API_QUERY_COUNT_HEADER', 'False') == 'True'
+if API_QUERY_COUNT_HEADER:
+    MIDDLEWARE.insert(0, 'backend.api.middleware.QueryCountHeaderMiddleware')
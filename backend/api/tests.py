@@ -0,0 +1,1025 @@
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from backend.core import reference_data, rollups, stats
+from backend.core.models import User, Call, Evaluation, EvaluationCriteria, UploadSession
+from backend.api import db_router, metrics
+from backend.api.v1.mixins import QueryBudgetExceeded
+from backend.api.v1.serializers import CallSerializer, EvaluationSerializer
+from backend.api.v1.views import CallViewSet
+from unittest import mock
+import datetime
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from xml.etree import ElementTree
+
+
+class APITestBase(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username='admin_test',
+            email='admin@test.com',
+            password='admintest123',
+            employee_id='1001',
+            role='admin'
+        )
+        self.agent_user = User.objects.create_user(
+            username='agent_test',
+            password='agenttest123',
+            first_name='Ayşe',
+            last_name='Demir',
+            employee_id='1002',
+            role='agent',
+            team='Test Team'
+        )
+        self.expert_user = User.objects.create_user(
+            username='expert_test',
+            password='experttest123',
+            first_name='Ali',
+            last_name='Kaya',
+            employee_id='1003',
+            role='expert'
+        )
+        self.client = APIClient()
+        # Süreç içi önbellek test veritabanının geri alınmasından haberdar olmaz
+        reference_data.clear_all()
+
+    def create_calls(self, count, agent=None, **kwargs):
+        """Verilen sayıda test çağrısı oluştur"""
+        now = timezone.now()
+        calls = []
+        for i in range(count):
+            fields = {
+                'agent': agent or self.agent_user,
+                'call_date': now - datetime.timedelta(minutes=i),
+                'phone_number': '+905551112233',
+                'duration': datetime.timedelta(minutes=5),
+                'mp3_file': 'test_calls/test.mp3',
+                'queue': 'Support',
+            }
+            fields.update(kwargs)
+            calls.append(Call.objects.create(**fields))
+        return calls
+
+    def create_evaluations(self, calls, evaluator=None):
+        """Verilen çağrılar için değerlendirme oluştur"""
+        return [
+            Evaluation.objects.create(
+                call=call,
+                evaluator=evaluator or self.expert_user,
+                scores={'1': 80},
+                total_score=80,
+                comments='Good call',
+            )
+            for call in calls
+        ]
+
+
+@override_settings(API_QUERY_BUDGET_MODE='raise')
+class QueryBudgetTests(APITestBase):
+    def test_call_list_query_count_is_constant(self):
+        """Çağrı listesi sayfa boyutundan bağımsız sabit sayıda sorgu çalıştırmalı"""
+        self.create_calls(20)
+        self.client.force_authenticate(self.admin_user)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/calls/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['agent_name'], 'Ayşe Demir')
+
+    def test_evaluation_list_query_count_is_constant(self):
+        """Değerlendirme listesi satır başına ek sorgu çalıştırmamalı"""
+        self.create_evaluations(self.create_calls(20))
+        for user in (self.admin_user, self.expert_user, self.agent_user):
+            self.client.force_authenticate(user)
+            with self.assertNumQueries(2):
+                response = self.client.get('/api/v1/evaluations/')
+            self.assertEqual(response.data['count'], 20)
+            self.assertEqual(response.data['results'][0]['call_details']['agent_name'], 'Ayşe Demir')
+
+    def test_evaluation_retrieve_query_count(self):
+        """Değerlendirme detayı tek sorguda getirilmeli"""
+        evaluation = self.create_evaluations(self.create_calls(1))[0]
+        self.client.force_authenticate(self.admin_user)
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/v1/evaluations/{evaluation.id}/')
+        self.assertEqual(response.data['evaluator_name'], 'Ali Kaya')
+
+    def test_budget_violation_raises(self):
+        """Bütçeyi aşan aksiyon 'raise' modunda hata vermeli"""
+        self.create_calls(3)
+        self.client.force_authenticate(self.admin_user)
+        with mock.patch.object(CallViewSet, 'query_budget', {'list': 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/api/v1/calls/')
+
+
+class KeysetPaginationTests(APITestBase):
+    def test_cursor_mode_walks_all_pages_without_count(self):
+        """Cursor modu COUNT çalıştırmadan tüm kayıtları sırayla dolaşmalı"""
+        calls = self.create_calls(45)
+        self.client.force_authenticate(self.admin_user)
+        seen = []
+        url = '/api/v1/calls/?cursor='
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertNotIn('count', response.data)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [call.id for call in calls])
+
+    def test_cursor_previous_link_returns_same_page(self):
+        """previous linki bir önceki sayfayı aynı sırayla döndürmeli"""
+        self.create_evaluations(self.create_calls(30))
+        self.client.force_authenticate(self.admin_user)
+        first = self.client.get('/api/v1/evaluations/?cursor=')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [row['id'] for row in back.data['results']],
+            [row['id'] for row in first.data['results']],
+        )
+        self.assertIsNone(back.data['previous'])
+
+    def test_page_number_mode_is_default(self):
+        """cursor parametresi olmadan sayfa numaralı yanıt korunmalı"""
+        self.create_calls(3)
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get('/api/v1/calls/')
+        self.assertEqual(response.data['count'], 3)
+
+    def test_invalid_cursor_returns_404(self):
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get('/api/v1/calls/?cursor=bozuk')
+        self.assertEqual(response.status_code, 404)
+
+
+class DashboardStatsAPITests(APITestBase):
+    def test_stats_endpoint(self):
+        """Dashboard endpointi sayaçlardan beklenen yapıyı döndürmeli"""
+        calls = self.create_calls(3)
+        self.create_evaluations(calls[:2])
+        calls[0].status = Call.CallStatus.COMPLETED
+        calls[0].save()
+        self.client.force_authenticate(self.agent_user)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/dashboard/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totalCalls'], 3)
+        self.assertEqual(response.data['pendingEvaluations'], 2)
+        self.assertEqual(response.data['completedEvaluations'], 2)
+        self.assertEqual(response.data['averageScore'], 80.0)
+        self.assertEqual(len(response.data['recentCalls']), 3)
+        self.assertEqual(response.data['recentCalls'][0]['agentName'], 'Ayşe Demir')
+        self.assertEqual(response.data['recentCalls'][0]['score'], 80.0)
+        self.assertIsNone(response.data['recentCalls'][2]['score'])
+
+    def test_agent_stats_are_scoped_to_own_calls(self):
+        """Agent merkez geneli sayıları değil, kendi çağrılarının sayılarını görmeli"""
+        other_agent = User.objects.create_user(username='agent_other', password='x', employee_id='1004',
+                                               role='agent', team='Test Team')
+        self.create_evaluations(self.create_calls(2))
+        other_calls = self.create_calls(3, agent=other_agent)
+        for call, score in zip(self.create_evaluations(other_calls[:2]), (40, 60)):
+            call.total_score = score
+            call.save()
+
+        self.client.force_authenticate(self.agent_user)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/dashboard/stats/')
+        self.assertEqual((response.data['totalCalls'], response.data['pendingEvaluations'],
+                          response.data['completedEvaluations'], response.data['averageScore']), (2, 2, 2, 80.0))
+
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get('/api/v1/dashboard/stats/')
+        self.assertEqual((response.data['totalCalls'], response.data['pendingEvaluations'],
+                          response.data['completedEvaluations'], response.data['averageScore']), (5, 5, 4, 65.0))
+
+
+class CallBulkIngestTests(APITestBase):
+    def post_bulk(self, body, content_type, query=''):
+        self.client.force_authenticate(self.admin_user)
+        return self.client.generic('POST', f'/api/v1/calls/bulk/{query}', body, content_type=content_type)
+
+    def test_ndjson_ingest_reports_row_errors(self):
+        """Hatalı satırlar raporlanmalı, geçerli satırlar eklenmeli"""
+        rows = [
+            {'employee_id': '1002', 'call_date': '2025-02-01T10:00:00', 'phone_number': '5551112233',
+             'duration': '00:05:30', 'queue': 'Destek'},
+            {'employee_id': '9999', 'call_date': '2025-02-01T10:05:00', 'phone_number': '5551112233',
+             'duration': '330', 'queue': 'Destek'},
+            {'employee_id': '1002', 'call_date': 'dün', 'phone_number': '5551112233',
+             'duration': '00:01:00', 'queue': 'Satış', 'status': 'bilinmiyor'},
+            {'employee_id': '1002', 'call_date': '2025-02-01T10:10:00', 'phone_number': '5551112233',
+             'duration': '60', 'queue': 'Satış', 'status': 'completed', 'mp3_file': 'call_records/a.mp3'},
+        ]
+        body = '\n'.join(json.dumps(row) for row in rows) + '\n{bozuk\n'
+        with CaptureQueriesContext(connection) as context:
+            response = self.post_bulk(body, 'application/x-ndjson', '?batch_size=10')
+        # Temsilciler grup başına tek sorguda çözülmeli
+        user_lookups = [q for q in context.captured_queries if 'FROM "core_user"' in q['sql']]
+        self.assertEqual(len(user_lookups), 1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['failed'], 3)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 3, 5])
+        self.assertIn('employee_id', response.data['errors'][0]['errors'])
+        self.assertEqual(set(response.data['errors'][1]['errors']), {'call_date', 'status'})
+        self.assertEqual(Call.objects.filter(agent=self.agent_user).count(), 2)
+        counters = stats.read_counters()
+        self.assertEqual(counters[stats.CALLS_TOTAL], 2)
+        self.assertEqual(counters['calls_completed'], 1)
+
+    def test_csv_ingest_in_batches(self):
+        lines = ['employee_id,call_date,phone_number,duration,queue']
+        lines += [f'1002,2025-02-01T10:{i:02d}:00,5551112233,00:02:00,Destek' for i in range(25)]
+        response = self.post_bulk('\n'.join(lines), 'text/csv', '?batch_size=10')
+        self.assertEqual(response.data['created'], 25)
+        self.assertEqual(response.data['failed'], 0)
+
+    def test_wrongly_typed_values_are_row_errors(self):
+        """JSON sayıları ve metin olmayan dosya adları 500 yerine satır hatası olmalı"""
+        rows = [
+            {'employee_id': '1002', 'call_date': 1738404000, 'phone_number': '5551112233',
+             'duration': 330, 'queue': 'Destek'},
+            {'employee_id': '1002', 'call_date': '2025-02-01T10:05:00', 'phone_number': '5551112233',
+             'duration': '330', 'queue': 'Destek', 'mp3_file': ['a.mp3']},
+            {'employee_id': '1002', 'call_date': '2025-02-01T10:10:00', 'phone_number': '5551112233',
+             'duration': '60', 'queue': 'Satış'},
+        ]
+        body = '\n'.join(json.dumps(row) for row in rows)
+        response = self.post_bulk(body, 'application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2])
+        self.assertEqual(set(response.data['errors'][0]['errors']), {'call_date', 'duration'})
+        self.assertEqual(set(response.data['errors'][1]['errors']), {'mp3_file'})
+
+    def test_csv_invalid_utf8_is_row_error(self):
+        body = (b'employee_id,call_date,phone_number,duration,queue\n'
+                b'1002,2025-02-01T10:00:00,5551112233,00:02:00,Destek\n'
+                b'1002,2025-02-01T10:01:00,5551112233,00:02:00,Dest\xffek\n'
+                b'1002,2025-02-01T10:02:00,5551112233,00:02:00,Destek\n')
+        response = self.post_bulk(body, 'text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([error['row'] for error in response.data['errors']], [3])
+
+    def test_bulk_requires_admin(self):
+        self.client.force_authenticate(self.agent_user)
+        response = self.client.generic('POST', '/api/v1/calls/bulk/', '', content_type='text/csv')
+        self.assertEqual(response.status_code, 403)
+
+    def test_unsupported_content_type(self):
+        response = self.post_bulk('{}', 'application/xml')
+        self.assertEqual(response.status_code, 415)
+
+
+class ChunkedUploadTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.call = self.create_calls(1)[0]
+        self.client.force_authenticate(self.expert_user)
+
+    def start(self, content, chunk_size):
+        return self.client.post('/api/v1/uploads/', {
+            'call': self.call.id,
+            'total_size': len(content),
+            'chunk_size': chunk_size,
+            'checksum': hashlib.sha256(content).hexdigest(),
+        }, format='json')
+
+    def put_chunk(self, session_id, index, data):
+        return self.client.generic('PUT', f'/api/v1/uploads/{session_id}/chunks/{index}/',
+                                   data, content_type='application/octet-stream')
+
+    def test_out_of_order_resumable_upload(self):
+        """Parçalar sırasız ve kesintili gelse de dosya doğru birleştirilmeli"""
+        content = bytes(range(256)) * 100
+        chunk_size = 4096
+        response = self.start(content, chunk_size)
+        self.assertEqual(response.status_code, 201)
+        session_id = response.data['id']
+        chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+
+        for index in reversed(range(1, len(chunks))):
+            self.assertEqual(self.put_chunk(session_id, index, chunks[index]).status_code, 200)
+        # Bağlantı koptu: eksik parçalar sorgulanıp yükleme sürdürülür
+        response = self.client.get(f'/api/v1/uploads/{session_id}/')
+        self.assertEqual(response.data['missing_chunks'], [0])
+        self.assertEqual(self.client.post(f'/api/v1/uploads/{session_id}/complete/').status_code, 400)
+        self.put_chunk(session_id, 0, chunks[0])
+
+        response = self.client.post(f'/api/v1/uploads/{session_id}/complete/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'completed')
+        self.call.refresh_from_db()
+        self.assertTrue(self.call.mp3_file.name.startswith('call_records/'))
+        with self.call.mp3_file.open('rb') as stored:
+            self.assertEqual(stored.read(), content)
+
+    def upload(self, content):
+        session_id = self.start(content, 4096).data['id']
+        self.put_chunk(session_id, 0, content)
+        return session_id
+
+    def test_repeated_complete_and_missing_part_file(self):
+        """İkinci tamamlama 500 değil tamamlanmış oturumu, kayıp .part dosyası 400 döndürmeli"""
+        session_id = self.upload(b'first')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post(f'/api/v1/uploads/{session_id}/complete/').status_code, 200)
+        response = self.client.post(f'/api/v1/uploads/{session_id}/complete/')
+        self.assertEqual((response.status_code, response.data['status']), (200, 'completed'))
+        self.assertEqual(self.put_chunk(session_id, 0, b'first').status_code, 400)
+
+        session_id = self.upload(b'second')
+        session = UploadSession.objects.get(pk=session_id)
+        os.remove(default_storage.path(session.partial_name))
+        self.assertEqual(self.client.post(f'/api/v1/uploads/{session_id}/complete/').status_code, 400)
+
+    def test_replaced_recording_is_removed(self):
+        session_id = self.upload(b'first')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/v1/uploads/{session_id}/complete/')
+        self.call.refresh_from_db()
+        first_name = self.call.mp3_file.name
+
+        session_id = self.upload(b'second')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/v1/uploads/{session_id}/complete/')
+        self.call.refresh_from_db()
+        self.assertNotEqual(self.call.mp3_file.name, first_name)
+        self.assertFalse(default_storage.exists(first_name))
+        self.assertTrue(default_storage.exists(self.call.mp3_file.name))
+
+    def test_wrong_chunk_size_and_checksum_are_rejected(self):
+        content = b'x' * 5000
+        session_id = self.start(content, 4096).data['id']
+        self.assertEqual(self.put_chunk(session_id, 0, b'x' * 100).status_code, 400)
+        self.put_chunk(session_id, 0, b'y' * 4096)
+        self.put_chunk(session_id, 1, b'x' * 904)
+        response = self.client.post(f'/api/v1/uploads/{session_id}/complete/')
+        self.assertEqual(response.status_code, 400)
+        # Özet tutmayınca parçalar sıfırlanır
+        self.assertEqual(self.client.get(f'/api/v1/uploads/{session_id}/').data['missing_chunks'], [0, 1])
+
+    def test_agent_cannot_upload_to_other_agents_call(self):
+        other_agent = User.objects.create_user(username='other', password='x', employee_id='2000')
+        self.client.force_authenticate(other_agent)
+        response = self.start(b'data', 4096)
+        self.assertEqual(response.status_code, 403)
+
+
+class CallAudioTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(MEDIA_ROOT=media_root, AUDIO_SENDFILE_BACKEND='')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.content = bytes(range(256)) * 40
+        os.makedirs(os.path.join(media_root, 'call_records'))
+        with open(os.path.join(media_root, 'call_records', 'a.mp3'), 'wb') as f:
+            f.write(self.content)
+        self.call = self.create_calls(1, mp3_file='call_records/a.mp3')[0]
+        self.url = f'/api/v1/calls/{self.call.id}/audio/'
+
+    def test_range_request_returns_partial_content(self):
+        self.client.force_authenticate(self.agent_user)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.content)}')
+        self.assertEqual(b''.join(response.streaming_content), self.content[100:200])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-10:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+
+    def test_full_file_and_role_scoping(self):
+        self.client.force_authenticate(self.expert_user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+        other_agent = User.objects.create_user(username='other', password='x', employee_id='2000')
+        self.client.force_authenticate(other_agent)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_call_payloads_point_at_audio_endpoint(self):
+        """API ham /media/ yolunu değil yetki kontrollü ses endpointini vermeli"""
+        self.client.force_authenticate(self.agent_user)
+        expected = f'http://testserver{self.url}'
+        self.assertEqual(self.client.get(f'/api/v1/calls/{self.call.id}/').data['mp3_file'], expected)
+        self.assertEqual(self.client.get('/api/v1/calls/').data['results'][0]['mp3_file'], expected)
+        self.assertEqual(self.client.get(expected).status_code, 200)
+
+    def test_nginx_offload(self):
+        self.client.force_authenticate(self.agent_user)
+        with self.settings(AUDIO_SENDFILE_BACKEND='nginx'):
+            response = self.client.get(self.url, HTTP_RANGE='bytes=0-10')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/call_records/a.mp3')
+        self.assertEqual(response.content, b'')
+
+
+class EvaluationScoringAPITests(APITestBase):
+    def test_total_score_is_computed_on_server(self):
+        first = EvaluationCriteria.objects.create(name='Problem Anlama', description='', weight=20)
+        second = EvaluationCriteria.objects.create(name='Çözüm Sunma', description='', weight=30)
+        call = self.create_calls(1)[0]
+        self.client.force_authenticate(self.expert_user)
+        response = self.client.post('/api/v1/evaluations/', {
+            'call': call.id,
+            'evaluator': self.expert_user.id,
+            'scores': {str(first.id): 90, str(second.id): 70},
+            'total_score': 12,
+            'comments': 'İyi',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['total_score'], '78.00')
+
+    def test_unknown_criterion_is_rejected(self):
+        call = self.create_calls(1)[0]
+        self.client.force_authenticate(self.expert_user)
+        response = self.client.post('/api/v1/evaluations/', {
+            'call': call.id, 'evaluator': self.expert_user.id, 'scores': {'999': 50}, 'comments': '',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('scores', response.data)
+
+
+@override_settings(API_QUERY_BUDGET_MODE='raise')
+class PerformanceReportAPITests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        other_agent = User.objects.create_user(username='other', password='x', employee_id='2000', team='B')
+        self.create_evaluations(self.create_calls(2))
+        self.create_calls(1, agent=other_agent, queue='Sales')
+        rollups.refresh_rollups()
+
+    def test_reads_only_rollups(self):
+        self.client.force_authenticate(self.expert_user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/reports/performance/', {'grain': 'week', 'dimension': 'team'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all('core_performancerollup' in query['sql'] for query in context.captured_queries))
+        teams = {row['key']: row for row in response.data}
+        self.assertEqual(teams['Test Team']['call_count'], 2)
+        self.assertEqual(teams['Test Team']['average_score'], '80.00')
+        self.assertEqual(teams['B']['evaluation_count'], 0)
+        self.assertIsNone(teams['B']['average_score'])
+
+    def test_agent_sees_only_own_rollups(self):
+        self.client.force_authenticate(self.agent_user)
+        response = self.client.get('/api/v1/reports/performance/', {'dimension': 'team'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({row['key'] for row in response.data}, {str(self.agent_user.id)})
+        self.assertEqual({row['dimension'] for row in response.data}, {'agent'})
+
+    def test_invalid_parameters(self):
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get('/api/v1/reports/performance/', {'grain': 'month'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/reports/performance/', {'start': '2024-02-01', 'end': '2024-01-01'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(API_QUERY_BUDGET_MODE='raise')
+class ExportTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.criterion = EvaluationCriteria.objects.create(name='Nezaket', description='', weight=10)
+        other_agent = User.objects.create_user(username='other', password='x', first_name='Can',
+                                               employee_id='2000')
+        self.calls = self.create_calls(3)
+        self.other_calls = self.create_calls(2, agent=other_agent)
+        self.create_evaluations(self.calls + self.other_calls)
+
+    def read_csv(self, response):
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_evaluation_csv_export(self):
+        self.client.force_authenticate(self.admin_user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/evaluations/export/')
+            rows = self.read_csv(response)
+        # Tek satır sorgusu (kriterler süreç içi önbellekten); satır sayısından bağımsız
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertIn('attachment; filename="evaluations-', response['Content-Disposition'])
+        header = rows[0]
+        self.assertEqual(header[:3], ['id', 'call', 'agent_name'])
+        self.assertEqual(header[-1], 'score:Nezaket')
+        self.assertEqual(len(rows), 6)
+        first = dict(zip(header, rows[1]))
+        self.assertEqual(first['agent_name'], 'Ayşe Demir')
+        self.assertEqual(first['evaluator_name'], 'Ali Kaya')
+        self.assertEqual(first['comments'], 'Good call')
+        self.assertEqual(first['duration'], '0:05:00')
+
+    def test_csv_escapes_formula_prefixes(self):
+        """+ ve - ile başlayan serbest metin formül olarak açılmamalı; telefon numarası bozulmamalı"""
+        evaluations = list(Evaluation.objects.filter(call__in=self.calls).order_by('call__call_date'))
+        evaluations[0].comments = "-2+3+cmd|' /C calc'!A0"
+        evaluations[0].improvement_areas = '+HYPERLINK("http://example.com","x")'
+        evaluations[0].save()
+        self.client.force_authenticate(self.admin_user)
+        rows = self.read_csv(self.client.get('/api/v1/evaluations/export/'))
+        row = next(dict(zip(rows[0], row)) for row in rows[1:] if row[0] == str(evaluations[0].id))
+        self.assertEqual(row['comments'], "'-2+3+cmd|' /C calc'!A0")
+        self.assertEqual(row['improvement_areas'], '\'+HYPERLINK("http://example.com","x")')
+        self.assertEqual(row['phone_number'], '+905551112233')
+
+    def test_export_respects_role_scoping(self):
+        self.client.force_authenticate(self.agent_user)
+        rows = self.read_csv(self.client.get('/api/v1/evaluations/export/'))
+        self.assertEqual({row[1] for row in rows[1:]}, {str(call.id) for call in self.calls})
+        rows = self.read_csv(self.client.get('/api/v1/calls/export/'))
+        self.assertEqual(len(rows), 4)
+
+        self.client.force_authenticate(self.expert_user)
+        start = timezone.localdate() + datetime.timedelta(days=1)
+        rows = self.read_csv(self.client.get('/api/v1/calls/export/', {'start': start.isoformat()}))
+        self.assertEqual(len(rows), 1)
+
+    def test_call_xlsx_export(self):
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get('/api/v1/calls/export/', {'export_format': 'xlsx'})
+        self.assertEqual(response.status_code, 200)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertIsNone(archive.testzip())
+        namespace = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        rows = sheet.findall('.//x:row', namespace)
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0].find('.//x:t', namespace).text, 'id')
+
+    def test_invalid_format(self):
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get('/api/v1/calls/export/', {'export_format': 'pdf'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(API_QUERY_BUDGET_MODE='raise')
+class CriteriaCacheTests(APITestBase):
+    def test_criteria_are_served_from_process_cache(self):
+        criterion = EvaluationCriteria.objects.create(name='Nezaket', description='', weight=10)
+        self.client.force_authenticate(self.agent_user)
+        self.client.get('/api/v1/criteria/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/criteria/')
+            detail = self.client.get(f'/api/v1/criteria/{criterion.id}/')
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['name'], 'Nezaket')
+        self.assertEqual(detail.data['weight'], 10)
+        self.assertEqual(self.client.get('/api/v1/criteria/999/').status_code, 404)
+
+    def test_writes_invalidate_cache(self):
+        criterion = EvaluationCriteria.objects.create(name='Nezaket', description='', weight=10)
+        self.client.force_authenticate(self.admin_user)
+        self.client.get('/api/v1/criteria/')
+        response = self.client.patch(f'/api/v1/criteria/{criterion.id}/', {'weight': 40}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/v1/criteria/').data['results'][0]['weight'], 40)
+        self.client.delete(f'/api/v1/criteria/{criterion.id}/')
+        self.assertEqual(self.client.get('/api/v1/criteria/').data['count'], 0)
+
+
+@override_settings(API_QUERY_BUDGET_MODE='raise')
+class ConditionalGetTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.calls = self.create_calls(25)
+        self.client.force_authenticate(self.agent_user)
+
+    def test_list_not_modified_skips_serialization(self):
+        response = self.client.get('/api/v1/calls/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        # Listeler sadece ETag ile doğrulanır
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        with mock.patch.object(CallViewSet, 'get_serializer') as get_serializer:
+            with self.assertNumQueries(2):
+                response = self.client.get('/api/v1/calls/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        get_serializer.assert_not_called()
+
+        # Başka sayfadaki satırın silinmesi toplam sayıyı ve dolayısıyla ETag'i değiştirir
+        self.calls[-1].delete()
+        response = self.client.get('/api/v1/calls/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        # Sayfalar ayrı doğrulayıcılara sahiptir
+        self.assertNotEqual(self.client.get('/api/v1/calls/', {'page': 2})['ETag'], response['ETag'])
+
+    def test_related_change_invalidates_list(self):
+        etag = self.client.get('/api/v1/calls/', {'cursor': ''})['ETag']
+        self.assertEqual(self.client.get('/api/v1/calls/', {'cursor': ''}, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.agent_user.last_name = 'Yılmaz'
+        self.agent_user.save()
+        self.assertEqual(self.client.get('/api/v1/calls/', {'cursor': ''}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_ignores_if_modified_since(self):
+        """Sayfanın en yeni satırı değişmeden silinen satır 304 ile gizlenmemeli"""
+        self.client.get('/api/v1/calls/')
+        since = http_date(time.time() + 60)
+        self.calls[5].delete()
+        response = self.client.get('/api/v1/calls/', HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 24)
+
+    def test_cursor_links_are_part_of_etag(self):
+        """Cursor modunda sayfanın sonraki cursor'ı değişirse ETag de değişmeli"""
+        etag = self.client.get('/api/v1/calls/', {'cursor': ''})['ETag']
+        # Sayfanın son satırından sonraki tüm satırlar silinir: satırlar aynı, sonraki sayfa yok
+        Call.objects.filter(pk__in=[call.pk for call in self.calls[20:]]).delete()
+        response = self.client.get('/api/v1/calls/', {'cursor': ''}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['next'])
+
+    def test_detail_if_modified_since(self):
+        call = self.calls[0]
+        response = self.client.get(f'/api/v1/calls/{call.id}/')
+        last_modified = response['Last-Modified']
+        response = self.client.get(f'/api/v1/calls/{call.id}/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_criteria_etag_follows_cache_version(self):
+        criterion = EvaluationCriteria.objects.create(name='Nezaket', description='', weight=10)
+        etag = self.client.get('/api/v1/criteria/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/criteria/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        criterion.weight = 20
+        criterion.save()
+        self.assertEqual(self.client.get('/api/v1/criteria/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_criteria_etag_follows_served_rows_without_version_change(self):
+        """Başka süreçteki değişiklik damgayı yenilemese de yeniden yüklenen veri yeni ETag üretmeli"""
+        criterion = EvaluationCriteria.objects.create(name='Nezaket', description='', weight=10)
+        etag = self.client.get('/api/v1/criteria/')['ETag']
+        # İkinci süreç: veritabanı değişir, bu süreçteki damga aynı kalır
+        EvaluationCriteria.objects.filter(pk=criterion.pk).update(weight=20)
+        version = reference_data.criteria.current_version()
+        reference_data.criteria.clear_local()  # REFERENCE_DATA_MAX_AGE dolmuş gibi
+        response = self.client.get('/api/v1/criteria/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(reference_data.criteria.current_version(), version)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['weight'], 20)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class StatelessJWTTests(APITestBase):
+    def obtain_tokens(self, username, password):
+        response = self.client.post('/api/token/', {'username': username, 'password': password}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_role_decisions_need_no_user_query(self):
+        self.create_calls(3)
+        self.create_calls(2, agent=self.expert_user)
+        tokens = self.obtain_tokens('agent_test', 'agenttest123')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        # Sadece sayfalama COUNT'u ve sayfa sorgusu; kullanıcı tablosu okunmaz
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/calls/')
+        self.assertEqual(response.data['count'], 3)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.obtain_tokens('expert_test', 'experttest123')['access'])
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/calls/')
+        self.assertEqual(response.data['count'], 5)
+
+    def test_admin_only_actions_use_staff_claim(self):
+        tokens = self.obtain_tokens('admin_test', 'admintest123')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client.post('/api/v1/criteria/', {'name': 'Nezaket', 'description': 'Kibar dil', 'weight': 10})
+        self.assertEqual(response.status_code, 201)
+
+    def test_refresh_reloads_claims(self):
+        tokens = self.obtain_tokens('agent_test', 'agenttest123')
+        self.agent_user.role = 'expert'
+        self.agent_user.save()
+        response = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.create_calls(1, agent=self.expert_user)
+        self.assertEqual(self.client.get('/api/v1/calls/').data['count'], 1)
+
+        self.agent_user.is_active = False
+        self.agent_user.save()
+        response = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+
+class ReplicaRoutingTests(APITestBase):
+    def test_router_sends_context_reads_to_replica_until_write(self):
+        router = db_router.PrimaryReplicaRouter()
+        with mock.patch.object(db_router, 'replica_configured', return_value=True):
+            self.assertEqual(router.db_for_read(Call), 'default')
+            with db_router.replica_reads():
+                self.assertEqual(router.db_for_read(Call), 'replica')
+                self.assertEqual(router.db_for_write(Call), 'default')
+                self.assertEqual(router.db_for_read(Call), 'default')
+            with db_router.replica_reads():
+                self.assertEqual(router.db_for_read(Call), 'replica')
+        self.assertTrue(router.allow_migrate('default', 'core'))
+        self.assertFalse(router.allow_migrate('replica', 'core'))
+
+    def capture_replica_flags(self, *args, **kwargs):
+        flags = []
+
+        def wrapper(execute, sql, params, many, context):
+            flags.append(db_router._replica_reads.get())
+            return execute(sql, params, many, context)
+        with connection.execute_wrapper(wrapper):
+            response = self.client.get(*args, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return flags
+
+    def test_list_reads_use_replica_unless_user_recently_wrote(self):
+        self.create_calls(2)
+        self.client.force_authenticate(self.admin_user)
+        self.assertEqual(set(self.capture_replica_flags('/api/v1/calls/')), {True})
+        # Detay okumaları birincilde kalır
+        call = Call.objects.first()
+        self.assertEqual(set(self.capture_replica_flags(f'/api/v1/calls/{call.id}/')), {False})
+
+        with mock.patch.object(db_router, 'pin_user') as pin_user:
+            response = self.client.patch(f'/api/v1/calls/{call.id}/', {'queue': 'Sales'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        pin_user.assert_called_once_with(self.admin_user.id)
+        with mock.patch.object(db_router, 'is_user_pinned', return_value=True):
+            self.assertEqual(set(self.capture_replica_flags('/api/v1/calls/')), {False})
+
+
+@override_settings(API_QUERY_BUDGET_MODE='raise')
+class CallClaimTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.second_expert = User.objects.create_user(username='expert2', password='x', employee_id='2001',
+                                                      role='expert')
+        # create_calls çağrıları yeniden eskiye oluşturur; en eski çağrı listenin sonundadır
+        self.calls = self.create_calls(3)
+        self.sales_call = self.create_calls(1, queue='Sales',
+                                            call_date=timezone.now() - datetime.timedelta(days=1))[0]
+        # Tüm durum sayaçlarının satırları hazır olsun (ilk oluşturma bütçeye dahil değil)
+        stats.rebuild_counters()
+
+    def claim(self, user, data=None):
+        self.client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/v1/calls/claim/', data or {}, format='json')
+
+    def test_concurrent_experts_get_different_calls(self):
+        first = self.claim(self.expert_user)
+        second = self.claim(self.second_expert, {'queue': 'Support'})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data['id'], self.sales_call.id)
+        self.assertEqual(first.data['status'], 'in_progress')
+        self.assertEqual(first.data['claimed_by'], self.expert_user.id)
+        self.assertEqual(second.data['id'], self.calls[-1].id)
+
+        counters = stats.read_counters()
+        self.assertEqual(counters[stats.call_status_counter('pending')], 2)
+        self.assertEqual(counters[stats.call_status_counter('in_progress')], 2)
+
+        self.claim(self.expert_user)
+        self.claim(self.expert_user)
+        self.assertEqual(self.claim(self.expert_user).status_code, 204)
+
+    def test_release(self):
+        call_id = self.claim(self.expert_user).data['id']
+        self.client.force_authenticate(self.second_expert)
+        self.assertEqual(self.client.post(f'/api/v1/calls/{call_id}/release/').status_code, 400)
+        self.client.force_authenticate(self.expert_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post(f'/api/v1/calls/{call_id}/release/').status_code, 204)
+        call = Call.objects.get(pk=call_id)
+        self.assertEqual((call.status, call.claimed_by_id), ('pending', None))
+        self.assertEqual(stats.read_counters()[stats.call_status_counter('in_progress')], 0)
+
+    def test_agents_cannot_claim(self):
+        self.assertEqual(self.claim(self.agent_user).status_code, 403)
+        self.assertEqual(self.claim(self.expert_user, {'sample_percent': 0}).status_code, 400)
+
+
+@override_settings(API_QUERY_BUDGET_MODE='raise')
+class EvaluationSearchAPITests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        first, second, third = self.create_evaluations(self.create_calls(3))
+        first.comments = 'Müşteri şikâyetini sabırla dinledi'
+        first.save()
+        second.improvement_areas = 'Şikayet kaydını açmayı unuttu'
+        second.save()
+        self.matching = {first.id, second.id}
+
+    def test_search_filters_list(self):
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get('/api/v1/evaluations/', {'search': 'ŞİKAYET'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({row['id'] for row in response.data['results']}, self.matching)
+        response = self.client.get('/api/v1/evaluations/', {'search': 'sikayet musteri'})
+        self.assertEqual(response.data['count'], 1)
+
+    def test_search_respects_role_scope(self):
+        other_expert = User.objects.create_user(username='other_expert', password='x', employee_id='2001',
+                                                role='expert')
+        self.client.force_authenticate(other_expert)
+        response = self.client.get('/api/v1/evaluations/', {'search': 'şikayet'})
+        self.assertEqual(response.data['count'], 0)
+
+
+@override_settings(API_QUERY_BUDGET_MODE='raise')
+class CallPhoneFilterTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.calls = self.create_calls(2, phone_number='+90 555 111 22 33')
+        self.other = self.create_calls(1, phone_number='0532 111 22 33')[0]
+        self.client.force_authenticate(self.admin_user)
+
+    def ids(self, params):
+        response = self.client.get('/api/v1/calls/', params)
+        self.assertEqual(response.status_code, 200)
+        return {row['id'] for row in response.data['results']}
+
+    def test_phone_filter_ignores_formatting(self):
+        self.assertEqual(self.ids({'phone': '05551112233'}), {call.id for call in self.calls})
+        self.assertEqual(self.ids({'phone': '+90 (532) 111 22 33'}), {self.other.id})
+        self.assertEqual(self.ids({'phone': '123'}), set())
+
+    def test_phone_prefix_filter(self):
+        self.assertEqual(self.ids({'phone_prefix': '0555'}), {call.id for call in self.calls})
+        self.assertEqual(self.ids({'phone_prefix': '+905'}), {call.id for call in self.calls} | {self.other.id})
+        self.assertEqual(self.ids({'phone_prefix': '+90554'}), set())
+
+
+@override_settings(METRICS_TOKEN='scrape-token')
+class MetricsTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        metrics.registry.clear()
+
+    def scrape(self, token='scrape-token'):
+        return self.client.get('/metrics', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_endpoint_is_protected(self):
+        self.assertEqual(self.scrape('wrong').status_code, 401)
+        with override_settings(METRICS_TOKEN=''):
+            self.assertEqual(self.scrape('').status_code, 404)
+
+    def test_records_per_route_breakdown(self):
+        self.create_calls(3)
+        self.client.force_authenticate(self.admin_user)
+        self.assertEqual(self.client.get('/api/v1/calls/').status_code, 200)
+        self.assertEqual(self.client.get('/api/v1/calls/999999/').status_code, 404)
+
+        response = self.scrape()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        lines = response.content.decode().splitlines()
+        labels = '{route="call-list",method="GET"}'
+        self.assertIn('qm_http_requests_total{route="call-list",method="GET",status="200"} 1', lines)
+        self.assertIn('qm_http_requests_total{route="call-detail",method="GET",status="404"} 1', lines)
+        self.assertIn('# TYPE qm_db_queries_per_request histogram', lines)
+        self.assertIn(f'qm_db_queries_per_request_count{labels} 1', lines)
+        self.assertIn('qm_db_queries_per_request_bucket{route="call-list",method="GET",le="+Inf"} 1', lines)
+        samples = {line.split(' ')[0]: float(line.split(' ')[1]) for line in lines if not line.startswith('#')}
+        self.assertGreaterEqual(samples[f'qm_db_queries_per_request_sum{labels}'], 2)
+        self.assertGreater(samples[f'qm_serializer_duration_seconds_sum{labels}'], 0)
+        self.assertGreater(samples[f'qm_render_duration_seconds_sum{labels}'], 0)
+        self.assertGreater(samples[f'qm_http_response_size_bytes_sum{labels}'], 0)
+
+    def test_aggregates_worker_processes(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        registry = metrics.Registry(directory)
+        labels = (('route', 'call-list'), ('method', 'GET'))
+        registry.record([('qm_http_request_duration_seconds', labels, 0.02)])
+        # Başka bir worker sürecinin yazdığı dosya
+        other = metrics.Registry()
+        other.record([('qm_http_request_duration_seconds', labels, 3.0)])
+        with open(os.path.join(directory, '1.json'), 'w') as f:
+            json.dump(other.snapshot(), f)
+
+        text = metrics.render(registry.collect())
+        self.assertIn('qm_http_request_duration_seconds_count{route="call-list",method="GET"} 2', text)
+        self.assertIn('qm_http_request_duration_seconds_bucket{route="call-list",method="GET",le="0.025"} 1', text)
+        self.assertIn('qm_http_request_duration_seconds_bucket{route="call-list",method="GET",le="5.0"} 2', text)
+        self.assertTrue(os.path.exists(registry.snapshot_path()))
+
+
+class ValuesListSerializerTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.calls = self.create_calls(3)
+        self.calls[0].claimed_by = self.expert_user
+        self.calls[0].claimed_at = timezone.now()
+        self.calls[0].save()
+        self.calls[1].mp3_file = ''
+        self.calls[1].save()
+        evaluation = self.create_evaluations(self.calls[2:])[0]
+        evaluation.scores = {'1': 77.5}
+        evaluation.total_score = '77.5'
+        evaluation.save()
+        self.client.force_authenticate(self.admin_user)
+
+    def assert_matches_model_serializer(self, url, serializer_class, queryset):
+        for params in ({}, {'cursor': ''}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            expected = serializer_class(queryset, many=True, context={'request': response.wsgi_request}).data
+            self.assertEqual(json.loads(response.content)['results'], json.loads(JSONRenderer().render(expected)))
+
+    def test_call_list_matches_call_serializer(self):
+        self.assert_matches_model_serializer('/api/v1/calls/', CallSerializer,
+                                             Call.objects.order_by('-call_date', '-id'))
+
+    def test_evaluation_list_matches_evaluation_serializer(self):
+        self.assert_matches_model_serializer('/api/v1/evaluations/', EvaluationSerializer,
+                                             Evaluation.objects.order_by('-created_at', '-id'))
+
+    def test_cursor_pagination_with_values_rows(self):
+        self.create_calls(20, call_date=timezone.now() - datetime.timedelta(days=1))
+        first = self.client.get('/api/v1/calls/', {'cursor': ''})
+        second = self.client.get(first.data['next'])
+        ids = [row['id'] for row in first.data['results'] + second.data['results']]
+        self.assertEqual(ids, list(Call.objects.order_by('-call_date', '-id').values_list('id', flat=True)))
+        self.assertEqual([row['id'] for row in self.client.get(second.data['previous']).data['results']],
+                         ids[:20])
+
+
+@override_settings(API_QUERY_BUDGET_MODE='raise')
+class SparseFieldsetTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.calls = self.create_calls(2)
+        self.evaluation = self.create_evaluations(self.calls[:1])[0]
+        self.client.force_authenticate(self.admin_user)
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response, ' '.join(query['sql'] for query in queries)
+
+    def test_fields_trim_output_and_columns(self):
+        response, sql = self.get('/api/v1/evaluations/', {'fields': 'id,total_score,created_at'})
+        self.assertEqual(response.data['results'], [
+            {'id': self.evaluation.id, 'total_score': '80.00',
+             'created_at': json.loads(response.content)['results'][0]['created_at']},
+        ])
+        self.assertNotIn('"comments"', sql)
+        self.assertNotIn('"phone_number"', sql)
+
+        response, sql = self.get(f'/api/v1/calls/{self.calls[0].id}/', {'fields': 'id,agent_name'})
+        self.assertEqual(response.data, {'id': self.calls[0].id, 'agent_name': 'Ayşe Demir'})
+        self.assertNotIn('"phone_number"', sql)
+
+        response, sql = self.get('/api/v1/users/', {'fields': 'username'})
+        self.assertEqual({tuple(row) for row in response.data['results']}, {('username',)})
+        self.assertNotIn('"employee_id"', sql)
+
+    def test_expand(self):
+        details = {'id': self.agent_user.id, 'full_name': 'Ayşe Demir', 'team': 'Test Team', 'employee_id': '1002'}
+        response, _ = self.get('/api/v1/calls/', {'expand': 'agent_details'})
+        self.assertEqual(response.data['results'][0]['agent_details'], details)
+        self.assertNotIn('agent_details', self.client.get('/api/v1/calls/').data['results'][0])
+
+        # call_details varsayılan olarak gelir; ?fields ile çıkarılıp ?expand ile eklenebilir
+        response, _ = self.get('/api/v1/evaluations/', {'fields': 'id', 'expand': 'agent_details'})
+        self.assertEqual(response.data['results'], [{'id': self.evaluation.id, 'agent_details': details}])
+        response, _ = self.get(f'/api/v1/evaluations/{self.evaluation.id}/',
+                               {'fields': 'id', 'expand': 'call_details,agent_details'})
+        self.assertEqual(set(response.data), {'id', 'call_details', 'agent_details'})
+        self.assertEqual(response.data['agent_details'], details)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get('/api/v1/calls/', {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.data)
+        self.assertEqual(self.client.get('/api/v1/calls/', {'expand': 'queue'}).status_code, 400)
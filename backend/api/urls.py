@@ -8,6 +8,7 @@ from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework import permissions
 from django.views.generic import TemplateView
+from backend.api.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -19,11 +20,14 @@ urlpatterns = [
     # API endpoints
     path('api/v1/', include('backend.api.v1.urls')),
     
+    # Prometheus metrikleri (METRICS_TOKEN ile korunur)
+    path('metrics', metrics_view, name='metrics'),
+
     # Catch-all route for SPA
     path('', TemplateView.as_view(template_name='index.html'), name='index'),
 ]
 
-# Media ve static dosyaları için geliştirme ortamında URL'ler ekle
+# Static dosyalar için geliştirme ortamında URL ekle. Medya dizini (ses kayıtları)
+# bilerek sunulmaz; kayıtlara yetki kontrollü /api/v1/calls/{id}/audio/ ile erişilir.
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -0,0 +1,117 @@
+"""
+Çağrı ses kayıtlarının yetki kontrollü olarak sunulması.
+
+Yetki kontrolü Django'da yapılır, baytların aktarımı ise mümkünse önündeki
+proxy'ye bırakılır (nginx: X-Accel-Redirect, Apache/lighttpd: X-Sendfile).
+Proxy yapılandırılmamışsa dosya HTTP Range desteğiyle Python'dan bloklar
+halinde sunulur.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """Range başlığı dosya sınırları dışında"""
+
+
+def parse_range(header, size):
+    """
+    Tek aralıklı `Range: bytes=start-end` başlığını (start, end) olarak döndür.
+    Başlık yoksa, birden fazla aralık içeriyorsa ya da anlaşılamıyorsa None döner
+    ve dosyanın tamamı sunulur.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Son N bayt: bytes=-500
+        length = int(end)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def iter_file_range(path, start, end):
+    """Dosyanın [start, end] aralığını bloklar halinde oku"""
+    with open(path, 'rb') as source:
+        source.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            block = source.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def sendfile_response(file_field, content_type):
+    """
+    Bayt aktarımını proxy'ye bırakan boş gövdeli yanıt. Range istekleri ve
+    206 yanıtları proxy tarafından üretilir.
+    """
+    backend = settings.AUDIO_SENDFILE_BACKEND
+    response = HttpResponse(content_type=content_type)
+    if backend == 'nginx':
+        response['X-Accel-Redirect'] = quote(settings.AUDIO_SENDFILE_URL_PREFIX + file_field.name)
+    elif backend == 'xsendfile':
+        response['X-Sendfile'] = file_field.path
+    else:
+        raise ValueError(f'Bilinmeyen AUDIO_SENDFILE_BACKEND: {backend}')
+    return response
+
+
+def audio_response(request, call):
+    """
+    Çağrının ses kaydı için yanıt üret (yetki kontrolü çağıran tarafta yapılmış olmalı)
+    """
+    file_field = call.mp3_file
+    if not file_field.name:
+        raise Http404('Bu çağrı için ses kaydı yok.')
+    content_type = mimetypes.guess_type(file_field.name)[0] or 'audio/mpeg'
+
+    if settings.AUDIO_SENDFILE_BACKEND:
+        response = sendfile_response(file_field, content_type)
+    else:
+        try:
+            path = file_field.path
+            size = os.path.getsize(path)
+        except (NotImplementedError, OSError):
+            raise Http404('Ses kaydı bulunamadı.')
+
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        if byte_range is None:
+            # Tam dosya: FileResponse sunucunun wsgi.file_wrapper desteğini kullanır
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(iter_file_range(path, start, end),
+                                             status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(end - start + 1)
+
+    response['Accept-Ranges'] = 'bytes'
+    # Kayıtlar yetkiye bağlı olduğu için paylaşılan önbelleklerde tutulmamalı
+    response['Cache-Control'] = 'private, max-age=3600'
+    return response
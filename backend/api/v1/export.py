@@ -0,0 +1,273 @@
+"""
+Çağrı ve değerlendirmelerin CSV/XLSX olarak akış halinde dışa aktarılması.
+
+Satırlar `values_list().iterator()` ile gruplar halinde okunur; ilişkili
+alanlar (temsilci, değerlendiren, çağrı) aynı sorguda JOIN ile gelir. CSV ve
+XLSX çıktısı üretildikçe istemciye gönderilir, bu yüzden bellek kullanımı
+dışa aktarılan satır sayısından bağımsızdır. XLSX dosyası ek bir kütüphane
+gerektirmeden, sıkıştırılmış ZIP akışı olarak yazılır.
+"""
+import csv
+import datetime
+import io
+import json
+import re
+import zipfile
+from decimal import Decimal
+from itertools import chain
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+ITERATOR_CHUNK_SIZE = 2000
+# Bu kadar satır birikince istemciye gönder
+ROWS_PER_FLUSH = 500
+XLSX_FLUSH_BYTES = 64 * 1024
+
+# Hesap tablosu programlarında formül olarak yorumlanabilecek başlangıçlar
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+# Kaçışlanmayan sütunlar ('+90...' biçimli telefon numaraları bozulmasın); sadece
+# telefon karakterlerinden oluşan değerler formül olamayacağı için olduğu gibi yazılır
+UNESCAPED_COLUMNS = {'phone_number'}
+PHONE_VALUE = re.compile(r'^\+?[0-9 ()\-]*$')
+# XML 1.0'da izin verilmeyen kontrol karakterleri
+ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+CALL_COLUMNS = [
+    ('id', 'id'),
+    ('agent', 'agent_id'),
+    ('agent_employee_id', 'agent__employee_id'),
+    ('agent_name', ('agent__first_name', 'agent__last_name')),
+    ('team', 'agent__team'),
+    ('call_date', 'call_date'),
+    ('phone_number', 'phone_number'),
+    ('duration', 'duration'),
+    ('queue', 'queue'),
+    ('status', 'status'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+]
+
+EVALUATION_COLUMNS = [
+    ('id', 'id'),
+    ('call', 'call_id'),
+    ('agent_name', ('call__agent__first_name', 'call__agent__last_name')),
+    ('call_date', 'call__call_date'),
+    ('phone_number', 'call__phone_number'),
+    ('duration', 'call__duration'),
+    ('queue', 'call__queue'),
+    ('evaluator', 'evaluator_id'),
+    ('evaluator_name', ('evaluator__first_name', 'evaluator__last_name')),
+    ('total_score', 'total_score'),
+    ('scores', 'scores'),
+    ('comments', 'comments'),
+    ('improvement_areas', 'improvement_areas'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+]
+
+
+def date_range_filter(field, start=None, end=None):
+    """
+    Yerel takvim günleri [start, end] için indeks kullanabilen aralık filtresi
+    (`field__date` gibi fonksiyon sarmalı filtreler indeks kullanamaz)
+    """
+    lookups = {}
+    if start:
+        lookups[f'{field}__gte'] = timezone.make_aware(datetime.datetime.combine(start, datetime.time.min))
+    if end:
+        next_day = end + datetime.timedelta(days=1)
+        lookups[f'{field}__lt'] = timezone.make_aware(datetime.datetime.combine(next_day, datetime.time.min))
+    return lookups
+
+
+def query_fields(columns):
+    """Sütun tanımlarından values_list alan listesi"""
+    fields = []
+    for _, source in columns:
+        fields.extend(source if isinstance(source, tuple) else (source,))
+    return fields
+
+
+def export_value(value):
+    """Veritabanı değerini dışa aktarım hücresine çevir"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime.datetime):
+        return timezone.localtime(value).isoformat()
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def iter_rows(queryset, columns, criteria=()):
+    """
+    Sorgu sonucunu sütun sırasına göre satırlara çevir. `criteria` verilirse
+    (id, ad) çiftleri için scores alanından kriter puanı sütunları eklenir.
+    """
+    fields = query_fields(columns)
+    scores_index = fields.index('scores') if criteria else None
+    for record in queryset.values_list(*fields).iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        row = []
+        position = 0
+        for _, source in columns:
+            if isinstance(source, tuple):
+                # Ad + soyad (User.get_full_name ile aynı biçim)
+                row.append(' '.join(record[position:position + len(source)]).strip())
+                position += len(source)
+            else:
+                row.append(export_value(record[position]))
+                position += 1
+        if criteria:
+            scores = record[scores_index] or {}
+            row.extend(export_value(scores.get(str(criterion_id))) for criterion_id, _ in criteria)
+        yield row
+
+
+def header_row(columns, criteria=()):
+    return [name for name, _ in columns] + [f'score:{name}' for _, name in criteria]
+
+
+def csv_safe(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_phone(value):
+    """Telefon sütunu: numara biçimindeyse olduğu gibi, değilse diğer hücreler gibi kaçışlanır"""
+    if isinstance(value, str) and PHONE_VALUE.match(value):
+        return value
+    return csv_safe(value)
+
+
+class Echo:
+    """csv.writer için satırı olduğu gibi döndüren sahte dosya"""
+    def write(self, value):
+        return value
+
+
+def iter_csv(header, rows):
+    """CSV satırlarını gruplar halinde üret (Excel'in UTF-8 algılaması için BOM ile)"""
+    writer = csv.writer(Echo())
+    lines = ['\ufeff' + writer.writerow(header)]
+    formatters = [csv_phone if name in UNESCAPED_COLUMNS else csv_safe for name in header]
+    for row in rows:
+        lines.append(writer.writerow([format_value(value) for format_value, value in zip(formatters, row)]))
+        if len(lines) >= ROWS_PER_FLUSH:
+            yield ''.join(lines).encode('utf-8')
+            lines = []
+    if lines:
+        yield ''.join(lines).encode('utf-8')
+
+
+class StreamBuffer(io.RawIOBase):
+    """
+    ZipFile'ın yazdığı baytları biriktiren, konumlanamayan (seek desteklemeyen)
+    çıktı. ZipFile bu durumda veri tanımlayıcıları (data descriptor) kullanır.
+    """
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        return data
+
+
+XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+XLSX_SHEET_END = '</sheetData></worksheet>'
+
+
+def xlsx_cell(value):
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = escape(ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def iter_xlsx(header, rows, sheet_name='Sheet1'):
+    """Tek sayfalık XLSX dosyasını satır satır sıkıştırarak üret"""
+    buffer = StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        archive.writestr('xl/workbook.xml', XLSX_WORKBOOK.format(name=escape(sheet_name)))
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(XLSX_SHEET_START.encode())
+            for row in chain([header], rows):
+                sheet.write(('<row>' + ''.join(xlsx_cell(value) for value in row) + '</row>').encode('utf-8'))
+                if buffer.size >= XLSX_FLUSH_BYTES:
+                    yield buffer.pop()
+            sheet.write(XLSX_SHEET_END.encode())
+    yield buffer.pop()
+
+
+def export_response(export_format, header, rows, name):
+    """Akış halinde indirilecek dosya yanıtı"""
+    if export_format == 'xlsx':
+        content = iter_xlsx(header, rows, sheet_name=name)
+        content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    else:
+        content = iter_csv(header, rows)
+        content_type = 'text/csv; charset=utf-8'
+    response = StreamingHttpResponse(content, content_type=content_type)
+    file_name = f'{name}-{timezone.localdate():%Y%m%d}.{export_format}'
+    response['Content-Disposition'] = f'attachment; filename="{file_name}"'
+    response['Cache-Control'] = 'private, no-store'
+    return response
@@ -0,0 +1,198 @@
+"""
+Toplu çağrı kaydı aktarımı.
+
+İstek gövdesi satır satır okunur (NDJSON veya CSV), kayıtlar sabit boyutlu
+gruplar halinde doğrulanır ve `bulk_create` ile eklenir. Her grup için
+temsilciler tek sorguda `employee_id` üzerinden çözülür. Hatalı satırlar
+yüklemeyi durdurmaz; satır numarasıyla birlikte hata raporuna eklenir.
+"""
+import csv
+import json
+from collections import Counter, deque
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from backend.core import phone, stats
+from backend.core.models import Call, User
+
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonlines')
+CSV_CONTENT_TYPES = ('text/csv', 'application/csv')
+
+# Kayıtta kabul edilen alanlar (agent yerine employee_id gönderilir)
+RECORD_FIELDS = ('call_date', 'phone_number', 'duration', 'queue', 'status')
+
+
+def iter_lines(stream):
+    """İstek gövdesini belleğe almadan satır satır oku"""
+    if stream is None:
+        return iter(())
+    return iter(stream.readline, b'')
+
+
+def iter_ndjson_records(stream):
+    """NDJSON gövdesinden (satır no, kayıt, hata) üçlüleri üret"""
+    for line_no, line in enumerate(iter_lines(stream), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_no, None, f'Geçersiz JSON: {exc}'
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, 'Her satır bir JSON nesnesi olmalıdır.'
+            continue
+        yield line_no, record, None
+
+
+def iter_csv_records(stream):
+    """
+    CSV gövdesinden (satır no, kayıt, hata) üçlüleri üret; ilk satır başlıktır.
+    UTF-8 olmayan satırlar yüklemeyi durdurmaz, ait oldukları kayıt için hata üretir.
+    """
+    invalid_lines = deque()
+
+    def decode(lines):
+        for line_no, line in enumerate(lines, start=1):
+            try:
+                yield line.decode('utf-8')
+            except UnicodeDecodeError:
+                invalid_lines.append(line_no)
+                yield line.decode('utf-8', errors='replace')
+
+    reader = csv.DictReader(decode(iter_lines(stream)))
+    if reader.fieldnames is not None and invalid_lines and invalid_lines[0] == 1:
+        # Başlık okunamazsa sütunlar eşlenemez
+        yield 1, None, 'Başlık satırı geçerli UTF-8 değil.'
+        return
+    for record in reader:
+        # line_num başlık dahil dosyadaki satır numarasıdır (çok satırlı alanlarda kaydın son satırı)
+        if invalid_lines and invalid_lines[0] <= reader.line_num:
+            while invalid_lines and invalid_lines[0] <= reader.line_num:
+                invalid_lines.popleft()
+            yield reader.line_num, None, 'Satır geçerli UTF-8 değil.'
+            continue
+        yield reader.line_num, record, None
+
+
+class CallBulkIngest:
+    """
+    Çağrı kayıtlarını gruplar halinde doğrulayıp ekler
+    """
+    def __init__(self, batch_size=1000, max_errors=1000):
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line_no, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': line_no, 'errors': errors})
+
+    def clean_record(self, record):
+        """
+        Kaydı model alanlarının doğrulayıcılarıyla temizle; (değerler, hatalar) döndür
+        """
+        values, errors = {}, {}
+        for name in RECORD_FIELDS:
+            field = Call._meta.get_field(name)
+            raw = record.get(name)
+            if raw in (None, ''):
+                if field.has_default():
+                    values[name] = field.get_default()
+                else:
+                    errors[name] = ['Bu alan zorunludur.']
+                continue
+            try:
+                value = field.clean(raw, None)
+            except ValidationError as exc:
+                errors[name] = exc.messages
+                continue
+            except (TypeError, ValueError):
+                # JSON'da sayı gibi alanın beklemediği türde değerler
+                errors[name] = ['Geçersiz değer.']
+                continue
+            if name == 'call_date' and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            values[name] = value
+
+        mp3_file = record.get('mp3_file') or ''
+        if not isinstance(mp3_file, str):
+            errors['mp3_file'] = ['Dosya adı metin olmalıdır.']
+            mp3_file = ''
+        elif mp3_file and not mp3_file.lower().endswith('.mp3'):
+            errors['mp3_file'] = ['Sadece mp3 dosyaları kabul edilir.']
+        values['mp3_file'] = mp3_file
+
+        if not record.get('employee_id'):
+            errors['employee_id'] = ['Bu alan zorunludur.']
+        return values, errors
+
+    def process_batch(self, batch):
+        """
+        Bir grup kaydı doğrula ve tek bulk_create ile ekle
+        """
+        employee_ids = {str(record['employee_id']) for _, record, _ in batch
+                        if record and record.get('employee_id')}
+        agents = dict(User.objects.filter(employee_id__in=employee_ids).values_list('employee_id', 'id'))
+
+        calls, line_numbers = [], []
+        for line_no, record, error in batch:
+            if error:
+                self.add_error(line_no, {'non_field_errors': [error]})
+                continue
+            try:
+                values, errors = self.clean_record(record)
+            except (TypeError, ValueError) as exc:
+                self.add_error(line_no, {'non_field_errors': [f'Geçersiz kayıt: {exc}']})
+                continue
+            agent_id = agents.get(str(record.get('employee_id') or ''))
+            if 'employee_id' not in errors and agent_id is None:
+                errors['employee_id'] = ['Bu sicil numarasına sahip temsilci bulunamadı.']
+            if errors:
+                self.add_error(line_no, errors)
+                continue
+            # bulk_create pre_save sinyali göndermez
+            calls.append(Call(agent_id=agent_id, phone_e164=phone.normalize(values.get('phone_number')), **values))
+            line_numbers.append(line_no)
+
+        if not calls:
+            return
+        try:
+            with transaction.atomic():
+                Call.objects.bulk_create(calls, batch_size=self.batch_size)
+                # bulk_create sinyal göndermez; dashboard sayaçlarını toplu güncelle
+                stats.increment(stats.CALLS_TOTAL, len(calls))
+                for status, count in Counter(call.status for call in calls).items():
+                    stats.increment(stats.call_status_counter(status), count)
+        except DatabaseError as exc:
+            for line_no in line_numbers:
+                self.add_error(line_no, {'non_field_errors': [f'Veritabanı hatası: {exc}']})
+            return
+        self.created += len(calls)
+
+    def run(self, records):
+        """
+        Kayıt akışını gruplar halinde işle ve hata raporunu döndür
+        """
+        records = iter(records)
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                break
+            self.process_batch(batch)
+        return self.report()
+
+    def report(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
@@ -0,0 +1,296 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.db import connection
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from backend.api import db_router, metrics
+from .serializers import parse_field_names
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Bir endpoint tanımlı sorgu bütçesini aştığında fırlatılır
+    """
+
+
+class QueryCounter:
+    """
+    connection.execute_wrapper ile çalışan basit sorgu sayacı
+    """
+    def __init__(self):
+        self.count = 0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMixin:
+    """
+    ViewSet aksiyonlarının çalıştırdığı sorgu sayısını sayar ve
+    `query_budget` ile tanımlanan sınırı aşan istekleri loglar ya da hata verir.
+
+    `query_budget` aksiyon adı -> maksimum sorgu sayısı sözlüğüdür. Davranış
+    `API_QUERY_BUDGET_MODE` ayarı ile belirlenir: 'off', 'log' veya 'raise'.
+    """
+    query_budget = {}
+
+    def get_query_budget(self):
+        """
+        Mevcut aksiyon için sorgu bütçesini döndür (tanımlı değilse None)
+        """
+        return self.query_budget.get(getattr(self, 'action', None))
+
+    def dispatch(self, request, *args, **kwargs):
+        mode = getattr(settings, 'API_QUERY_BUDGET_MODE', 'log')
+        if mode == 'off':
+            return super().dispatch(request, *args, **kwargs)
+
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = super().dispatch(request, *args, **kwargs)
+
+        budget = self.get_query_budget()
+        if budget is not None and counter.count > budget:
+            message = (
+                f"{self.__class__.__name__}.{self.action} sorgu bütçesini aştı: "
+                f"{counter.count} sorgu (bütçe: {budget})"
+            )
+            if mode == 'raise':
+                raise QueryBudgetExceeded(message + '\n' + '\n'.join(counter.queries))
+            logger.warning(message)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    list ve retrieve aksiyonları için ETag / Last-Modified doğrulayıcıları.
+
+    Doğrulayıcılar serileştirme yapılmadan, zaten okunan satırların ucuz meta
+    verisinden üretilir: sayfadaki satırların id'leri ve `conditional_fields`
+    alanlarının en büyük değeri, kapsamdaki toplam satır sayısı (sayfalamanın
+    COUNT sorgusu) ve sayfa bağlantıları (cursor modunda dahil). Ek sorgu
+    çalışmaz; istemcinin If-None-Match / If-Modified-Since başlıkları eşleşirse
+    serializer hiç çalışmadan 304 döner.
+
+    Listelerde Last-Modified gönderilmez: sayfadaki en yeni satırın tarihi
+    silinen ya da sayfaya kayan eski satırlarla değişmez. Listeler sadece ETag
+    ile doğrulanır; Last-Modified yalnızca tekil kayıtlarda kullanılır.
+    """
+    # İlişkili nesnelerin yanıta yansıyan değişiklikleri için örn. 'agent__updated_at'
+    conditional_fields = ('updated_at',)
+    # Tanımlıysa list aksiyonu satırları values() ile okur ve bu serializer'la
+    # (ValuesListSerializer) üretir; model örneği oluşturulmaz
+    values_serializer_class = None
+
+    def get_conditional_validators(self, objects):
+        """
+        (etag, last_modified zaman damgası) çifti. ETag sorgu parametrelerini,
+        kullanıcıyı ve yanıt biçimini de kapsar; farklı sayfa/filtre yanıtları karışmaz.
+        """
+        stamps = [
+            stamp for stamp in (
+                self.resolve_field(obj, field) for obj in objects for field in self.conditional_fields
+            ) if stamp is not None
+        ]
+        last_modified = max(stamps) if stamps else None
+        etag = self.make_etag(
+            [obj['id'] if isinstance(obj, dict) else obj.pk for obj in objects],
+            last_modified.isoformat() if last_modified else None,
+            *self.pagination_state(),
+        )
+        return etag, int(last_modified.timestamp()) if last_modified else None
+
+    def pagination_state(self):
+        """Toplam satır sayısı ve sayfa bağlantıları (silinen/eklenen satırları yakalar)"""
+        paginator = getattr(self, '_paginator', None)
+        if paginator is None:
+            return ()
+        if getattr(paginator, 'keyset', None) is not None:
+            # Cursor modunda COUNT yok; sonraki/önceki cursor'lar sayfa sınırlarını taşır
+            return None, paginator.get_next_link(), paginator.get_previous_link()
+        if getattr(paginator, 'page', None) is None:
+            return ()
+        django_paginator = getattr(paginator.page, 'paginator', None)
+        count = django_paginator.count if django_paginator is not None else None
+        return count, paginator.get_next_link(), paginator.get_previous_link()
+
+    def make_etag(self, *parts):
+        request = self.request
+        media_type = getattr(request, 'accepted_media_type', '')
+        key = repr((request.get_full_path(), request.user.pk, media_type) + parts)
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    @staticmethod
+    def resolve_field(instance, field):
+        if isinstance(instance, dict):
+            # values() satırı: ilişkili alanlar '__' ile seçilmiştir
+            return instance.get(field)
+        value = instance
+        for name in field.split('__'):
+            value = getattr(value, name, None)
+            if value is None:
+                return None
+        return value
+
+    def respond_conditionally(self, request, validators, render):
+        """
+        Ön koşullar eşleşirse 304 (veya If-Match için 412) döndür; aksi halde
+        `render()` ile yanıtı üret. Her iki durumda doğrulayıcı başlıkları eklenir.
+        """
+        etag, last_modified = validators
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = render()
+        self.set_validator_headers(response, etag, last_modified)
+        return response
+
+    @staticmethod
+    def set_validator_headers(response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        # Yanıt kullanıcıya özeldir; her kullanımda sunucuya doğrulatılmalı
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Authorization'])
+
+    def get_values_serializer(self):
+        if self.values_serializer_class is None:
+            return None
+        return self.values_serializer_class(context=self.get_serializer_context())
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        values_serializer = self.get_values_serializer()
+        if values_serializer is not None:
+            # ETag alanları ve cursor sütunları seçimden bağımsız okunur
+            extra_fields = ('id',) + tuple(getattr(self, 'keyset_ordering', ())) + tuple(self.conditional_fields)
+            queryset = values_serializer.prepare(queryset, extra_fields)
+        page = self.paginate_queryset(queryset)
+        objects = list(queryset) if page is None else page
+
+        def render():
+            with metrics.timed('serializer'):
+                if values_serializer is not None:
+                    data = values_serializer.serialize(objects)
+                else:
+                    data = self.get_serializer(objects, many=True).data
+            return self.get_paginated_response(data) if page is not None else Response(data)
+        etag, _ = self.get_conditional_validators(objects)
+        return self.respond_conditionally(request, (etag, None), render)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+
+        def render():
+            with metrics.timed('serializer'):
+                return Response(self.get_serializer(instance).data)
+        return self.respond_conditionally(request, self.get_conditional_validators([instance]), render)
+
+
+class ReplicaReadMixin:
+    """
+    `replica_actions` içindeki okuma aksiyonlarının sorgularını okuma
+    replikasına yönlendirir. Başarılı yazma isteklerinden sonra kullanıcının
+    okumaları REPLICA_PIN_SECONDS boyunca birincil veritabanında kalır.
+    """
+    replica_actions = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_tokens = None
+        if (request.method in SAFE_METHODS and self.action in self.replica_actions
+                and not db_router.is_user_pinned(request.user.id)):
+            self._replica_tokens = db_router.start_replica_reads()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if getattr(self, '_replica_tokens', None) is not None:
+            db_router.stop_replica_reads(self._replica_tokens)
+            self._replica_tokens = None
+        if request.method not in SAFE_METHODS and response.status_code < 400 and request.user.is_authenticated:
+            db_router.pin_user(request.user.id)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class SparseFieldsetMixin:
+    """
+    GET isteklerinde ?fields=id,total_score (sadece bu alanlar) ve
+    ?expand=agent_details (iç içe/ek ilişkili veriler) desteği; serializer
+    SparseFieldsMixin kullanmalıdır. Seçim okunan sütunlara da yansır:
+    values() tabanlı listelerde sadece seçilen alanların sütunları okunur,
+    model örnekleriyle çalışan list/retrieve sorgularına .only() uygulanır.
+    """
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def get_fieldset(self):
+        """(seçilen alanlar ya da None, genişletilen alanlar); bilinmeyen adlar 400 döner"""
+        if getattr(self, '_fieldset', None) is not None:
+            return self._fieldset
+        fields, expand = None, []
+        if self.request.method in SAFE_METHODS:
+            meta = self.get_serializer_class().Meta
+            params = self.request.query_params
+            errors = {}
+            if params.get(self.fields_query_param):
+                fields = parse_field_names(params[self.fields_query_param])
+                unknown = [name for name in fields if name not in meta.fields]
+                if unknown:
+                    errors[self.fields_query_param] = f'Bilinmeyen alan: {", ".join(unknown)}'
+            if params.get(self.expand_query_param):
+                expand = parse_field_names(params[self.expand_query_param])
+                unknown = [name for name in expand if name not in getattr(meta, 'expandable_fields', ())]
+                if unknown:
+                    errors[self.expand_query_param] = f'Genişletilemeyen alan: {", ".join(unknown)}'
+            if errors:
+                raise ValidationError(errors)
+        self._fieldset = (fields, expand)
+        return self._fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'], context['expand'] = self.get_fieldset()
+        return context
+
+    def get_sparse_columns(self):
+        """
+        Seçilen alanların model sütunları; sütunu belirlenemeyen bir alan
+        (ör. SerializerMethodField) varsa None
+        """
+        if getattr(self, 'values_serializer_class', None) is not None:
+            return self.values_serializer_class(context=self.get_serializer_context()).columns
+        model = self.get_serializer_class().Meta.model
+        concrete = {field.name: field.attname for field in model._meta.concrete_fields}
+        columns = []
+        for field in self.get_serializer().fields.values():
+            if field.source not in concrete:
+                return None
+            columns.append(concrete[field.source])
+        return tuple(columns)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, _ = self.get_fieldset()
+        values_list = self.action == 'list' and getattr(self, 'values_serializer_class', None) is not None
+        if fields is None or self.action not in ('list', 'retrieve') or values_list:
+            return queryset
+        columns = self.get_sparse_columns()
+        if columns is None:
+            return queryset
+        columns = ('id',) + columns + tuple(getattr(self, 'conditional_fields', ()))
+        # .only() ile dışarıda kalan ilişkiler select_related'de de kalmamalı
+        relations = {column.rsplit('__', 1)[0] for column in columns if '__' in column}
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*dict.fromkeys(columns))
@@ -0,0 +1,142 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    (sıralama alanı, id) çifti üzerinden çalışan keyset (cursor) sayfalama.
+
+    COUNT(*) ve OFFSET kullanmaz; her sayfa indeks üzerinde bir aralık taraması
+    ile okunur, bu yüzden derin sayfalar ilk sayfa kadar ucuzdur. Sıralama her
+    zaman azalandır (en yeni kayıt önce).
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Geçersiz cursor.'
+
+    def __init__(self, ordering, page_size):
+        self.field, self.tiebreaker = ordering
+        self.page_size = page_size
+
+    def encode_cursor(self, obj, reverse=False):
+        """
+        Verilen satırın konumunu URL güvenli cursor değerine çevir
+        """
+        if isinstance(obj, dict):
+            # values() satırı
+            value, tiebreaker = obj[self.field], obj[self.tiebreaker]
+        else:
+            value, tiebreaker = getattr(obj, self.field), getattr(obj, self.tiebreaker)
+        payload = [value.isoformat() if hasattr(value, 'isoformat') else value, tiebreaker]
+        if reverse:
+            payload.append('r')
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def decode_cursor(self, queryset, token):
+        """
+        Cursor değerini (alan değeri, id, geri mi) üçlüsüne çevir
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            value, pk = payload[0], payload[1]
+            reverse = len(payload) > 2 and payload[2] == 'r'
+            field = queryset.model._meta.get_field(self.field)
+            value = field.to_python(value)
+            pk = int(pk)
+        except (TypeError, ValueError, IndexError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk, reverse
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        token = request.query_params.get(self.cursor_query_param)
+        descending = ('-' + self.field, '-' + self.tiebreaker)
+        ascending = (self.field, self.tiebreaker)
+
+        if not token:
+            self.reverse = False
+            self.has_cursor = False
+            rows = list(queryset.order_by(*descending)[:self.page_size + 1])
+        else:
+            value, pk, self.reverse = self.decode_cursor(queryset, token)
+            self.has_cursor = True
+            if self.reverse:
+                boundary = Q(**{self.field + '__gt': value}) | Q(
+                    **{self.field: value, self.tiebreaker + '__gt': pk})
+                rows = list(queryset.filter(boundary).order_by(*ascending)[:self.page_size + 1])
+            else:
+                boundary = Q(**{self.field + '__lt': value}) | Q(
+                    **{self.field: value, self.tiebreaker + '__lt': pk})
+                rows = list(queryset.filter(boundary).order_by(*descending)[:self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+        self.page = rows
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param,
+                                   self.encode_cursor(self.page[0], reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class KeysetOrPageNumberPagination(PageNumberPagination):
+    """
+    Varsayılan olarak sayfa numarası ile sayfalar; istekte `cursor`
+    parametresi varsa (ilk sayfa için boş değer: `?cursor=`) view üzerindeki
+    `keyset_ordering` ile keyset sayfalamaya geçer. Böylece mevcut istemciler
+    etkilenmeden derin sayfalar için cursor modu kullanılabilir.
+    """
+    cursor_query_param = KeysetPagination.cursor_query_param
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, 'keyset_ordering', None)
+        if ordering and self.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination(ordering, self.get_page_size(request))
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
@@ -1,7 +1,60 @@
-from rest_framework import serializers
-from backend.core.models import User, Call, Evaluation, EvaluationCriteria
+import re
+from operator import itemgetter
 
-class UserSerializer(serializers.ModelSerializer):
+from django.urls import reverse
+from django.utils.functional import cached_property
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from backend.core import scoring, uploads
+from backend.core.models import User, Call, Evaluation, EvaluationCriteria, PerformanceRollup, UploadSession
+
+
+def parse_field_names(value):
+    """Virgülle ayrılmış alan listesi ('id, total_score') -> tekrarsız ad listesi"""
+    return list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+
+
+def full_name(first_name, last_name):
+    """User.get_full_name ile aynı"""
+    return f'{first_name} {last_name}'.strip()
+
+
+def agent_details(agent):
+    """?expand=agent_details ile eklenen temsilci bilgisi"""
+    return {'id': agent.id, 'full_name': agent.get_full_name(), 'team': agent.team,
+            'employee_id': agent.employee_id}
+
+
+class SparseFieldsMixin:
+    """
+    ?fields= ve ?expand= ile çıktı alanlarının seçimi (bkz. SparseFieldsetMixin).
+
+    Meta.expandable_fields iç içe ya da ek ilişkili veri üreten alanlardır;
+    Meta.default_expanded içindekiler (geriye uyumluluk için) ?fields
+    verilmediğinde çıktıdadır, diğerleri sadece ?expand= ile ya da ?fields=
+    içinde adıyla istenirse eklenir. Seçim context'teki 'fields' ve 'expand'
+    değerlerinden okunur.
+    """
+
+    @classmethod
+    def select_fields(cls, names, fields=None, expand=()):
+        """`names` içinden seçilen alanlar (bildirim sırasıyla)"""
+        if fields is None:
+            expandable = getattr(cls.Meta, 'expandable_fields', ())
+            wanted = {name for name in names if name not in expandable}
+            wanted.update(getattr(cls.Meta, 'default_expanded', ()))
+        else:
+            wanted = set(fields)
+        wanted.update(expand)
+        return [name for name in names if name in wanted]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.select_fields(list(fields), self.context.get('fields'), self.context.get('expand', ()))
+        return {name: fields[name] for name in selected}
+
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     User modeli için serializer
     """
@@ -35,24 +88,49 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
         return user
 
-class CallSerializer(serializers.ModelSerializer):
+class CallAudioField(serializers.FileField):
+    """
+    Yazarken ses dosyası; okurken ham medya yolu yerine yetki kontrollü
+    /calls/{id}/audio/ endpointinin URL'i döner (medya dizini doğrudan sunulmaz)
+    """
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = reverse('call-audio', args=[value.instance.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+
+class CallSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Çağrı modeli için serializer
     """
     agent_name = serializers.SerializerMethodField()
+    agent_details = serializers.SerializerMethodField()
     
     class Meta:
         model = Call
-        fields = ['id', 'agent', 'agent_name', 'call_date', 'phone_number', 'duration', 
-                 'mp3_file', 'queue', 'status', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'agent', 'agent_name', 'agent_details', 'call_date', 'phone_number', 'duration',
+                 'mp3_file', 'queue', 'status', 'claimed_by', 'claimed_at', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'claimed_by', 'claimed_at', 'created_at', 'updated_at']
+        expandable_fields = ['agent_details']
     
+    def build_standard_field(self, field_name, model_field):
+        # Model alanının doğrulayıcıları ve zorunluluğu korunur, sadece çıktı değişir
+        field_class, field_kwargs = super().build_standard_field(field_name, model_field)
+        if field_name == 'mp3_file':
+            field_class = CallAudioField
+        return field_class, field_kwargs
+
     def get_agent_name(self, obj):
         """
         Temsilcinin tam adını döndür
         """
         return obj.agent.get_full_name() if obj.agent else ''
 
+    def get_agent_details(self, obj):
+        return agent_details(obj.agent)
+
 class EvaluationCriteriaSerializer(serializers.ModelSerializer):
     """
     Değerlendirme kriteri modeli için serializer
@@ -62,18 +140,43 @@ class EvaluationCriteriaSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'weight']
         read_only_fields = ['id']
 
-class EvaluationSerializer(serializers.ModelSerializer):
+class EvaluationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Değerlendirme modeli için serializer
     """
     evaluator_name = serializers.SerializerMethodField()
     call_details = serializers.SerializerMethodField()
+    agent_details = serializers.SerializerMethodField()
     
     class Meta:
         model = Evaluation
-        fields = ['id', 'call', 'call_details', 'evaluator', 'evaluator_name', 'scores', 
+        fields = ['id', 'call', 'call_details', 'agent_details', 'evaluator', 'evaluator_name', 'scores',
                  'total_score', 'comments', 'improvement_areas', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'total_score', 'created_at', 'updated_at']
+        expandable_fields = ['call_details', 'agent_details']
+        default_expanded = ['call_details']
+    
+    def validate_scores(self, value):
+        """
+        Puanlar {kriter id: 0-100 arası puan} sözlüğü olmalı
+        """
+        if not isinstance(value, dict):
+            raise serializers.ValidationError('Puanlar kriter id -> puan sözlüğü olmalıdır.')
+        weights = scoring.criteria_weights()
+        for criterion_id, score in value.items():
+            if not str(criterion_id).isdigit() or int(criterion_id) not in weights:
+                raise serializers.ValidationError(f'Bilinmeyen kriter: {criterion_id}')
+            if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 100:
+                raise serializers.ValidationError(f'{criterion_id} kriteri için puan 0-100 arasında olmalıdır.')
+        return value
+    
+    def validate(self, attrs):
+        """
+        Toplam puanı güncel kriter ağırlıklarıyla sunucuda hesapla
+        """
+        if 'scores' in attrs:
+            attrs['total_score'] = scoring.compute_total_score(attrs['scores'], scoring.criteria_weights())
+        return attrs
     
     def get_evaluator_name(self, obj):
         """
@@ -94,4 +197,287 @@ class EvaluationSerializer(serializers.ModelSerializer):
             'call_date': obj.call.call_date,
             'phone_number': obj.call.phone_number,
             'duration': str(obj.call.duration),
-        } 
\ No newline at end of file
+        }
+
+    def get_agent_details(self, obj):
+        """
+        Değerlendirilen çağrının temsilcisi
+        """
+        return agent_details(obj.call.agent)
+
+class ValuesListSerializer:
+    """
+    Liste aksiyonları için salt okunur serializer: satırlar model örneği
+    oluşturulmadan `.values()` ile (ilişkiler JOIN'le) okunur ve sıkı bir
+    döngüde çıktı sözlüğüne çevrilir. Çıktı `serializer_class`ın ürettiğiyle
+    birebir aynıdır; tarih, süre ve ondalık alanlar o serializer'ın kendi
+    alanlarıyla biçimlendirilir. ?fields= / ?expand= seçimi (context) hem
+    çıktıya hem okunan sütunlara uygulanır.
+    """
+    serializer_class = None
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.request = self.context.get('request')
+        # Biçimlendirmede kullanılan alanlar (seçimden bağımsız)
+        self.fields = self.serializer_class(context={'request': self.request}).fields
+        selected = self.serializer_class.select_fields(
+            list(self.serializer_class.Meta.fields), self.context.get('fields'), self.context.get('expand', ()),
+        )
+        specs = self.get_specs()
+        self.getters = [(name, specs[name][1]) for name in selected]
+        # Seçilen alanların values() sütunları (ilişkili alanlar '__' ile)
+        self.columns = tuple(dict.fromkeys(column for name in selected for column in specs[name][0]))
+
+    def get_specs(self):
+        """çıktı alanı -> (values() sütunları, satırdan değeri üreten fonksiyon)"""
+        raise NotImplementedError
+
+    def prepare(self, queryset, extra_fields=()):
+        """Sorguyu gereken sütunlarla values() sorgusuna çevir (extra_fields: örn. ETag ve cursor alanları)"""
+        return queryset.values(*dict.fromkeys(self.columns + tuple(extra_fields)))
+
+    def serialize(self, rows):
+        """values() satırlarını çıktı sözlüklerine çevir"""
+        getters = self.getters
+        return [{name: get(row) for name, get in getters} for row in rows]
+
+    @staticmethod
+    def column(name, formatter=None):
+        """Tek sütunlu alan: (sütunlar, değer fonksiyonu)"""
+        if formatter is None:
+            return (name,), itemgetter(name)
+        return (name,), lambda row: formatter(row[name])
+
+    def datetime_formatter(self, name):
+        """
+        `name` alanının DateTimeField.to_representation'ı; ISO 8601 biçiminde
+        saat dilimi her satırda değil bir kez çözülür.
+        """
+        field = self.fields[name]
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+            return field.to_representation
+
+        def represent(value):
+            if not value:
+                return None
+            value = value.astimezone(field_timezone).isoformat()
+            return value[:-6] + 'Z' if value.endswith('+00:00') else value
+        return represent
+
+    def absolute_url(self, path):
+        """Kök göreli yol (istek varsa build_absolute_uri gibi mutlak; şema/host bir kez hesaplanır)"""
+        if self.request is None:
+            return path
+        return self.scheme_host + path
+
+    @cached_property
+    def scheme_host(self):
+        return self.request.build_absolute_uri('/')[:-1]
+
+    @staticmethod
+    def full_name_column(prefix):
+        """`prefix` kullanıcısının tam adı (örn. 'agent' ya da 'call__agent')"""
+        first, last = f'{prefix}__first_name', f'{prefix}__last_name'
+        return (first, last), lambda row: full_name(row[first], row[last])
+
+    @staticmethod
+    def agent_details_column(prefix):
+        """agent_details() çıktısı"""
+        columns = tuple(f'{prefix}__{name}' for name in ('id', 'first_name', 'last_name', 'team', 'employee_id'))
+        agent_id, first, last, team, employee_id = columns
+        return columns, lambda row: {'id': row[agent_id], 'full_name': full_name(row[first], row[last]),
+                                     'team': row[team], 'employee_id': row[employee_id]}
+
+
+class CallValuesSerializer(ValuesListSerializer):
+    """
+    CallSerializer çıktısını values() satırlarından üretir
+    """
+    serializer_class = CallSerializer
+
+    def get_specs(self):
+        column = self.column
+        datetime = self.datetime_formatter('call_date')
+        absolute_url = self.absolute_url
+        # CallAudioField çıktısı; reverse satır başına değil bir kez çağrılır (detay rotası: <liste>/<id>/audio/)
+        calls_path = reverse('call-list')
+
+        def audio_url(row):
+            return absolute_url(f'{calls_path}{row["id"]}/audio/') if row['mp3_file'] else None
+        return {
+            'id': column('id'),
+            'agent': column('agent_id'),
+            'agent_name': self.full_name_column('agent'),
+            'agent_details': self.agent_details_column('agent'),
+            'call_date': column('call_date', datetime),
+            'phone_number': column('phone_number'),
+            'duration': column('duration', self.fields['duration'].to_representation),
+            'mp3_file': (('id', 'mp3_file'), audio_url),
+            'queue': column('queue'),
+            'status': column('status'),
+            'claimed_by': column('claimed_by_id'),
+            'claimed_at': column('claimed_at', datetime),
+            'created_at': column('created_at', datetime),
+            'updated_at': column('updated_at', datetime),
+        }
+
+
+class EvaluationValuesSerializer(ValuesListSerializer):
+    """
+    EvaluationSerializer çıktısını (call_details dahil) values() satırlarından üretir
+    """
+    serializer_class = EvaluationSerializer
+
+    def get_specs(self):
+        column = self.column
+        datetime = self.datetime_formatter('created_at')
+        agent_columns, agent_name = self.full_name_column('call__agent')
+
+        def call_details(row):
+            return {
+                'id': row['call_id'],
+                'agent_name': agent_name(row),
+                'call_date': row['call__call_date'],
+                'phone_number': row['call__phone_number'],
+                'duration': str(row['call__duration']),
+            }
+        return {
+            'id': column('id'),
+            'call': column('call_id'),
+            'call_details': (('call_id', 'call__call_date', 'call__phone_number', 'call__duration') + agent_columns,
+                             call_details),
+            'agent_details': self.agent_details_column('call__agent'),
+            'evaluator': column('evaluator_id'),
+            'evaluator_name': self.full_name_column('evaluator'),
+            'scores': column('scores'),
+            'total_score': column('total_score', self.fields['total_score'].to_representation),
+            'comments': column('comments'),
+            'improvement_areas': column('improvement_areas'),
+            'created_at': column('created_at', datetime),
+            'updated_at': column('updated_at', datetime),
+        }
+
+
+class RecentCallSerializer(serializers.ModelSerializer):
+    """
+    Dashboard'daki son çağrılar listesi için serializer
+    """
+    agentName = serializers.SerializerMethodField()
+    callDate = serializers.DateTimeField(source='call_date')
+    phoneNumber = serializers.CharField(source='phone_number')
+    duration = serializers.SerializerMethodField()
+    score = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Call
+        fields = ['id', 'agentName', 'callDate', 'phoneNumber', 'duration', 'status', 'score']
+
+    def get_agentName(self, obj):
+        return obj.agent.get_full_name() if obj.agent else ''
+
+    def get_duration(self, obj):
+        return str(obj.duration)
+
+    def get_score(self, obj):
+        """
+        Çağrı değerlendirildiyse toplam puanı döndür
+        """
+        evaluation = getattr(obj, 'evaluation', None)
+        return float(evaluation.total_score) if evaluation else None
+
+
+class PerformanceReportQuerySerializer(serializers.Serializer):
+    """
+    Performans raporu sorgu parametreleri
+    """
+    grain = serializers.ChoiceField(choices=PerformanceRollup.Grain.choices, default=PerformanceRollup.Grain.DAY)
+    dimension = serializers.ChoiceField(choices=PerformanceRollup.Dimension.choices,
+                                        default=PerformanceRollup.Dimension.TEAM)
+    key = serializers.CharField(required=False, max_length=50)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('start') and attrs.get('end') and attrs['start'] > attrs['end']:
+            raise serializers.ValidationError({'end': 'Bitiş tarihi başlangıçtan önce olamaz'})
+        return attrs
+
+
+class CallClaimSerializer(serializers.Serializer):
+    """
+    Sıradaki çağrıyı üstlenme filtreleri
+    """
+    queue = serializers.CharField(required=False, max_length=50)
+    agent = serializers.IntegerField(required=False, min_value=1)
+    team = serializers.CharField(required=False, max_length=50)
+    sample_percent = serializers.IntegerField(required=False, min_value=1, max_value=100)
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """
+    Dışa aktarım sorgu parametreleri (DRF `format` parametresini kullandığı için `export_format`)
+    """
+    export_format = serializers.ChoiceField(choices=['csv', 'xlsx'], default='csv')
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('start') and attrs.get('end') and attrs['start'] > attrs['end']:
+            raise serializers.ValidationError({'end': 'Bitiş tarihi başlangıçtan önce olamaz'})
+        return attrs
+
+
+class PerformanceRollupSerializer(serializers.ModelSerializer):
+    """
+    Performans özeti satırı için serializer
+    """
+    average_score = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    average_handle_time = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = PerformanceRollup
+        fields = ['grain', 'dimension', 'key', 'period_start', 'call_count', 'evaluation_count',
+                  'duration_seconds', 'average_score', 'average_handle_time']
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    Parça parça yükleme oturumu için serializer
+    """
+    chunk_count = serializers.IntegerField(read_only=True)
+    missing_chunks = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'call', 'total_size', 'chunk_size', 'checksum', 'status',
+                  'received_chunks', 'chunk_count', 'missing_chunks', 'created_at']
+        read_only_fields = ['id', 'status', 'received_chunks', 'created_at']
+        extra_kwargs = {
+            'chunk_size': {'required': False}
+        }
+
+    def validate_checksum(self, value):
+        """
+        SHA-256 özeti 64 karakterlik hex olmalı
+        """
+        if not re.fullmatch(r'[0-9a-fA-F]{64}', value):
+            raise serializers.ValidationError('Geçerli bir SHA-256 özeti girin.')
+        return value
+
+    def create(self, validated_data):
+        """
+        Oturumu açarken boş .part dosyasını da oluştur
+        """
+        try:
+            return uploads.start_session(
+                call=validated_data['call'],
+                user_id=self.context['request'].user.id,
+                total_size=validated_data['total_size'],
+                checksum=validated_data['checksum'],
+                chunk_size=validated_data.get('chunk_size'),
+            )
+        except uploads.UploadError as exc:
+            raise serializers.ValidationError({'detail': str(exc)})
@@ -1,6 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import UserViewSet, CallViewSet, EvaluationViewSet, EvaluationCriteriaViewSet
+from .views import (
+    UserViewSet, CallViewSet, EvaluationViewSet, EvaluationCriteriaViewSet, DashboardViewSet,
+    ReportViewSet, UploadSessionViewSet,
+)
 
 # DefaultRouter kullanarak API endpointleri oluştur
 router = DefaultRouter()
@@ -8,6 +11,9 @@ router.register(r'users', UserViewSet)
 router.register(r'calls', CallViewSet)
 router.register(r'evaluations', EvaluationViewSet)
 router.register(r'criteria', EvaluationCriteriaViewSet)
+router.register(r'dashboard', DashboardViewSet, basename='dashboard')
+router.register(r'reports', ReportViewSet, basename='reports')
+router.register(r'uploads', UploadSessionViewSet)
 
 # API URL patterns
 urlpatterns = [
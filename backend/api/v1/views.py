@@ -1,14 +1,43 @@
-from rest_framework import viewsets, permissions
-from backend.core.models import User, Call, Evaluation, EvaluationCriteria
-from .serializers import UserSerializer, CallSerializer, EvaluationSerializer, EvaluationCriteriaSerializer
+from datetime import timedelta
+from decimal import Decimal
 
-class UserViewSet(viewsets.ModelViewSet):
+from django.conf import settings
+from django.http import FileResponse, Http404
+from django.utils import timezone
+from rest_framework import mixins, viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, UnsupportedMediaType, ValidationError
+from rest_framework.response import Response
+from backend.core import claims, phone, reference_data, rollups, search, stats, uploads
+from backend.core.models import User, Call, Evaluation, EvaluationCriteria, PerformanceRollup, UploadSession
+from . import audio, export, ingest
+from backend.api import db_router, metrics
+from .mixins import ConditionalGetMixin, QueryBudgetMixin, ReplicaReadMixin, SparseFieldsetMixin
+from .pagination import KeysetOrPageNumberPagination
+from .serializers import (
+    UserSerializer, CallSerializer, EvaluationSerializer, EvaluationCriteriaSerializer,
+    CallValuesSerializer, EvaluationValuesSerializer, RecentCallSerializer, UploadSessionSerializer, PerformanceReportQuerySerializer,
+    PerformanceRollupSerializer, ExportQuerySerializer, CallClaimSerializer,
+)
+
+# Liste ve detay aksiyonları için sabit sorgu bütçesi:
+# kimlik doğrulama + sayfalama COUNT + sayfa sorgusu
+# Dışa aktarımda satırlar yanıt akışı sırasında okunur ve bütçeye dahil edilmez
+DEFAULT_QUERY_BUDGET = {'list': 3, 'retrieve': 2, 'audio': 2, 'waveform': 2, 'export': 2}
+
+# Üstlenme: seçim + güncelleme + iki durum sayacı (+ savepoint'ler)
+CALL_CLAIM_QUERY_BUDGET = {'claim': 8, 'release': 8}
+
+class UserViewSet(QueryBudgetMixin, ReplicaReadMixin, ConditionalGetMixin, SparseFieldsetMixin,
+                  viewsets.ModelViewSet):
     """
     Kullanıcı API endpointi
     """
     queryset = User.objects.all().order_by('-date_joined')
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = DEFAULT_QUERY_BUDGET
+    replica_actions = ('list',)
     
     def get_queryset(self):
         """
@@ -25,33 +54,183 @@ class UserViewSet(viewsets.ModelViewSet):
         # Agent sadece kendini görebilir
         return User.objects.filter(id=user.id)
 
-class CallViewSet(viewsets.ModelViewSet):
+def get_call_queryset_for(user):
+    """
+    Kullanıcının görebileceği çağrıları döndür (Admin/Expert: tümü, Agent: kendi çağrıları)
+    """
+    queryset = Call.objects.select_related('agent')
+    if user.is_superuser or user.role in ['admin', 'expert']:
+        return queryset.order_by('-call_date', '-id')
+    # Agent sadece kendi çağrılarını görebilir
+    return queryset.filter(agent_id=user.id).order_by('-call_date', '-id')
+
+def get_evaluation_queryset_for(user):
+    """
+    Kullanıcının görebileceği değerlendirmeleri döndür:
+    - Admin: Tüm değerlendirmeler
+    - Expert: Kendi yaptığı değerlendirmeler
+    - Agent: Kendi çağrılarının değerlendirmeleri
+    """
+    queryset = Evaluation.objects.select_related('evaluator', 'call__agent')
+    if user.is_superuser or user.role == 'admin':
+        return queryset.order_by('-created_at', '-id')
+    elif user.role == 'expert':
+        return queryset.filter(evaluator_id=user.id).order_by('-created_at', '-id')
+    # Agent sadece kendi çağrılarının değerlendirmelerini görebilir
+    return queryset.filter(call__agent_id=user.id).order_by('-created_at', '-id')
+
+def export_params(request):
+    params = ExportQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    return params.validated_data
+
+class CallViewSet(QueryBudgetMixin, ReplicaReadMixin, ConditionalGetMixin, SparseFieldsetMixin,
+                  viewsets.ModelViewSet):
     """
     Çağrı kayıtları API endpointi
     """
-    queryset = Call.objects.all().order_by('-call_date')
+    queryset = Call.objects.select_related('agent').order_by('-call_date', '-id')
     serializer_class = CallSerializer
+    values_serializer_class = CallValuesSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetOrPageNumberPagination
+    keyset_ordering = ('call_date', 'id')
+    query_budget = {**DEFAULT_QUERY_BUDGET, **CALL_CLAIM_QUERY_BUDGET}
+    # agent_name temsilci kaydından gelir
+    conditional_fields = ('updated_at', 'agent__updated_at')
+    replica_actions = ('list', 'export')
     
     def get_queryset(self):
         """
         Kullanıcı rolüne göre farklı queryset döndür:
         - Admin/Expert: Tüm çağrılar
         - Agent: Sadece kendi çağrıları
+        ?phone= (numara, biçimden bağımsız) ve ?phone_prefix= (numara öneki)
+        E.164'e normalize edilip indeksli phone_e164 alanında aranır.
         """
-        user = self.request.user
-        if user.is_superuser or user.role in ['admin', 'expert']:
-            return Call.objects.all().order_by('-call_date')
-        # Agent sadece kendi çağrılarını görebilir
-        return Call.objects.filter(agent=user).order_by('-call_date')
+        params = self.request.query_params
+        return phone.filter_calls(
+            get_call_queryset_for(self.request.user), params.get('phone') or None, params.get('phone_prefix') or None,
+        )
+
+    def get_permissions(self):
+        """
+        Toplu aktarım sadece admin kullanıcılara açıktır
+        """
+        if self.action == 'bulk':
+            self.permission_classes = [permissions.IsAdminUser]
+        return super().get_permissions()
+
+    @action(detail=False, methods=['post'])
+    def claim(self, request):
+        """
+        Sıradaki uygun bekleyen çağrıyı (queue, agent, team, sample_percent
+        filtreleriyle) kullanıcı adına üstlen. Uygun çağrı yoksa 204 döner.
+        """
+        user = request.user
+        if not (user.is_superuser or user.role in ['admin', 'expert']):
+            raise PermissionDenied('Sadece kalite uzmanları çağrı üstlenebilir.')
+        filters = CallClaimSerializer(data=request.data)
+        filters.is_valid(raise_exception=True)
+        params = filters.validated_data
+        call = claims.claim_next_call(
+            user.id,
+            queue=params.get('queue'),
+            agent_id=params.get('agent'),
+            team=params.get('team'),
+            sample_percent=params.get('sample_percent'),
+        )
+        if call is None:
+            return Response(status=204)
+        return Response(self.get_serializer(call).data)
+
+    @action(detail=True, methods=['post'])
+    def release(self, request, pk=None):
+        """
+        Üstlenilen çağrıyı kuyruğa geri bırak (admin başkasının üstlenmesini de bırakabilir)
+        """
+        call = self.get_object()
+        user = request.user
+        owner_id = None if user.is_superuser or user.role == 'admin' else user.id
+        if not claims.release_claim(call, user_id=owner_id):
+            raise ValidationError({'detail': 'Bu çağrı sizin tarafınızdan üstlenilmemiş.'})
+        return Response(status=204)
 
-class EvaluationViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        NDJSON veya CSV gövdesindeki çağrı kayıtlarını toplu olarak ekle.
+        Gövde akış halinde okunur; `batch_size` parametresi grup boyutunu belirler.
+        """
+        content_type = request.content_type.split(';')[0].strip().lower()
+        if content_type in ingest.NDJSON_CONTENT_TYPES:
+            records = ingest.iter_ndjson_records(request.stream)
+        elif content_type in ingest.CSV_CONTENT_TYPES:
+            records = ingest.iter_csv_records(request.stream)
+        else:
+            raise UnsupportedMediaType(content_type)
+
+        try:
+            batch_size = int(request.query_params.get('batch_size', settings.CALL_BULK_INGEST_BATCH_SIZE))
+        except ValueError:
+            batch_size = settings.CALL_BULK_INGEST_BATCH_SIZE
+        batch_size = max(1, min(batch_size, settings.CALL_BULK_INGEST_MAX_BATCH_SIZE))
+
+        importer = ingest.CallBulkIngest(batch_size=batch_size)
+        return Response(importer.run(records))
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Görülebilen çağrıları CSV/XLSX olarak akış halinde indir:
+        ?export_format=csv|xlsx&start=&end= (çağrı tarihi)
+        """
+        params = export_params(request)
+        queryset = get_call_queryset_for(request.user).filter(
+            **export.date_range_filter('call_date', params.get('start'), params.get('end'))
+        ).order_by('call_date', 'id').using(db_router.read_alias())  # satırlar yanıt akışı sırasında okunur
+        return export.export_response(
+            params['export_format'],
+            export.header_row(export.CALL_COLUMNS),
+            export.iter_rows(queryset, export.CALL_COLUMNS),
+            'calls',
+        )
+
+    @action(detail=True, methods=['get'])
+    def audio(self, request, pk=None):
+        """
+        Çağrının ses kaydını Range (206) desteğiyle sun. Yetki kontrolü
+        get_queryset'teki rol kuralları ile yapılır.
+        """
+        return audio.audio_response(request, self.get_object())
+
+    @action(detail=True, methods=['get'])
+    def waveform(self, request, pk=None):
+        """
+        Ses analizinde üretilen ikili dalga formu (peak) dosyasını döndür
+        """
+        call = self.get_object()
+        if not call.waveform.name or not call.waveform.storage.exists(call.waveform.name):
+            raise Http404('Bu çağrı için dalga formu henüz hazır değil.')
+        response = FileResponse(call.waveform.open('rb'), content_type='application/octet-stream')
+        response['Cache-Control'] = 'private, max-age=3600'
+        return response
+
+class EvaluationViewSet(QueryBudgetMixin, ReplicaReadMixin, ConditionalGetMixin, SparseFieldsetMixin,
+                        viewsets.ModelViewSet):
     """
     Değerlendirme API endpointi
     """
-    queryset = Evaluation.objects.all().order_by('-created_at')
+    queryset = Evaluation.objects.select_related('evaluator', 'call__agent').order_by('-created_at', '-id')
     serializer_class = EvaluationSerializer
+    values_serializer_class = EvaluationValuesSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetOrPageNumberPagination
+    keyset_ordering = ('created_at', 'id')
+    query_budget = DEFAULT_QUERY_BUDGET
+    # call_details ve evaluator_name ilişkili kayıtlardan gelir
+    conditional_fields = ('updated_at', 'call__updated_at', 'call__agent__updated_at', 'evaluator__updated_at')
+    replica_actions = ('list', 'export')
     
     def get_queryset(self):
         """
@@ -59,22 +238,71 @@ class EvaluationViewSet(viewsets.ModelViewSet):
         - Admin: Tüm değerlendirmeler
         - Expert: Kendi yaptığı değerlendirmeler
         - Agent: Kendi çağrılarının değerlendirmeleri
+        ?search= verilirse yorum ve gelişim alanlarında tam metin arama yapılır.
         """
-        user = self.request.user
-        if user.is_superuser or user.role == 'admin':
-            return Evaluation.objects.all().order_by('-created_at')
-        elif user.role == 'expert':
-            return Evaluation.objects.filter(evaluator=user).order_by('-created_at')
-        # Agent sadece kendi çağrılarının değerlendirmelerini görebilir
-        return Evaluation.objects.filter(call__agent=user).order_by('-created_at')
+        queryset = get_evaluation_queryset_for(self.request.user)
+        query = self.request.query_params.get('search')
+        if query:
+            queryset = search.filter_evaluations(queryset, query)
+        return queryset
 
-class EvaluationCriteriaViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Görülebilen değerlendirmeleri çağrı detayları ve kriter puanlarıyla CSV/XLSX
+        olarak akış halinde indir: ?export_format=csv|xlsx&start=&end= (değerlendirme tarihi)
+        """
+        params = export_params(request)
+        queryset = get_evaluation_queryset_for(request.user).filter(
+            **export.date_range_filter('created_at', params.get('start'), params.get('end'))
+        ).order_by('created_at', 'id').using(db_router.read_alias())  # satırlar yanıt akışı sırasında okunur
+        criteria = [(criterion['id'], criterion['name']) for criterion in reference_data.get_criteria()]
+        return export.export_response(
+            params['export_format'],
+            export.header_row(export.EVALUATION_COLUMNS, criteria),
+            export.iter_rows(queryset, export.EVALUATION_COLUMNS, criteria),
+            'evaluations',
+        )
+
+class EvaluationCriteriaViewSet(QueryBudgetMixin, ReplicaReadMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     Değerlendirme kriterleri API endpointi
     """
-    queryset = EvaluationCriteria.objects.all()
+    queryset = EvaluationCriteria.objects.order_by('id')
     serializer_class = EvaluationCriteriaSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = DEFAULT_QUERY_BUDGET
+
+    def get_conditional_validators(self, criteria):
+        """
+        Kriterlerin değiştirilme tarihi tutulmaz; ETag sunulan kriter satırlarından
+        üretilir. Sürüm damgası süreç içi önbellekte (LocMemCache) süreçler arasında
+        farklı olabileceğinden ETag'e girmez; yanıt gövdesiyle her zaman eşleşir.
+        """
+        return self.make_etag(tuple(tuple(criterion.items()) for criterion in criteria)), None
+
+    def list(self, request, *args, **kwargs):
+        """
+        Kriterler süreç içi önbellekten sunulur (sürüm damgası değişmedikçe sorgu çalışmaz)
+        """
+        criteria = reference_data.get_criteria()
+
+        def render():
+            page = self.paginate_queryset(criteria)
+            if page is not None:
+                return self.get_paginated_response(page)
+            return Response(criteria)
+        return self.respond_conditionally(request, self.get_conditional_validators(criteria), render)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            criterion = reference_data.get_criterion(int(kwargs[self.lookup_field]))
+        except ValueError:
+            criterion = None
+        if criterion is None:
+            raise Http404
+        return self.respond_conditionally(request, self.get_conditional_validators([criterion]),
+                                          lambda: Response(criterion))
     
     def get_permissions(self):
         """
@@ -82,4 +310,142 @@ class EvaluationCriteriaViewSet(viewsets.ModelViewSet):
         """
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             self.permission_classes = [permissions.IsAdminUser]
-        return super().get_permissions() 
\ No newline at end of file
+        return super().get_permissions() 
+
+class DashboardViewSet(QueryBudgetMixin, ReplicaReadMixin, viewsets.ViewSet):
+    """
+    Dashboard API endpointi
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'stats': 3}
+    replica_actions = ('stats',)
+    recent_calls_limit = 5
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Dashboard istatistiklerini döndür. Admin/Expert için sayılar sinyallerle
+        güncellenen merkez geneli sayaçlardan okunur; Agent sadece kendi
+        çağrılarını gördüğü için sayılar onun çağrılarından hesaplanır.
+        """
+        if request.user.is_superuser or request.user.role in ['admin', 'expert']:
+            counters = stats.read_counters()
+        else:
+            counters = stats.read_agent_counters(request.user.id)
+        evaluations = counters[stats.EVALUATIONS_TOTAL]
+        average = counters[stats.EVALUATION_SCORE_SUM] / evaluations if evaluations else Decimal('0')
+        recent_calls = get_call_queryset_for(request.user).select_related('evaluation')[:self.recent_calls_limit]
+        with metrics.timed('serializer'):
+            recent_calls = RecentCallSerializer(recent_calls, many=True).data
+
+        return Response({
+            'totalCalls': int(counters[stats.CALLS_TOTAL]),
+            'pendingEvaluations': int(
+                counters[stats.call_status_counter(Call.CallStatus.PENDING)]
+                + counters[stats.call_status_counter(Call.CallStatus.IN_PROGRESS)]
+            ),
+            'completedEvaluations': int(evaluations),
+            'averageScore': float(round(average, 2)),
+            'recentCalls': recent_calls,
+        })
+
+class ReportViewSet(QueryBudgetMixin, ReplicaReadMixin, viewsets.ViewSet):
+    """
+    Raporlama API endpointi. Sadece önceden hesaplanmış performans
+    özetlerini (PerformanceRollup) okur; ham tablolarda aggregate çalıştırmaz.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'performance': 2}
+    replica_actions = ('performance',)
+    # start verilmediğinde geriye dönük gösterilecek süre
+    default_ranges = {
+        PerformanceRollup.Grain.DAY: timedelta(days=30),
+        PerformanceRollup.Grain.WEEK: timedelta(weeks=26),
+    }
+
+    @action(detail=False, methods=['get'])
+    def performance(self, request):
+        """
+        Dönemsel performans özetleri: ?grain=day|week&dimension=agent|team|queue&key=&start=&end=
+        Agent kullanıcılar sadece kendi temsilci özetlerini görür.
+        """
+        params = PerformanceReportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        grain = params.validated_data['grain']
+        dimension = params.validated_data['dimension']
+        key = params.validated_data.get('key')
+
+        user = request.user
+        if not (user.is_superuser or user.role in ['admin', 'expert']):
+            dimension = PerformanceRollup.Dimension.AGENT
+            key = str(user.id)
+
+        end = params.validated_data.get('end') or timezone.localdate()
+        start = params.validated_data.get('start') or end - self.default_ranges[grain]
+        # Başlangıcı içeren haftanın özeti de dahil edilsin
+        start = rollups.period_start(start, grain)
+
+        queryset = PerformanceRollup.objects.filter(
+            grain=grain, dimension=dimension, period_start__gte=start, period_start__lte=end,
+        )
+        if key is not None:
+            queryset = queryset.filter(key=key)
+        queryset = queryset.order_by('period_start', 'key')
+        with metrics.timed('serializer'):
+            return Response(PerformanceRollupSerializer(queryset, many=True).data)
+
+class UploadSessionViewSet(ReplicaReadMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                          viewsets.GenericViewSet):
+    """
+    Parça parça ses kaydı yükleme API endpointi:
+    - POST /uploads/: oturum aç (call, total_size, checksum, chunk_size)
+    - PUT /uploads/{id}/chunks/{index}/: ham parça gövdesi (application/octet-stream)
+    - GET /uploads/{id}/: eksik parçalar (yarıda kalan yüklemeyi sürdürmek için)
+    - POST /uploads/{id}/complete/: özeti doğrula ve dosyayı çağrıya bağla
+    """
+    queryset = UploadSession.objects.all()
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Admin tüm oturumları, diğer kullanıcılar sadece kendi açtıklarını görebilir
+        """
+        user = self.request.user
+        if user.is_superuser or user.role == 'admin':
+            return UploadSession.objects.all()
+        return UploadSession.objects.filter(created_by_id=user.id)
+
+    def perform_create(self, serializer):
+        """
+        Kullanıcı sadece görebildiği çağrılara kayıt yükleyebilir
+        """
+        call = serializer.validated_data['call']
+        if not get_call_queryset_for(self.request.user).filter(pk=call.pk).exists():
+            raise PermissionDenied('Bu çağrıya kayıt yükleme yetkiniz yok.')
+        serializer.save()
+
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>\d+)')
+    def chunk(self, request, pk=None, index=None):
+        """
+        Parçayı istek gövdesinden akış halinde okuyup dosyaya yaz
+        """
+        session = self.get_object()
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+        try:
+            session = uploads.write_chunk(session, int(index), request.stream, length)
+        except uploads.UploadError as exc:
+            raise ValidationError({'detail': str(exc)})
+        return Response(self.get_serializer(session).data)
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        """
+        Yüklemeyi tamamla
+        """
+        session = self.get_object()
+        try:
+            session = uploads.complete_session(session)
+        except uploads.UploadError as exc:
+            raise ValidationError({'detail': str(exc)})
+        return Response(self.get_serializer(session).data)
\ No newline at end of file
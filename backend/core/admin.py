@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import User, Call, Evaluation, EvaluationCriteria
+from .scoring import compute_total_score, criteria_weights
+from .search import filter_evaluations
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -44,6 +46,20 @@ class EvaluationAdmin(admin.ModelAdmin):
     """
     list_display = ('call', 'evaluator', 'total_score', 'created_at')
     list_filter = ('created_at', 'total_score')
-    search_fields = ('call__agent__username', 'evaluator__username', 'comments')
-    readonly_fields = ('created_at', 'updated_at')
-    date_hierarchy = 'created_at' 
\ No newline at end of file
+    # Yorumlar search_fields yerine tam metin indeksinden aranır (get_search_results)
+    search_fields = ('call__agent__username', 'evaluator__username')
+    readonly_fields = ('total_score', 'created_at', 'updated_at')
+    date_hierarchy = 'created_at'
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            results = results | filter_evaluations(queryset, search_term)
+        return results, may_have_duplicates
+    
+    def save_model(self, request, obj, form, change):
+        """
+        Toplam puanı puanlardan ve güncel kriter ağırlıklarından hesapla
+        """
+        obj.total_score = compute_total_score(obj.scores, criteria_weights())
+        super().save_model(request, obj, form, change) 
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+Yüklenen ses kayıtları için arka plan analiz hattı.
+
+Kayıt yüklendiğinde (işlem commit edildikten sonra) dosya süreç havuzuna
+gönderilir; işçi süreç dalga formu dosyasını yazar ve gerçek süreyi döndürür,
+sonuç ana süreçte çağrıya kaydedilir. İşçi giriş noktası (`waveform.run_job`)
+Django'ya bağımlı olmayan modülde durur; spawn ile başlayan süreç onu
+Django ayarları yüklenmeden içe aktarabilir. `analyze_call_audio` komutu aynı
+işçi fonksiyonunu tüm çekirdeklere dağıtarak mevcut kayıtları işler.
+"""
+import logging
+import multiprocessing
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.utils import timezone
+
+from backend.core import waveform
+from backend.core.models import Call
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def is_enabled():
+    """Analiz açık ve ffmpeg kurulu mu"""
+    return settings.AUDIO_ANALYSIS_ENABLED and shutil.which(settings.FFMPEG_BINARY) is not None
+
+
+def create_executor(max_workers=None):
+    """
+    İşçi süreç havuzu oluştur. 'spawn' ile temiz süreçler başlatılır (ana
+    süreçteki DB bağlantıları ve thread'ler kopyalanmaz); bu yüzden havuza
+    gönderilen iş Django'dan bağımsız `waveform.run_job` olmalıdır.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               mp_context=multiprocessing.get_context('spawn'))
+
+
+def get_executor():
+    """Web süreçleri için paylaşılan, tembel oluşturulan havuz"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = create_executor(settings.AUDIO_ANALYSIS_WORKERS)
+        return _executor
+
+
+def analysis_job(call_id, audio_name):
+    """İşçi sürece gönderilecek (çağrı id, dosya yolu, dalga formu yolu, ayarlar) paketi"""
+    return (
+        call_id,
+        default_storage.path(audio_name),
+        default_storage.path(waveform.sidecar_name(audio_name)),
+        settings.AUDIO_ANALYSIS_SAMPLE_RATE,
+        settings.AUDIO_ANALYSIS_PEAKS_PER_SECOND,
+        settings.FFMPEG_BINARY,
+    )
+
+
+def result_fields(audio_name, duration):
+    """Analiz sonucundan çağrıya yazılacak alanlar"""
+    now = timezone.now()
+    return {
+        'duration': timedelta(seconds=round(duration, 3)),
+        'waveform': waveform.sidecar_name(audio_name),
+        'audio_analyzed_at': now,
+        'updated_at': now,
+    }
+
+
+def _store_result(audio_name, future):
+    """Havuzdan dönen sonucu çağrıya kaydet (havuzun callback thread'inde çalışır)"""
+    try:
+        call_id, duration, error = future.result()
+        if error:
+            logger.warning('Ses kaydı analiz edilemedi (çağrı %s): %s', call_id, error)
+            return
+        # Kayıt bu arada değiştirildiyse eski sonucu yazma
+        Call.objects.filter(pk=call_id, mp3_file=audio_name).update(**result_fields(audio_name, duration))
+    except Exception:
+        logger.exception('Ses kaydı analiz sonucu kaydedilemedi')
+    finally:
+        connections.close_all()
+
+
+def schedule_analysis(call):
+    """
+    Çağrının ses kaydını işlem commit edildikten sonra analiz kuyruğuna ekle
+    """
+    if not call.mp3_file.name or not is_enabled():
+        return
+    audio_name = call.mp3_file.name
+    job = analysis_job(call.pk, audio_name)
+
+    def submit():
+        future = get_executor().submit(waveform.run_job, job)
+        future.add_done_callback(partial(_store_result, audio_name))
+
+    transaction.on_commit(submit)
@@ -0,0 +1,116 @@
+"""
+Uzmanlar için "sıradaki çağrıyı üstlen" iş kuyruğu.
+
+Uygun en eski çağrı `SELECT ... FOR UPDATE SKIP LOCKED` ile kilitlenip
+aynı işlem içinde `in_progress` durumuna alınır. Kilitli satırlar atlandığı
+için eşzamanlı uzmanlar birbirini beklemeden farklı çağrılar alır.
+CALL_CLAIM_TIMEOUT süresince değerlendirilmeyen üstlenmeler terk edilmiş
+sayılır: bu çağrılar tekrar üstlenilebilir ve `release_stale_claims` ile
+`pending` durumuna döndürülür.
+
+`update()` sinyal göndermediği için durum sayaçları burada güncellenir. Sayaç
+güncellemesi işlem commit edildikten sonra yapılır: paylaşılan StatCounter
+satırları üstlenme işleminde kilitlenseydi eşzamanlı uzmanlar o satırlarda
+sıraya girerdi.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Mod
+from django.utils import timezone
+
+from backend.core import stats
+from backend.core.models import Call
+
+# SQLite'ta satır kilidi yok; koşullu güncelleme başka bir işlemle yarışı kaybederse tekrar dene
+MAX_CLAIM_ATTEMPTS = 5
+
+
+def move_status_counters(old_status, new_status, count=1):
+    """Durum sayaçlarını mevcut işlem commit edildikten sonra güncelle (geri alınırsa güncellenmez)"""
+    def update():
+        stats.increment(stats.call_status_counter(old_status), -count)
+        stats.increment(stats.call_status_counter(new_status), count)
+    transaction.on_commit(update)
+
+
+def claimable_calls(queue=None, agent_id=None, team=None, sample_percent=None, now=None):
+    """
+    Üstlenilebilecek çağrılar: bekleyenler ve süresi dolmuş üstlenmeler
+    (değerlendirmesi olmayanlar), en eski çağrı önce
+    """
+    now = now or timezone.now()
+    stale = Q(status=Call.CallStatus.IN_PROGRESS, claimed_at__lt=now - settings.CALL_CLAIM_TIMEOUT)
+    queryset = Call.objects.filter(Q(status=Call.CallStatus.PENDING) | stale, evaluation__isnull=True)
+    if queue:
+        queryset = queryset.filter(queue=queue)
+    if agent_id:
+        queryset = queryset.filter(agent_id=agent_id)
+    if team:
+        queryset = queryset.filter(agent__team=team)
+    if sample_percent and sample_percent < 100:
+        # id'ye göre belirlenimci örneklem: aynı kural her seferinde aynı çağrıları seçer
+        queryset = queryset.annotate(sample_bucket=Mod('id', 100)).filter(sample_bucket__lt=sample_percent)
+    return queryset.order_by('call_date', 'id')
+
+
+def claim_next_call(user_id, **filters):
+    """
+    Sıradaki uygun çağrıyı kullanıcı adına üstlen; uygun çağrı yoksa None
+    """
+    for _ in range(MAX_CLAIM_ATTEMPTS):
+        now = timezone.now()
+        with transaction.atomic():
+            call = (
+                claimable_calls(now=now, **filters)
+                .select_related('agent')
+                .select_for_update(skip_locked=True, of=('self',))
+                .first()
+            )
+            if call is None:
+                return None
+            # Seçimden sonra değerlendirmesi kaydedilen çağrı da üstlenilmemeli
+            updated = Call.objects.filter(
+                pk=call.pk, status=call.status, claimed_at=call.claimed_at, evaluation__isnull=True,
+            ).update(
+                status=Call.CallStatus.IN_PROGRESS, claimed_by_id=user_id, claimed_at=now, updated_at=now,
+            )
+            if not updated:
+                continue
+            if call.status != Call.CallStatus.IN_PROGRESS:
+                move_status_counters(call.status, Call.CallStatus.IN_PROGRESS)
+        call.status = Call.CallStatus.IN_PROGRESS
+        call.claimed_by_id = user_id
+        call.claimed_at = call.updated_at = now
+        return call
+    return None
+
+
+@transaction.atomic
+def release_claim(call, user_id=None):
+    """
+    Üstlenilmiş çağrıyı kuyruğa geri bırak. `user_id` verilirse sadece o
+    kullanıcının üstlenmesi bırakılır. Bırakıldıysa True döner.
+    """
+    queryset = Call.objects.filter(pk=call.pk, status=Call.CallStatus.IN_PROGRESS, claimed_by__isnull=False)
+    if user_id is not None:
+        queryset = queryset.filter(claimed_by_id=user_id)
+    now = timezone.now()
+    if not queryset.update(status=Call.CallStatus.PENDING, claimed_by=None, claimed_at=None, updated_at=now):
+        return False
+    move_status_counters(Call.CallStatus.IN_PROGRESS, Call.CallStatus.PENDING)
+    return True
+
+
+@transaction.atomic
+def release_stale_claims():
+    """Süresi dolmuş ve değerlendirilmemiş üstlenmeleri bekleyen duruma döndür; sayıyı döndürür"""
+    now = timezone.now()
+    released = Call.objects.filter(
+        status=Call.CallStatus.IN_PROGRESS,
+        claimed_at__lt=now - settings.CALL_CLAIM_TIMEOUT,
+        evaluation__isnull=True,
+    ).update(status=Call.CallStatus.PENDING, claimed_by=None, claimed_at=None, updated_at=now)
+    if released:
+        move_status_counters(Call.CallStatus.IN_PROGRESS, Call.CallStatus.PENDING, released)
+    return released
@@ -0,0 +1,96 @@
+"""
+Kriter bazında normalize edilmiş puan tablosu (EvaluationScore).
+
+Evaluation.scores JSON alanı her yazmada (evaluation_id, criterion_id, score)
+satırlarına yansıtılır. Böylece kriter ortalamaları, puan dağılımları ve
+trendler JSON ayrıştırmadan tek bir SQL aggregate ile hesaplanır.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Avg, Count, IntegerField
+from django.db.models.functions import Cast, Floor, TruncMonth, TruncWeek
+
+from backend.core import reference_data
+from backend.core.models import Evaluation, EvaluationScore
+
+
+def score_rows(evaluation_id, scores, criterion_ids):
+    """Puan sözlüğünden EvaluationScore nesneleri üret; bilinmeyen kriterler atlanır"""
+    rows = []
+    for criterion_id, score in (scores or {}).items():
+        if str(criterion_id).isdigit() and int(criterion_id) in criterion_ids:
+            rows.append(EvaluationScore(evaluation_id=evaluation_id, criterion_id=int(criterion_id),
+                                        score=Decimal(str(score))))
+    return rows
+
+
+@transaction.atomic
+def sync_evaluation_scores(evaluation):
+    """Tek bir değerlendirmenin kriter puanlarını scores alanıyla eşitle"""
+    criterion_ids = {criterion['id'] for criterion in reference_data.get_criteria()}
+    EvaluationScore.objects.filter(evaluation_id=evaluation.pk).delete()
+    EvaluationScore.objects.bulk_create(score_rows(evaluation.pk, evaluation.scores, criterion_ids))
+
+
+def backfill(batch_size=5000):
+    """
+    Tüm değerlendirmeler için kriter puanı tablosunu id sırasıyla gruplar halinde yeniden oluştur.
+    İşlenen değerlendirme sayısını döndürür.
+    """
+    criterion_ids = {criterion['id'] for criterion in reference_data.get_criteria()}
+    processed = 0
+    last_id = 0
+    while True:
+        batch = list(Evaluation.objects.filter(id__gt=last_id).order_by('id')
+                     .values_list('id', 'scores')[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1][0]
+        rows = []
+        for evaluation_id, scores in batch:
+            rows.extend(score_rows(evaluation_id, scores, criterion_ids))
+        with transaction.atomic():
+            EvaluationScore.objects.filter(evaluation_id__gte=batch[0][0], evaluation_id__lte=last_id).delete()
+            EvaluationScore.objects.bulk_create(rows, batch_size=1000)
+        processed += len(batch)
+    return processed
+
+
+def criterion_averages(queryset=None):
+    """
+    Kriter bazında ortalama puan ve değerlendirme sayısı. `queryset` ile satırlar
+    daraltılabilir, örn. takım ve tarih:
+    EvaluationScore.objects.filter(evaluation__call__agent__team='A', evaluation__created_at__gte=...)
+    """
+    queryset = EvaluationScore.objects.all() if queryset is None else queryset
+    return list(
+        queryset.values('criterion_id', 'criterion__name')
+        .annotate(average=Avg('score'), count=Count('id'))
+        .order_by('criterion_id')
+    )
+
+
+def criterion_distribution(criterion_id, bucket_size=10, queryset=None):
+    """Bir kriterin puan dağılımı: [{'bucket': 80, 'count': 12}, ...]"""
+    queryset = EvaluationScore.objects.all() if queryset is None else queryset
+    return list(
+        queryset.filter(criterion_id=criterion_id)
+        .annotate(bucket=Cast(Floor(Cast('score', IntegerField()) / bucket_size) * bucket_size, IntegerField()))
+        .values('bucket')
+        .annotate(count=Count('id'))
+        .order_by('bucket')
+    )
+
+
+def criterion_trend(criterion_id, grain='month', queryset=None):
+    """Bir kriterin dönemsel ortalaması (değerlendirme tarihine göre hafta veya ay)"""
+    queryset = EvaluationScore.objects.all() if queryset is None else queryset
+    trunc = TruncWeek if grain == 'week' else TruncMonth
+    return list(
+        queryset.filter(criterion_id=criterion_id)
+        .annotate(period=trunc('evaluation__created_at'))
+        .values('period')
+        .annotate(average=Avg('score'), count=Count('id'))
+        .order_by('period')
+    )
@@ -0,0 +1,54 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.core import audio_analysis, waveform
+from backend.core.models import Call
+
+
+class Command(BaseCommand):
+    help = 'Mevcut çağrı kayıtları için dalga formu ve gerçek süreyi tüm çekirdekleri kullanarak hesaplar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='İşçi süreç sayısı (varsayılan: çekirdek sayısı)')
+        parser.add_argument('--all', action='store_true',
+                            help='Daha önce analiz edilmiş kayıtları da yeniden işle')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Havuza tek seferde gönderilen ve toplu güncellenen kayıt sayısı')
+
+    def handle(self, *args, **options):
+        if not audio_analysis.is_enabled():
+            raise CommandError('Ses analizi kapalı ya da ffmpeg bulunamadı (AUDIO_ANALYSIS_ENABLED, FFMPEG_BINARY).')
+
+        queryset = Call.objects.exclude(mp3_file='')
+        if not options['all']:
+            queryset = queryset.filter(audio_analyzed_at__isnull=True)
+
+        analyzed = failed = 0
+        last_id = 0
+        executor = audio_analysis.create_executor(options['workers'])
+        with executor:
+            while True:
+                # Güncellenen satırlar filtreden çıktığı için id üzerinden ilerle
+                batch = list(queryset.filter(id__gt=last_id).order_by('id')
+                             .values_list('id', 'mp3_file')[:options['batch_size']])
+                if not batch:
+                    break
+                last_id = batch[-1][0]
+                names = dict(batch)
+                jobs = [audio_analysis.analysis_job(call_id, name) for call_id, name in batch]
+                chunksize = max(1, len(jobs) // (options['workers'] * 4))
+
+                updates = []
+                for call_id, duration, error in executor.map(waveform.run_job, jobs, chunksize=chunksize):
+                    if error:
+                        failed += 1
+                        self.stderr.write(f'Çağrı {call_id}: {error}')
+                        continue
+                    updates.append(Call(id=call_id, **audio_analysis.result_fields(names[call_id], duration)))
+                Call.objects.bulk_update(updates, ['duration', 'waveform', 'audio_analyzed_at', 'updated_at'])
+                analyzed += len(updates)
+                self.stdout.write(f'{analyzed} kayıt analiz edildi, {failed} hata')
+
+        self.stdout.write(self.style.SUCCESS(f'Tamamlandı: {analyzed} kayıt analiz edildi, {failed} hata'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.criterion_scores import backfill
+
+
+class Command(BaseCommand):
+    help = 'Mevcut değerlendirmeler için kriter bazında puan tablosunu (EvaluationScore) doldurur'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Tek seferde işlenen değerlendirme sayısı')
+
+    def handle(self, *args, **options):
+        processed = backfill(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{processed} değerlendirmenin kriter puanları oluşturuldu'))
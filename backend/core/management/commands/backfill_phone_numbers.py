@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from backend.core import phone
+
+
+class Command(BaseCommand):
+    help = 'Mevcut çağrıların telefon numaralarını E.164 biçimine normalize ederek phone_e164 alanını doldurur'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Tek seferde işlenen çağrı sayısı')
+
+    def handle(self, *args, **options):
+        processed = phone.backfill(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{processed} çağrının telefon numarası normalize edildi'))
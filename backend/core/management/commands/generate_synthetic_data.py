@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.core import synthetic
+
+
+class Command(BaseCommand):
+    help = ('Performans ölçümleri için tohumdan belirlenimci, üretim biçiminde sentetik veri '
+            '(temsilciler, çağrılar, değerlendirmeler) üretir. Veri mevcut kayıtların üzerine eklenir.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--calls', type=int, default=1_000_000, help='Üretilecek çağrı sayısı')
+        parser.add_argument('--agents', type=int, default=2000, help='Temsilci sayısı')
+        parser.add_argument('--teams', type=int, default=100, help='Temsilcilerin dağıtılacağı takım sayısı')
+        parser.add_argument('--experts', type=int, default=100, help='Kalite uzmanı sayısı')
+        parser.add_argument('--admins', type=int, default=5, help='Admin sayısı')
+        parser.add_argument('--days', type=int, default=730, help='Çağrıların yayılacağı gün sayısı (bugüne kadar)')
+        parser.add_argument('--evaluated-ratio', type=float, default=0.3, help='Değerlendirilmiş çağrı oranı')
+        parser.add_argument('--customers', type=int,
+                            help='Farklı müşteri (telefon numarası) sayısı; varsayılan çağrı sayısının beşte biri')
+        parser.add_argument('--seed', type=int, default=1, help='Rastgelelik tohumu')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Paralel işçi süreç sayısı (SQLite\'ta her zaman 1)')
+        parser.add_argument('--chunk-size', type=int, default=50_000,
+                            help='Bir işçinin tek işlemde eklediği çağrı sayısı')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Tek INSERT ifadesindeki en fazla satır sayısı')
+        parser.add_argument('--username-prefix', default='synthetic', help='Üretilen kullanıcı adlarının öneki')
+        parser.add_argument('--password', default='synthetic', help='Üretilen kullanıcıların şifresi')
+        parser.add_argument('--mp3-file', default='',
+                            help='Tüm çağrılara atanacak ses dosyası (MEDIA_ROOT\'a göre); varsayılan çağrı başına sahte yol')
+        parser.add_argument('--skip-derived', action='store_true',
+                            help='Dashboard sayaçlarını ve performans özetlerini yeniden hesaplama')
+
+    def handle(self, *args, **options):
+        if options['calls'] < 0 or options['chunk_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--calls, --chunk-size ve --workers pozitif olmalıdır')
+        if not 0 <= options['evaluated_ratio'] <= 1:
+            raise CommandError('--evaluated-ratio 0 ile 1 arasında olmalıdır')
+        started = time.monotonic()
+
+        def progress(done, total):
+            elapsed = time.monotonic() - started
+            self.stdout.write(f'{done}/{total} çağrı ({done / elapsed:,.0f} çağrı/sn)')
+
+        try:
+            summary = synthetic.generate(
+                calls=options['calls'], agents=options['agents'], teams=options['teams'],
+                experts=options['experts'], admins=options['admins'], seed=options['seed'], days=options['days'],
+                evaluated_ratio=options['evaluated_ratio'], customers=options['customers'],
+                workers=options['workers'], chunk_size=options['chunk_size'], batch_size=options['batch_size'],
+                prefix=options['username_prefix'], password=options['password'], mp3_file=options['mp3_file'],
+                refresh_derived=not options['skip_derived'], progress=progress,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            '{calls} çağrı ve {evaluations} değerlendirme üretildi ({agents} temsilci, {experts} uzman, {admins} admin); '
+            '{seconds:.1f} sn'.format(seconds=time.monotonic() - started, **summary)
+        ))
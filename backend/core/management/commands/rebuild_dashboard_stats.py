@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.stats import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Dashboard istatistik sayaçlarını Call ve Evaluation tablolarından yeniden hesaplar'
+
+    def handle(self, *args, **options):
+        values = rebuild_counters()
+        for name, value in sorted(values.items()):
+            self.stdout.write(f'{name}: {value}')
+        self.stdout.write(self.style.SUCCESS('Dashboard sayaçları yeniden oluşturuldu'))
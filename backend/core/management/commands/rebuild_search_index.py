@@ -0,0 +1,17 @@
+from django.db import connection
+from django.core.management.base import BaseCommand
+
+from backend.core import search
+
+
+class Command(BaseCommand):
+    help = 'Değerlendirme arama metinlerini yeniden hesaplar ve tam metin arama indeksini yeniden kurar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Tek seferde işlenen değerlendirme sayısı')
+
+    def handle(self, *args, **options):
+        processed = search.backfill(batch_size=options['batch_size'])
+        search.install_index(connection)
+        self.stdout.write(self.style.SUCCESS(f'{processed} değerlendirmenin arama metni güncellendi'))
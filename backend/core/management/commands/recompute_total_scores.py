@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.scoring import recompute_total_scores
+
+
+class Command(BaseCommand):
+    help = 'Tüm değerlendirmelerin toplam puanını güncel kriter ağırlıklarıyla yeniden hesaplar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Tek seferde belleğe yüklenen değerlendirme sayısı')
+
+    def handle(self, *args, **options):
+        updated = recompute_total_scores(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{updated} değerlendirmenin toplam puanı güncellendi'))
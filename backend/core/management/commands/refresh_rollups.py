@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = 'Günlük/haftalık performans özetlerini son çalıştırmadan bu yana değişen günler için yeniler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Tüm özetleri ham tablolardan baştan hesapla')
+
+    def handle(self, *args, **options):
+        days = refresh_rollups(full=options['full'])
+        if days is None:
+            self.stdout.write(self.style.SUCCESS('Tüm performans özetleri yeniden hesaplandı'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{days} günün performans özetleri yenilendi'))
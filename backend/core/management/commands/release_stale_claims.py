@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.claims import release_stale_claims
+
+
+class Command(BaseCommand):
+    help = 'Süresi dolmuş ve değerlendirilmemiş çağrı üstlenmelerini bekleyen duruma döndürür'
+
+    def handle(self, *args, **options):
+        released = release_stale_claims()
+        self.stdout.write(self.style.SUCCESS(f'{released} çağrı kuyruğa geri bırakıldı'))
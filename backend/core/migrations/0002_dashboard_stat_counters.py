@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_create_user_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Sayaç Adı')),
+                ('value', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Değer')),
+            ],
+            options={
+                'verbose_name': 'İstatistik Sayacı',
+                'verbose_name_plural': 'İstatistik Sayaçları',
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_role_scoped_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file_name', models.CharField(max_length=255, verbose_name='Dosya Yolu')),
+                ('total_size', models.BigIntegerField(verbose_name='Dosya Boyutu')),
+                ('chunk_size', models.PositiveIntegerField(verbose_name='Parça Boyutu')),
+                ('checksum', models.CharField(max_length=64, verbose_name='SHA-256')),
+                ('received_chunks', models.JSONField(default=list, verbose_name='Alınan Parçalar')),
+                ('status', models.CharField(choices=[('active', 'Yükleniyor'), ('completed', 'Tamamlandı')], default='active', max_length=20, verbose_name='Durum')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('call', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='core.call', verbose_name='Çağrı')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL, verbose_name='Yükleyen')),
+            ],
+            options={
+                'verbose_name': 'Yükleme Oturumu',
+                'verbose_name_plural': 'Yükleme Oturumları',
+            },
+        ),
+    ]
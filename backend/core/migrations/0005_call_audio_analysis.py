@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_upload_sessions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='call',
+            name='audio_analyzed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Ses Analizi Tarihi'),
+        ),
+        migrations.AddField(
+            model_name='call',
+            name='waveform',
+            field=models.FileField(blank=True, upload_to='call_records/%Y/%m/%d/', verbose_name='Dalga Formu'),
+        ),
+    ]
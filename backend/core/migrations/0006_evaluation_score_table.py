@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_call_audio_analysis'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvaluationScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Puan')),
+                ('criterion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='evaluation_scores', to='core.evaluationcriteria', verbose_name='Kriter')),
+                ('evaluation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='criterion_scores', to='core.evaluation', verbose_name='Değerlendirme')),
+            ],
+            options={
+                'verbose_name': 'Kriter Puanı',
+                'verbose_name_plural': 'Kriter Puanları',
+                'indexes': [models.Index(fields=['criterion', 'score'], name='evaluation_score_crit_idx'), models.Index(fields=['criterion', 'evaluation'], name='evaluation_score_crit_eval_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='evaluationscore',
+            constraint=models.UniqueConstraint(fields=('evaluation', 'criterion'), name='evaluation_score_unique'),
+        ),
+    ]
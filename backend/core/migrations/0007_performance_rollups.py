@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_evaluation_score_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupInvalidation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PerformanceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grain', models.CharField(choices=[('day', 'Günlük'), ('week', 'Haftalık')], max_length=4, verbose_name='Dönem')),
+                ('dimension', models.CharField(choices=[('agent', 'Temsilci'), ('team', 'Takım'), ('queue', 'Kuyruk')], max_length=5, verbose_name='Kırılım')),
+                ('key', models.CharField(max_length=50, verbose_name='Anahtar')),
+                ('period_start', models.DateField(verbose_name='Dönem Başlangıcı')),
+                ('call_count', models.PositiveIntegerField(default=0, verbose_name='Çağrı Sayısı')),
+                ('duration_seconds', models.BigIntegerField(default=0, verbose_name='Toplam Süre (sn)')),
+                ('evaluation_count', models.PositiveIntegerField(default=0, verbose_name='Değerlendirme Sayısı')),
+                ('score_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Puan Toplamı')),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Performans Özeti',
+                'verbose_name_plural': 'Performans Özetleri',
+                'indexes': [models.Index(fields=['grain', 'dimension', 'period_start'], name='rollup_period_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='performancerollup',
+            constraint=models.UniqueConstraint(fields=('grain', 'dimension', 'key', 'period_start'), name='performance_rollup_unique'),
+        ),
+    ]
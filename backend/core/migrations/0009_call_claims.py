@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_user_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='call',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Üstlenme Tarihi'),
+        ),
+        migrations.AddField(
+            model_name='call',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_calls', to=settings.AUTH_USER_MODEL, verbose_name='Üstlenen Uzman'),
+        ),
+        migrations.AddIndex(
+            model_name='call',
+            index=models.Index(fields=['status', 'claimed_at'], name='call_status_claimed_idx'),
+        ),
+    ]
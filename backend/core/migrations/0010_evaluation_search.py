@@ -0,0 +1,100 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:51
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Arama metni ve indeks tanımı bu migration'ın yazıldığı haliyle sabitlenmiştir;
+# backend.core.search sonradan değişse de migration aynı sonucu üretir.
+# Güncel kurallarla yeniden hesaplamak için: manage.py rebuild_search_index
+TURKISH_UPPER = str.maketrans({'I': 'ı', 'İ': 'i'})
+LETTER_FOLD = str.maketrans({'ı': 'i', 'ß': 'ss', 'æ': 'ae', 'ø': 'o'})
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+TABLE = 'core_evaluation'
+FTS_TABLE = 'core_evaluation_fts'
+PG_INDEX = 'evaluation_search_gin_idx'
+
+
+def normalize(text):
+    text = (text or '').translate(TURKISH_UPPER).lower()
+    text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    return ' '.join(TOKEN_RE.findall(text.translate(LETTER_FOLD)))
+
+
+def populate_search_text(apps, schema_editor):
+    Evaluation = apps.get_model('core', 'Evaluation')
+    last_id = 0
+    while True:
+        rows = list(
+            Evaluation.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'comments', 'improvement_areas')[:5000]
+        )
+        if not rows:
+            return
+        Evaluation.objects.bulk_update(
+            [Evaluation(id=evaluation_id, search_text=normalize(f'{comments or ""} {improvement_areas or ""}'))
+             for evaluation_id, comments, improvement_areas in rows],
+            ['search_text'], batch_size=1000,
+        )
+        last_id = rows[-1][0]
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"search_text, content='{TABLE}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+                f"INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) "
+                f"VALUES ('delete', old.id, old.search_text); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF search_text ON {TABLE} BEGIN "
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) "
+                f"VALUES ('delete', old.id, old.search_text); "
+                f"INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text); END"
+            )
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON {TABLE} "
+                f"USING gin (to_tsvector('simple', search_text))"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {PG_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_call_claims'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluation',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Arama Metni'),
+        ),
+        migrations.RunPython(populate_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
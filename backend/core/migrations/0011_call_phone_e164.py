@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+from backend.core import phone
+
+
+def populate_phone_e164(apps, schema_editor):
+    phone.backfill(model=apps.get_model('core', 'Call'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_evaluation_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='call',
+            name='phone_e164',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16, verbose_name='Telefon Numarası (E.164)'),
+        ),
+        migrations.RunPython(populate_phone_e164, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='call',
+            index=models.Index(fields=['phone_e164', 'call_date'], name='call_phone_date_idx'),
+        ),
+    ]
@@ -1,5 +1,9 @@
 from backend.core.models.user import User
 from backend.core.models.call import Call
-from backend.core.models.evaluation import Evaluation, EvaluationCriteria
+from backend.core.models.evaluation import Evaluation, EvaluationCriteria, EvaluationScore
+from backend.core.models.rollup import PerformanceRollup, RollupWatermark, RollupInvalidation
+from backend.core.models.stats import StatCounter
+from backend.core.models.upload import UploadSession
 
-__all__ = ['User', 'Call', 'Evaluation', 'EvaluationCriteria']
+__all__ = ['User', 'Call', 'Evaluation', 'EvaluationCriteria', 'EvaluationScore', 'StatCounter', 'UploadSession',
+           'PerformanceRollup', 'RollupWatermark', 'RollupInvalidation']
@@ -18,6 +18,9 @@ class Call(models.Model):
     
     call_date = models.DateTimeField(verbose_name='Çağrı Tarihi')
     phone_number = models.CharField(max_length=20, verbose_name='Telefon Numarası')
+    # phone_number'ın E.164 hali (normalize edilemiyorsa boş); müşteri bazlı aramalar için (core/phone.py)
+    phone_e164 = models.CharField(max_length=16, blank=True, default='', editable=False,
+                                  verbose_name='Telefon Numarası (E.164)')
     duration = models.DurationField(verbose_name='Çağrı Süresi')
     
     mp3_file = models.FileField(
@@ -26,6 +29,14 @@ class Call(models.Model):
         verbose_name='Ses Kaydı'
     )
     
+    # Yükleme sonrası analizde üretilen dalga formu (peak) dosyası
+    waveform = models.FileField(
+        upload_to='call_records/%Y/%m/%d/',
+        blank=True,
+        verbose_name='Dalga Formu'
+    )
+    audio_analyzed_at = models.DateTimeField(null=True, blank=True, verbose_name='Ses Analizi Tarihi')
+    
     queue = models.CharField(max_length=50, verbose_name='Çağrı Kuyruğu')
     status = models.CharField(
         max_length=20,
@@ -34,6 +45,17 @@ class Call(models.Model):
         verbose_name='Durum'
     )
     
+    # Değerlendirme kuyruğu: çağrıyı üstlenen uzman ve üstlenme zamanı
+    claimed_by = models.ForeignKey(
+        'core.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='claimed_calls',
+        verbose_name='Üstlenen Uzman'
+    )
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name='Üstlenme Tarihi')
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -41,6 +63,21 @@ class Call(models.Model):
         verbose_name = 'Çağrı'
         verbose_name_plural = 'Çağrılar'
         ordering = ['-call_date']
+        indexes = [
+            # Admin/Expert listesi ve keyset sayfalama: ORDER BY call_date, id
+            models.Index(fields=['call_date', 'id'], name='call_date_id_idx'),
+            # Agent listesi: WHERE agent_id = ? ORDER BY call_date
+            models.Index(fields=['agent', 'call_date', 'id'], name='call_agent_date_idx'),
+            # Admin list_filter ve kuyruk/durum raporları
+            models.Index(fields=['status', 'call_date'], name='call_status_date_idx'),
+            models.Index(fields=['queue', 'call_date'], name='call_queue_date_idx'),
+            # Terk edilmiş üstlenmeler: WHERE status = 'in_progress' AND claimed_at < ?
+            models.Index(fields=['status', 'claimed_at'], name='call_status_claimed_idx'),
+            # Müşteri araması: WHERE phone_e164 = ? / BETWEEN önek aralığı ORDER BY call_date
+            models.Index(fields=['phone_e164', 'call_date'], name='call_phone_date_idx'),
+            # Artımlı özet yenileme: WHERE updated_at > ?
+            models.Index(fields=['updated_at'], name='call_updated_at_idx'),
+        ]
         
     def __str__(self):
         return f"{self.agent.get_full_name()} - {self.call_date.strftime('%Y-%m-%d %H:%M')}" 
\ No newline at end of file
@@ -43,6 +43,8 @@ class Evaluation(models.Model):
     
     comments = models.TextField(verbose_name='Yorumlar')
     improvement_areas = models.TextField(verbose_name='Gelişim Alanları', blank=True)
+    # comments + improvement_areas'ın normalize hali; tam metin arama indeksi bu alandan beslenir (core/search.py)
+    search_text = models.TextField(blank=True, default='', editable=False, verbose_name='Arama Metni')
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -51,6 +53,47 @@ class Evaluation(models.Model):
         verbose_name = 'Değerlendirme'
         verbose_name_plural = 'Değerlendirmeler'
         ordering = ['-created_at']
+        indexes = [
+            # Admin listesi ve keyset sayfalama: ORDER BY created_at, id
+            models.Index(fields=['created_at', 'id'], name='evaluation_created_id_idx'),
+            # Expert listesi: WHERE evaluator_id = ? ORDER BY created_at
+            models.Index(fields=['evaluator', 'created_at', 'id'], name='evaluation_evaluator_idx'),
+            # Admin list_filter
+            models.Index(fields=['total_score'], name='evaluation_score_idx'),
+            # Artımlı özet yenileme: WHERE updated_at > ?
+            models.Index(fields=['updated_at'], name='evaluation_updated_at_idx'),
+        ]
         
     def __str__(self):
-        return f"{self.call} - {self.total_score}%" 
\ No newline at end of file
+        return f"{self.call} - {self.total_score}%" 
+class EvaluationScore(models.Model):
+    """Evaluation.scores alanının kriter bazında normalize edilmiş kopyası"""
+    evaluation = models.ForeignKey(
+        'core.Evaluation',
+        on_delete=models.CASCADE,
+        related_name='criterion_scores',
+        verbose_name='Değerlendirme'
+    )
+    criterion = models.ForeignKey(
+        'core.EvaluationCriteria',
+        on_delete=models.CASCADE,
+        related_name='evaluation_scores',
+        verbose_name='Kriter'
+    )
+    score = models.DecimalField(max_digits=5, decimal_places=2, verbose_name='Puan')
+    
+    class Meta:
+        verbose_name = 'Kriter Puanı'
+        verbose_name_plural = 'Kriter Puanları'
+        constraints = [
+            models.UniqueConstraint(fields=['evaluation', 'criterion'], name='evaluation_score_unique'),
+        ]
+        indexes = [
+            # Kriter bazında ortalama/dağılım: sadece indeks okunarak hesaplanır
+            models.Index(fields=['criterion', 'score'], name='evaluation_score_crit_idx'),
+            # Kriter bazında trend/takım kırılımı: değerlendirmeye join
+            models.Index(fields=['criterion', 'evaluation'], name='evaluation_score_crit_eval_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.evaluation_id} - {self.criterion_id}: {self.score}"
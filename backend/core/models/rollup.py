@@ -0,0 +1,63 @@
+from django.db import models
+
+class PerformanceRollup(models.Model):
+    """Temsilci, takım ve kuyruk bazında günlük/haftalık performans özeti"""
+    
+    class Grain(models.TextChoices):
+        DAY = 'day', 'Günlük'
+        WEEK = 'week', 'Haftalık'
+    
+    class Dimension(models.TextChoices):
+        AGENT = 'agent', 'Temsilci'
+        TEAM = 'team', 'Takım'
+        QUEUE = 'queue', 'Kuyruk'
+    
+    grain = models.CharField(max_length=4, choices=Grain.choices, verbose_name='Dönem')
+    dimension = models.CharField(max_length=5, choices=Dimension.choices, verbose_name='Kırılım')
+    key = models.CharField(max_length=50, verbose_name='Anahtar')
+    period_start = models.DateField(verbose_name='Dönem Başlangıcı')
+    
+    call_count = models.PositiveIntegerField(default=0, verbose_name='Çağrı Sayısı')
+    duration_seconds = models.BigIntegerField(default=0, verbose_name='Toplam Süre (sn)')
+    evaluation_count = models.PositiveIntegerField(default=0, verbose_name='Değerlendirme Sayısı')
+    score_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Puan Toplamı')
+    
+    refreshed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Performans Özeti'
+        verbose_name_plural = 'Performans Özetleri'
+        constraints = [
+            models.UniqueConstraint(fields=['grain', 'dimension', 'key', 'period_start'],
+                                    name='performance_rollup_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['grain', 'dimension', 'period_start'], name='rollup_period_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.grain}/{self.dimension}/{self.key} - {self.period_start}"
+    
+    @property
+    def average_score(self):
+        return round(self.score_sum / self.evaluation_count, 2) if self.evaluation_count else None
+    
+    @property
+    def average_handle_time(self):
+        """Ortalama çağrı süresi (saniye)"""
+        return round(self.duration_seconds / self.call_count, 1) if self.call_count else None
+
+class RollupWatermark(models.Model):
+    """Artımlı özet yenilemesinin en son işlediği updated_at değeri"""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+class RollupInvalidation(models.Model):
+    """Silinen kayıtlar nedeniyle yeniden hesaplanması gereken günler"""
+    day = models.DateField(unique=True)
+    
+    def __str__(self):
+        return str(self.day)
@@ -0,0 +1,13 @@
+from django.db import models
+
+class StatCounter(models.Model):
+    """Dashboard istatistikleri için artımlı olarak güncellenen sayaçlar"""
+    name = models.CharField(max_length=50, unique=True, verbose_name='Sayaç Adı')
+    value = models.DecimalField(max_digits=20, decimal_places=2, default=0, verbose_name='Değer')
+    
+    class Meta:
+        verbose_name = 'İstatistik Sayacı'
+        verbose_name_plural = 'İstatistik Sayaçları'
+        
+    def __str__(self):
+        return f"{self.name}: {self.value}"
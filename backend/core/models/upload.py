@@ -0,0 +1,64 @@
+import uuid
+
+from django.db import models
+
+class UploadSession(models.Model):
+    """Parça parça (chunked) ses kaydı yükleme oturumu"""
+    
+    class SessionStatus(models.TextChoices):
+        ACTIVE = 'active', 'Yükleniyor'
+        COMPLETED = 'completed', 'Tamamlandı'
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    call = models.ForeignKey(
+        'core.Call',
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+        verbose_name='Çağrı'
+    )
+    created_by = models.ForeignKey(
+        'core.User',
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+        verbose_name='Yükleyen'
+    )
+    
+    file_name = models.CharField(max_length=255, verbose_name='Dosya Yolu')
+    total_size = models.BigIntegerField(verbose_name='Dosya Boyutu')
+    chunk_size = models.PositiveIntegerField(verbose_name='Parça Boyutu')
+    checksum = models.CharField(max_length=64, verbose_name='SHA-256')
+    received_chunks = models.JSONField(default=list, verbose_name='Alınan Parçalar')
+    status = models.CharField(
+        max_length=20,
+        choices=SessionStatus.choices,
+        default=SessionStatus.ACTIVE,
+        verbose_name='Durum'
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Yükleme Oturumu'
+        verbose_name_plural = 'Yükleme Oturumları'
+        
+    def __str__(self):
+        return f"{self.call_id} - {self.file_name}"
+    
+    @property
+    def chunk_count(self):
+        return -(-self.total_size // self.chunk_size)
+    
+    @property
+    def missing_chunks(self):
+        received = set(self.received_chunks)
+        return [index for index in range(self.chunk_count) if index not in received]
+    
+    @property
+    def partial_name(self):
+        """Yükleme sürerken parçaların yazıldığı geçici dosya"""
+        return self.file_name + '.part'
+    
+    def expected_chunk_length(self, index):
+        """Verilen sıradaki parçanın bayt cinsinden beklenen boyutu"""
+        return min(self.chunk_size, self.total_size - index * self.chunk_size)
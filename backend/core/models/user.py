@@ -17,10 +17,18 @@ class User(AbstractUser):
     
     team = models.CharField(max_length=50, blank=True)
     employee_id = models.CharField(max_length=20, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name = 'Kullanıcı'
         verbose_name_plural = 'Kullanıcılar'
+        indexes = [
+            # Admin listesi: ORDER BY date_joined
+            models.Index(fields=['date_joined'], name='user_date_joined_idx'),
+            # Expert listesi: WHERE role IN (...) ORDER BY date_joined
+            models.Index(fields=['role', 'date_joined'], name='user_role_joined_idx'),
+            models.Index(fields=['team'], name='user_team_idx'),
+        ]
         
     def __str__(self):
         return f"{self.get_full_name()} ({self.get_role_display()})" 
\ No newline at end of file
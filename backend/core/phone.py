@@ -0,0 +1,119 @@
+"""
+Telefon numaralarının E.164 biçimine normalize edilmesi.
+
+Call.phone_number serbest biçimlidir ("+90 555 123 4567", "0555 123 45 67",
+"5551234567"). Her yazmada (pre_save sinyali ve toplu aktarım) normalize hali
+indeksli Call.phone_e164 alanına yazılır; aynı müşterinin çağrıları biçimden
+bağımsız olarak eşitlik veya önek (indeks aralık taraması) ile bulunur.
+
+Ülke kodu içermeyen numaralar PHONE_DEFAULT_COUNTRY_CODE ülkesine ait sayılır.
+"""
+import re
+
+from django.conf import settings
+
+from backend.core.models import Call
+
+NON_DIGITS = re.compile(r'\D')
+# E.164: ülke kodu dahil en fazla 15 hane
+MAX_DIGITS = 15
+MIN_DIGITS = 7
+
+
+def _digits(value):
+    """Numaranın haneleri ve uluslararası (+ / 00) biçimde yazılıp yazılmadığı"""
+    value = (value or '').strip()
+    international = value.startswith('+') or value.startswith('00')
+    digits = NON_DIGITS.sub('', value)
+    if value.startswith('00'):
+        digits = digits[2:]
+    return digits, international
+
+
+def normalize(value):
+    """Numarayı E.164 biçimine ('+905551234567') çevir; geçersizse boş dize"""
+    digits, international = _digits(value)
+    country_code = settings.PHONE_DEFAULT_COUNTRY_CODE
+    national_length = settings.PHONE_NATIONAL_NUMBER_LENGTH
+    if not international:
+        if digits.startswith('0') and len(digits) == national_length + 1:
+            digits = country_code + digits[1:]
+        elif len(digits) == national_length:
+            digits = country_code + digits
+        elif not (digits.startswith(country_code) and len(digits) == len(country_code) + national_length):
+            return ''
+    if digits.startswith('0') or not MIN_DIGITS <= len(digits) <= MAX_DIGITS:
+        return ''
+    return f'+{digits}'
+
+
+def normalize_prefix(value):
+    """
+    Arama öneki için normalize değer ('+90555'). Uluslararası yazılmayan
+    önekler ulusal kabul edilir (baştaki 0 atılıp ülke kodu eklenir).
+    """
+    digits, international = _digits(value)
+    if not digits:
+        return ''
+    if not international:
+        digits = settings.PHONE_DEFAULT_COUNTRY_CODE + digits.removeprefix('0')
+    return f'+{digits[:MAX_DIGITS]}'
+
+
+def prefix_range(prefix):
+    """
+    Öneki [alt, üst) aralığına çevir. LIKE yerine aralık kullanılır: LIKE
+    SQLite'ta ve PostgreSQL'in varsayılan collation'ında B-tree indeksini kullanamaz.
+    Önek sadece 9'lardan oluşuyorsa üst sınır None döner.
+    """
+    digits = prefix[1:].rstrip('9')
+    if not digits:
+        return prefix, None
+    upper = digits[:-1] + str(int(digits[-1]) + 1)
+    return prefix, f'+{upper}'
+
+
+def filter_calls(queryset, phone=None, prefix=None):
+    """
+    Çağrıları normalize numaraya (eşitlik) ve/veya numara önekine (aralık)
+    göre filtrele. Normalize edilemeyen değerler hiçbir çağrıyla eşleşmez.
+    """
+    if phone is not None:
+        normalized = normalize(phone)
+        if not normalized:
+            return queryset.none()
+        queryset = queryset.filter(phone_e164=normalized)
+    if prefix is not None:
+        normalized = normalize_prefix(prefix)
+        if not normalized:
+            return queryset.none()
+        lower, upper = prefix_range(normalized)
+        queryset = queryset.filter(phone_e164__gte=lower)
+        if upper is not None:
+            queryset = queryset.filter(phone_e164__lt=upper)
+    return queryset
+
+
+def backfill(batch_size=5000, model=Call):
+    """
+    phone_e164 alanını id sırasıyla gruplar halinde yeniden hesapla (sadece
+    değişenler yazılır). `model` migration'larda tarihsel modeli vermek içindir.
+    İşlenen çağrı sayısını döndürür.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        rows = list(
+            model.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'phone_number', 'phone_e164')[:batch_size]
+        )
+        if not rows:
+            return processed
+        changed = [
+            model(id=call_id, phone_e164=normalize(phone_number))
+            for call_id, phone_number, phone_e164 in rows
+            if normalize(phone_number) != phone_e164
+        ]
+        model.objects.bulk_update(changed, ['phone_e164'], batch_size=1000)
+        processed += len(rows)
+        last_id = rows[-1][0]
@@ -0,0 +1,49 @@
+"""
+Sorgu planı (EXPLAIN) yardımcıları.
+
+Testlerde sıcak sorguların indeks kullanmaya devam ettiğini doğrulamak için
+kullanılır; bir queryset tam tablo taramasına düşerse ilgili plan satırları
+döndürülür.
+"""
+import re
+
+from django.db import connections, transaction
+
+# SQLite: "SCAN core_call" (indekssiz tarama). "SCAN core_call USING INDEX ..." ve
+# "USING COVERING INDEX" indeks üzerinden sıralı okuma olduğu için kabul edilir. Sanal tablolarda
+# (FTS5) "VIRTUAL TABLE INDEX 0:M1" gibi boş olmayan kısıt dizesi tablonun kendi indeksinin kullanıldığını gösterir.
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN (?!.*\bUSING\b.*\bINDEX\b)(?!\w+ VIRTUAL TABLE INDEX \d+:\S)(?P<table>\w+)')
+# PostgreSQL: "Seq Scan on core_call"
+POSTGRESQL_FULL_SCAN = re.compile(r'\bSeq Scan on (?P<table>\w+)')
+
+
+def full_table_scans(queryset):
+    """
+    Queryset'in planındaki tam tablo taraması yapan satırları döndür
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'sqlite':
+        pattern = SQLITE_FULL_SCAN
+        plan = queryset.explain()
+    elif connection.vendor == 'postgresql':
+        pattern = POSTGRESQL_FULL_SCAN
+        # Test tabloları küçük olduğu için planlayıcı her zaman Seq Scan seçer;
+        # seq scan kapatıldığında hâlâ Seq Scan görülüyorsa uygun indeks yoktur.
+        with transaction.atomic(using=queryset.db), connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+    else:
+        return []
+    return [line.strip() for line in plan.splitlines() if pattern.search(line)]
+
+
+class QueryPlanAssertionsMixin:
+    """
+    TestCase sınıflarına sorgu planı doğrulaması ekler
+    """
+
+    def assertNoFullTableScan(self, queryset, msg=None):
+        scans = full_table_scans(queryset)
+        if scans:
+            self.fail(msg or 'Sorgu tam tablo taraması yapıyor:\n{}\n\n{}'.format(
+                '\n'.join(scans), queryset.query))
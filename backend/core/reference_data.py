@@ -0,0 +1,113 @@
+"""
+Nadiren değişen referans verileri (değerlendirme kriterleri vb.) için süreç içi önbellek.
+
+Her süreç veriyi bellekte bir sürüm damgasıyla birlikte tutar. Damga paylaşılan
+önbellekte (settings.CACHES, çok süreçli kurulumda Redis) saklanır ve kayıt
+eklendiğinde, değiştiğinde veya silindiğinde yenilenir. Okumalarda sadece
+damga karşılaştırılır (en fazla REFERENCE_DATA_CHECK_INTERVAL saniyede bir);
+veri yalnızca damga değiştiğinde veritabanından yeniden yüklenir.
+
+Paylaşılan önbellek yoksa (varsayılan LocMemCache) diğer süreçlerin damga
+yenilemeleri görünmez; bu durumda veri en fazla REFERENCE_DATA_MAX_AGE
+saniyede bir damgadan bağımsız olarak yeniden yüklenir.
+
+Dönen veriler süreç genelinde paylaşılır, çağıranlar tarafından değiştirilmemelidir.
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from backend.core.models import EvaluationCriteria
+
+
+class VersionedCache:
+    """Paylaşılan sürüm damgasıyla doğrulanan süreç içi önbellek"""
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.version_key = f'reference-data:{name}:version'
+        self._lock = threading.Lock()
+        self._data = None
+        self._version = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+
+    def current_version(self):
+        """Paylaşılan önbellekteki sürüm damgası (yoksa oluşturulur)"""
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def get(self):
+        now = time.monotonic()
+        data = self._data
+        if data is not None and now - self._checked_at < settings.REFERENCE_DATA_CHECK_INTERVAL:
+            return data
+        # Damga yükleme öncesinde okunur; yükleme sırasında değişirse bir sonraki okumada yeniden yüklenir
+        version = self.current_version()
+        max_age = settings.REFERENCE_DATA_MAX_AGE
+        with self._lock:
+            expired = max_age and now - self._loaded_at >= max_age
+            if self._data is None or self._version != version or expired:
+                self._data = self.loader()
+                self._version = version
+                self._loaded_at = now
+            self._checked_at = now
+            return self._data
+
+    def clear_local(self):
+        with self._lock:
+            self._data = None
+            self._version = None
+
+    def invalidate(self):
+        """
+        Tüm süreçlerdeki kopyaları geçersiz kıl. Damga hem hemen hem de işlem
+        commit edildikten sonra yenilenir; böylece commit öncesinde başka
+        süreçlerce yüklenen eski veri de atılır.
+        """
+        self.clear_local()
+        self.bump()
+        transaction.on_commit(self.bump)
+
+    def bump(self):
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+
+
+def load_criteria():
+    return tuple(
+        EvaluationCriteria.objects.order_by('id').values('id', 'name', 'description', 'weight')
+    )
+
+
+criteria = VersionedCache('criteria', load_criteria)
+
+REGISTRY = {
+    'core.EvaluationCriteria': criteria,
+}
+
+
+def get_criteria():
+    """Kriter sözlükleri (id sırasıyla): ({'id', 'name', 'description', 'weight'}, ...)"""
+    return criteria.get()
+
+
+def get_criterion(criterion_id):
+    """Tek kriter sözlüğü veya None"""
+    for criterion in criteria.get():
+        if criterion['id'] == criterion_id:
+            return criterion
+    return None
+
+
+def clear_all():
+    """Tüm süreç içi kopyaları at (testler ve yönetim komutları için)"""
+    for reference_cache in REGISTRY.values():
+        reference_cache.clear_local()
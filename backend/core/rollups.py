@@ -0,0 +1,169 @@
+"""
+Günlük ve haftalık performans özetleri (PerformanceRollup).
+
+Özetler çağrı tarihine (Call.call_date) göre temsilci, takım ve kuyruk
+kırılımında tutulur. Artımlı yenilemede son çalıştırmadan bu yana
+`updated_at` değeri değişen çağrı ve değerlendirmelerin düştüğü günler
+bulunur; sadece bu günleri (ve içerdikleri haftaları) kapsayan özetler ham
+tablolardan yeniden hesaplanır. Silinen kayıtların ve tarihi değişen
+çağrıların eski günleri sinyallerle RollupInvalidation tablosuna yazılır.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DateField, F, Q, Sum
+from django.db.models.functions import TruncDay, TruncWeek
+from django.utils import timezone
+
+from backend.core.models import Call, Evaluation, PerformanceRollup, RollupInvalidation, RollupWatermark
+
+WATERMARK_NAME = 'performance_rollup'
+
+DIMENSION_KEYS = {
+    PerformanceRollup.Dimension.AGENT: 'agent_id',
+    PerformanceRollup.Dimension.TEAM: 'agent__team',
+    PerformanceRollup.Dimension.QUEUE: 'queue',
+}
+
+GRAIN_TRUNC = {
+    PerformanceRollup.Grain.DAY: TruncDay,
+    PerformanceRollup.Grain.WEEK: TruncWeek,
+}
+
+GRAIN_LENGTH = {
+    PerformanceRollup.Grain.DAY: datetime.timedelta(days=1),
+    PerformanceRollup.Grain.WEEK: datetime.timedelta(days=7),
+}
+
+
+def period_start(day, grain):
+    """Günün ait olduğu dönemin ilk günü (haftalar pazartesi başlar)"""
+    if grain == PerformanceRollup.Grain.WEEK:
+        return day - datetime.timedelta(days=day.weekday())
+    return day
+
+
+def local_midnight(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def periods_filter(periods, grain):
+    """
+    Dönemleri call_date aralıklarına çeviren Q; ardışık dönemler tek aralıkta birleştirilir
+    """
+    length = GRAIN_LENGTH[grain]
+    ranges = []
+    for start in sorted(periods):
+        if ranges and ranges[-1][1] == start:
+            ranges[-1][1] = start + length
+        else:
+            ranges.append([start, start + length])
+    condition = Q(pk__in=[])
+    for start, end in ranges:
+        condition |= Q(call_date__gte=local_midnight(start), call_date__lt=local_midnight(end))
+    return condition
+
+
+def aggregate_rollups(grain, periods=None):
+    """
+    Verilen dönemler (None ise tüm veri) için üç kırılımın özet satırlarını ham tablolardan hesapla
+    """
+    calls = Call.objects.order_by()
+    if periods is not None:
+        calls = calls.filter(periods_filter(periods, grain))
+    calls = calls.annotate(period=GRAIN_TRUNC[grain]('call_date', output_field=DateField()))
+
+    rollups = []
+    for dimension, key_field in DIMENSION_KEYS.items():
+        rows = (
+            calls.values('period', rollup_key=F(key_field))
+            .annotate(
+                call_count=Count('id'),
+                duration_total=Sum('duration'),
+                evaluation_count=Count('evaluation'),
+                score_sum=Sum('evaluation__total_score'),
+            )
+        )
+        for row in rows:
+            rollups.append(PerformanceRollup(
+                grain=grain,
+                dimension=dimension,
+                key=str(row['rollup_key'] or ''),
+                period_start=row['period'],
+                call_count=row['call_count'],
+                duration_seconds=int(row['duration_total'].total_seconds()) if row['duration_total'] else 0,
+                evaluation_count=row['evaluation_count'],
+                score_sum=row['score_sum'] or 0,
+            ))
+    return rollups
+
+
+def changed_day_querysets(since):
+    """`since` sonrasında değişen çağrı/değerlendirmelerin günlerini veren sorgular (updated_at indeksli)"""
+    return (
+        Call.objects.filter(updated_at__gt=since).order_by()
+        .annotate(day=TruncDay('call_date', output_field=DateField()))
+        .values_list('day', flat=True).distinct(),
+        Evaluation.objects.filter(updated_at__gt=since).order_by()
+        .annotate(day=TruncDay('call__call_date', output_field=DateField()))
+        .values_list('day', flat=True).distinct(),
+    )
+
+
+def changed_days(since):
+    """`since` sonrasında değişen çağrı/değerlendirmelerin düştüğü (yerel) günler"""
+    days = set()
+    for queryset in changed_day_querysets(since):
+        days.update(queryset)
+    return days
+
+
+def invalidate_day(call_date):
+    """Silinen ya da başka güne taşınan bir kaydın eski gününü bir sonraki yenilemede yeniden hesaplanmak üzere işaretle"""
+    RollupInvalidation.objects.get_or_create(day=timezone.localdate(call_date))
+
+
+def invalidate_call_day(call_id):
+    """Çağrının gününü işaretle; çağrı artık yoksa bir şey yapma"""
+    call_date = Call.objects.filter(pk=call_id).values_list('call_date', flat=True).first()
+    if call_date is not None:
+        invalidate_day(call_date)
+
+
+def refresh_rollups(full=False):
+    """
+    Özetleri yenile. İlk çalıştırmada veya `full=True` ise tüm özetler baştan
+    hesaplanır. Yeniden hesaplanan gün sayısını (tam yenilemede None) döndürür.
+    """
+    started_at = timezone.now()
+    watermark = RollupWatermark.objects.filter(name=WATERMARK_NAME).first()
+    full = full or watermark is None
+
+    days = None
+    invalidations = []
+    if not full:
+        # Yenileme sırasında commit edilen işlemleri kaçırmamak için aralık biraz geriye taşınır
+        since = watermark.value - settings.ROLLUP_WATERMARK_OVERLAP
+        invalidations = list(RollupInvalidation.objects.values_list('id', 'day'))
+        days = changed_days(since) | {day for _, day in invalidations}
+
+    with transaction.atomic():
+        for grain in PerformanceRollup.Grain.values:
+            if full:
+                PerformanceRollup.objects.filter(grain=grain).delete()
+                rollups = aggregate_rollups(grain)
+            else:
+                periods = {period_start(day, grain) for day in days}
+                if not periods:
+                    continue
+                PerformanceRollup.objects.filter(grain=grain, period_start__in=periods).delete()
+                rollups = aggregate_rollups(grain, periods)
+            PerformanceRollup.objects.bulk_create(rollups, batch_size=1000)
+
+        if full:
+            RollupInvalidation.objects.all().delete()
+        else:
+            RollupInvalidation.objects.filter(id__in=[pk for pk, _ in invalidations]).delete()
+        RollupWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={'value': started_at})
+    return None if full else len(days)
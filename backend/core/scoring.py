@@ -0,0 +1,133 @@
+"""
+Değerlendirme toplam puanı hesaplama.
+
+Toplam puan, puanlanan kriterlerin ağırlıklı ortalamasıdır:
+
+    total_score = Σ(puan × ağırlık) / Σ(ağırlık)   (sadece puanlanan kriterler)
+
+Tekil hesaplama serializer'da kullanılır. Kriter ağırlıkları değiştiğinde
+`recompute_total_scores` tüm değerlendirmeleri gruplar halinde NumPy
+dizilerine yükleyip tek matris çarpımıyla yeniden hesaplar ve sadece değişen
+satırları toplu olarak günceller.
+"""
+import logging
+import threading
+from decimal import Decimal
+
+import numpy as np
+from django.db import connections, transaction
+from django.utils import timezone
+
+from backend.core import reference_data, stats
+from backend.core.models import Evaluation, EvaluationCriteria
+
+logger = logging.getLogger(__name__)
+
+# Aynı süreçte üst üste gelen yeniden hesaplamaları sıraya koy
+_recompute_lock = threading.Lock()
+
+
+def criteria_weights():
+    """Kriter id -> ağırlık sözlüğü (süreç içi önbellekten)"""
+    return {criterion['id']: criterion['weight'] for criterion in reference_data.get_criteria()}
+
+
+def compute_total_score(scores, weights):
+    """
+    Tek bir değerlendirmenin toplam puanını hesapla. Bilinmeyen kriterler yok sayılır.
+    """
+    weighted_sum = 0.0
+    weight_sum = 0
+    for criterion_id, score in scores.items():
+        weight = weights.get(int(criterion_id))
+        if weight is None:
+            continue
+        weighted_sum += float(score) * weight
+        weight_sum += weight
+    if not weight_sum:
+        return Decimal('0.00')
+    # Toplu hesaplamayla aynı yuvarlamayı kullan (np.round)
+    return Decimal(f'{np.round(weighted_sum / weight_sum, 2):.2f}')
+
+
+def score_matrix(rows, columns):
+    """
+    (id, scores) satırlarını n x k puan matrisine çevir; puanlanmayan hücreler NaN
+    """
+    matrix = np.full((len(rows), len(columns)), np.nan)
+    for row_index, (_, scores) in enumerate(rows):
+        for criterion_id, score in scores.items():
+            column = columns.get(str(criterion_id))
+            if column is not None:
+                matrix[row_index, column] = float(score)
+    return matrix
+
+
+def weighted_totals(matrix, weights):
+    """Her satır için puanlanan kriterlerin ağırlıklı ortalamasını vektörel olarak hesapla"""
+    present = ~np.isnan(matrix)
+    weighted = np.where(present, matrix, 0.0) @ weights
+    weight_sums = present @ weights
+    totals = np.divide(weighted, weight_sums, out=np.zeros_like(weighted), where=weight_sums > 0)
+    return np.round(totals, 2)
+
+
+def recompute_total_scores(batch_size=5000, update_batch_size=1000):
+    """
+    Tüm değerlendirmelerin toplam puanını güncel ağırlıklarla yeniden hesapla.
+    Güncellenen satır sayısını döndürür.
+    """
+    # Ağırlık değişikliğinin hemen ardından çalıştığı için önbellek yerine veritabanından oku
+    weights = dict(EvaluationCriteria.objects.values_list('id', 'weight'))
+    criterion_ids = sorted(weights)
+    columns = {str(criterion_id): index for index, criterion_id in enumerate(criterion_ids)}
+    weight_vector = np.array([weights[criterion_id] for criterion_id in criterion_ids], dtype=float)
+
+    updated = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            # Grup kilitlenir; eşzamanlı kaydetmeler okunan puanla sayaç farkını bozamaz
+            rows = list(
+                Evaluation.objects.filter(id__gt=last_id).order_by('id').select_for_update()
+                .values_list('id', 'scores', 'total_score')[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            totals = weighted_totals(score_matrix([(row[0], row[1]) for row in rows], columns), weight_vector)
+            now = timezone.now()
+            changed = []
+            delta = Decimal('0')
+            for (evaluation_id, _, current), total in zip(rows, totals):
+                total = Decimal(f'{total:.2f}')
+                if current != total:
+                    changed.append(Evaluation(id=evaluation_id, total_score=total, updated_at=now))
+                    delta += total - (current or 0)
+            Evaluation.objects.bulk_update(changed, ['total_score', 'updated_at'], batch_size=update_batch_size)
+            # bulk_update sinyal göndermez; puan toplamı sayacına sadece farkı ekle
+            # (tüm sayaçları yeniden kurmak canlı sinyal artışlarıyla yarışır)
+            stats.increment(stats.EVALUATION_SCORE_SUM, delta)
+        updated += len(changed)
+    return updated
+
+
+def _recompute_in_background():
+    try:
+        with _recompute_lock:
+            count = recompute_total_scores()
+        logger.info('Kriter ağırlıkları değişti, %s değerlendirme puanı güncellendi', count)
+    except Exception:
+        logger.exception('Toplam puanlar yeniden hesaplanamadı')
+    finally:
+        connections.close_all()
+
+
+def schedule_recompute():
+    """
+    İşlem commit edildikten sonra toplam puanları arka plan thread'inde yeniden hesapla
+    """
+    transaction.on_commit(
+        lambda: threading.Thread(target=_recompute_in_background, daemon=True).start()
+    )
@@ -0,0 +1,153 @@
+"""
+Değerlendirme yorumlarında (comments, improvement_areas) indeksli tam metin arama.
+
+Her iki alan Türkçe kurallarıyla normalize edilerek Evaluation.search_text
+alanına yazılır (pre_save sinyali): I/İ Türkçe küçük harfe çevrilir, aksanlar
+atılır (ç→c, ğ→g, ı→i, ö→o, ş→s, ü→u) ve noktalama kaldırılır. Arama
+ifadesi de aynı şekilde normalize edildiği için "MÜŞTERİ", "müşteri" ve
+"musteri" aynı sonucu verir. Terimler önek olarak eşleşir ("müşteri"
+aramasında "müşteriye" de bulunur) ve tüm terimler geçmelidir.
+
+İndeks veritabanına göre seçilir:
+- SQLite: search_text üzerinde harici içerikli FTS5 tablosu; tetikleyicilerle
+  (update() ve toplu yazmalar dahil) eşitlenir.
+- PostgreSQL: to_tsvector('simple', search_text) ifadesi üzerinde GIN indeksi.
+  Metin zaten Python'da normalize edildiği için 'turkish' sözlüğü yerine
+  'simple' kullanılır; Türkçe ekler önek eşleşmesiyle karşılanır.
+- Diğerleri: indekssiz icontains araması.
+
+SQLite'ta core_evaluation tablosunu yeniden oluşturan bir migration
+tetikleyicileri düşürür; sonrasında `rebuild_search_index` çalıştırılmalıdır.
+"""
+import re
+import unicodedata
+
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+from backend.core.models import Evaluation
+
+TURKISH_UPPER = str.maketrans({'I': 'ı', 'İ': 'i'})
+# NFKD ile ayrışmayan harfler
+LETTER_FOLD = str.maketrans({'ı': 'i', 'ß': 'ss', 'æ': 'ae', 'ø': 'o'})
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+# Uzun sorgularda indeks taramasını sınırla
+MAX_TERMS = 8
+
+FTS_TABLE = 'core_evaluation_fts'
+PG_INDEX = 'evaluation_search_gin_idx'
+
+
+def normalize(text):
+    """Metni arama için normalize et: Türkçe küçük harf, aksansız, tek boşluklu kelimeler"""
+    text = (text or '').translate(TURKISH_UPPER).lower()
+    text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    return ' '.join(TOKEN_RE.findall(text.translate(LETTER_FOLD)))
+
+
+def document(comments, improvement_areas):
+    """Evaluation.search_text değeri"""
+    return normalize(f'{comments or ""} {improvement_areas or ""}')
+
+
+def search_terms(query):
+    """Arama ifadesindeki normalize terimler (en fazla MAX_TERMS, tekrarsız)"""
+    return list(dict.fromkeys(normalize(query).split()))[:MAX_TERMS]
+
+
+def filter_evaluations(queryset, query):
+    """Değerlendirmeleri, ifadedeki tüm terimleri (önek olarak) içerenlerle sınırla"""
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    column = f'"{Evaluation._meta.db_table}"."search_text"'
+    if vendor == 'sqlite':
+        # Terimler sadece harf/rakam içerir; tırnaklı önek terimleri örtük AND ile birleşir
+        match = ' '.join(f'"{term}"*' for term in terms)
+        condition = RawSQL(
+            f'"{Evaluation._meta.db_table}"."id" IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)',
+            [match], output_field=BooleanField(),
+        )
+        return queryset.filter(condition)
+    if vendor == 'postgresql':
+        # İfade GIN indeksindekiyle birebir aynı olmalı
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        condition = RawSQL(
+            f"to_tsvector('simple', {column}) @@ to_tsquery('simple', %s)",
+            [tsquery], output_field=BooleanField(),
+        )
+        return queryset.filter(condition)
+    condition = Q()
+    for term in terms:
+        condition &= Q(search_text__icontains=term)
+    return queryset.filter(condition)
+
+
+def install_index(connection):
+    """Veritabanına uygun arama indeksini (yoksa) oluştur ve mevcut satırlarla doldur"""
+    table = Evaluation._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"search_text, content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) "
+                f"VALUES ('delete', old.id, old.search_text); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF search_text ON {table} BEGIN "
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) "
+                f"VALUES ('delete', old.id, old.search_text); "
+                f"INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text); END"
+            )
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON {table} "
+                f"USING gin (to_tsvector('simple', search_text))"
+            )
+
+
+def drop_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {PG_INDEX}')
+
+
+def backfill(batch_size=5000, model=Evaluation):
+    """
+    search_text alanını id sırasıyla gruplar halinde yeniden hesapla (sadece
+    değişenler yazılır). `model` migration'larda tarihsel modeli vermek içindir.
+    İşlenen değerlendirme sayısını döndürür.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        rows = list(
+            model.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'comments', 'improvement_areas', 'search_text')[:batch_size]
+        )
+        if not rows:
+            return processed
+        changed = []
+        for evaluation_id, comments, improvement_areas, search_text in rows:
+            text = document(comments, improvement_areas)
+            if text != search_text:
+                changed.append(model(id=evaluation_id, search_text=text))
+        model.objects.bulk_update(changed, ['search_text'], batch_size=1000)
+        processed += len(rows)
+        last_id = rows[-1][0]
@@ -1,5 +1,15 @@
-from django.db.models.signals import post_save
+from decimal import Decimal
+
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
+
+from backend.core import audio_analysis, criterion_scores, phone, reference_data, rollups, scoring, search, stats
+
+
+def _decimal(value):
+    return Decimal(str(value)) if value is not None else Decimal('0')
+
 
 # Signals kullanım örnekleri (model importları Django hazır olduğunda yapılmalı)
 @receiver(post_save, sender='core.User')
@@ -7,7 +17,117 @@ def create_user_profile(sender, instance, created, **kwargs):
     if created:
         pass  # Gerekli işlemler yapılabilir
 
+@receiver(post_init, sender='core.Call')
+def remember_call_status(sender, instance, **kwargs):
+    """Durum değişikliklerini sayaçlara yansıtabilmek için yüklenen durumu sakla"""
+    # Ertelenmiş (.only/.defer) alanlara dokunup ek sorgu tetiklememek için __dict__ kullanılır
+    instance._stats_status = instance.__dict__.get('status')
+    mp3_file = instance.__dict__.get('mp3_file')
+    instance._audio_name = getattr(mp3_file, 'name', mp3_file)
+    instance._rollup_call_date = instance.__dict__.get('call_date')
+
+@receiver(pre_save, sender='core.Call')
+def update_phone_e164(sender, instance, **kwargs):
+    """Telefon numarasının E.164 halini üret (update_fields ile kaydederken phone_e164 de verilmeli)"""
+    if 'phone_number' in instance.__dict__:
+        instance.phone_e164 = phone.normalize(instance.phone_number)
+
+@receiver(post_save, sender='core.Call')
+def update_call_stats(sender, instance, created, **kwargs):
+    """Çağrı sayaçlarını güncelle"""
+    if created:
+        stats.increment(stats.CALLS_TOTAL, 1)
+        stats.increment(stats.call_status_counter(instance.status), 1)
+    elif instance._stats_status is not None and instance._stats_status != instance.status:
+        stats.increment(stats.call_status_counter(instance._stats_status), -1)
+        stats.increment(stats.call_status_counter(instance.status), 1)
+    instance._stats_status = instance.status
+
+@receiver(post_save, sender='core.Call')
+def analyze_call_audio(sender, instance, created, **kwargs):
+    """Yeni yüklenen ya da değişen ses kaydını arka planda analiz et"""
+    if 'mp3_file' not in instance.__dict__:
+        return
+    if created or instance.mp3_file.name != instance._audio_name:
+        audio_analysis.schedule_analysis(instance)
+    instance._audio_name = instance.mp3_file.name
+
+@receiver(post_delete, sender='core.Call')
+def remove_call_stats(sender, instance, **kwargs):
+    stats.increment(stats.CALLS_TOTAL, -1)
+    stats.increment(stats.call_status_counter(instance._stats_status or instance.status), -1)
+
+@receiver(post_delete, sender='core.Call')
+def invalidate_call_rollups(sender, instance, **kwargs):
+    """Silinen çağrının gününü performans özetlerinde yeniden hesaplanmak üzere işaretle"""
+    rollups.invalidate_day(instance.call_date)
+
+@receiver(post_save, sender='core.Call')
+def invalidate_moved_call_rollups(sender, instance, created, **kwargs):
+    """Tarihi değişen çağrının eski gününü işaretle (yeni gün updated_at üzerinden bulunur)"""
+    previous = instance._rollup_call_date
+    current = instance.__dict__.get('call_date')
+    if not created and previous is not None and current is not None \
+            and timezone.localdate(previous) != timezone.localdate(current):
+        rollups.invalidate_day(previous)
+    instance._rollup_call_date = current
+
+@receiver(post_init, sender='core.Evaluation')
+def remember_evaluation_score(sender, instance, **kwargs):
+    """Puan güncellemelerinde farkı hesaplayabilmek için yüklenen puanı sakla"""
+    instance._stats_score = instance.__dict__.get('total_score')
+
+@receiver(pre_save, sender='core.Evaluation')
+def update_search_text(sender, instance, **kwargs):
+    """Arama metnini yorum alanlarından üret (update_fields ile kaydederken search_text de verilmeli)"""
+    if 'comments' in instance.__dict__ and 'improvement_areas' in instance.__dict__:
+        instance.search_text = search.document(instance.comments, instance.improvement_areas)
+
 @receiver(post_save, sender='core.Evaluation')
 def update_evaluation_stats(sender, instance, created, **kwargs):
+    """Değerlendirme sayısı ve puan toplamı sayaçlarını güncelle"""
     if created:
-        pass  # Gerekli işlemler yapılabilir 
\ No newline at end of file
+        stats.increment(stats.EVALUATIONS_TOTAL, 1)
+        stats.increment(stats.EVALUATION_SCORE_SUM, _decimal(instance.total_score))
+    elif instance._stats_score is not None and instance._stats_score != instance.total_score:
+        stats.increment(stats.EVALUATION_SCORE_SUM,
+                        _decimal(instance.total_score) - _decimal(instance._stats_score))
+    instance._stats_score = instance.total_score
+
+@receiver(post_save, sender='core.Evaluation')
+def sync_criterion_scores(sender, instance, update_fields=None, **kwargs):
+    """Kriter puanı tablosunu scores alanıyla eşitle"""
+    if update_fields is None or 'scores' in update_fields:
+        criterion_scores.sync_evaluation_scores(instance)
+
+@receiver(post_delete, sender='core.Evaluation')
+def remove_evaluation_stats(sender, instance, **kwargs):
+    stats.increment(stats.EVALUATIONS_TOTAL, -1)
+    score = instance._stats_score if instance._stats_score is not None else instance.total_score
+    stats.increment(stats.EVALUATION_SCORE_SUM, -_decimal(score))
+
+@receiver(post_delete, sender='core.Evaluation')
+def invalidate_evaluation_rollups(sender, instance, **kwargs):
+    # Çağrıyla birlikte (cascade) silindiyse gün çağrının kendi sinyaliyle işaretlenir
+    rollups.invalidate_call_day(instance.call_id)
+
+@receiver(post_save, sender='core.EvaluationCriteria')
+@receiver(post_delete, sender='core.EvaluationCriteria')
+def invalidate_criteria_cache(sender, instance, **kwargs):
+    """Süreç içi kriter önbelleklerini geçersiz kıl"""
+    reference_data.criteria.invalidate()
+
+@receiver(post_init, sender='core.EvaluationCriteria')
+def remember_criteria_weight(sender, instance, **kwargs):
+    instance._loaded_weight = instance.__dict__.get('weight')
+
+@receiver(post_save, sender='core.EvaluationCriteria')
+def recompute_scores_on_weight_change(sender, instance, created, **kwargs):
+    """Ağırlık değişince tüm toplam puanları yeniden hesapla (yeni kriterin puanı henüz yoktur)"""
+    if not created and instance._loaded_weight != instance.weight:
+        scoring.schedule_recompute()
+    instance._loaded_weight = instance.weight
+
+@receiver(post_delete, sender='core.EvaluationCriteria')
+def recompute_scores_on_criteria_delete(sender, instance, **kwargs):
+    scoring.schedule_recompute()
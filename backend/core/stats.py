@@ -0,0 +1,89 @@
+"""
+Dashboard istatistik sayaçları.
+
+Sayaçlar Call ve Evaluation sinyalleri tarafından artımlı olarak güncellenir,
+böylece dashboard endpointi büyük tablolar üzerinde aggregate çalıştırmaz.
+`rebuild_counters` sayaçları ham tablolardan yeniden hesaplar (mutabakat için).
+Sayaçlar merkez geneli içindir; tek temsilcinin değerleri `read_agent_counters`
+ile temsilcinin kendi çağrıları üzerinden (agent indeksiyle) hesaplanır.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from backend.core.models import Call, Evaluation, StatCounter
+
+CALLS_TOTAL = 'calls_total'
+EVALUATIONS_TOTAL = 'evaluations_total'
+EVALUATION_SCORE_SUM = 'evaluation_score_sum'
+
+
+def call_status_counter(status):
+    """Belirli bir çağrı durumunun sayaç adını döndür"""
+    return f'calls_{status}'
+
+
+ALL_COUNTERS = [CALLS_TOTAL, EVALUATIONS_TOTAL, EVALUATION_SCORE_SUM] + [
+    call_status_counter(status) for status in Call.CallStatus.values
+]
+
+
+def increment(name, delta):
+    """
+    Sayacı veritabanı tarafında atomik olarak artır (UPDATE ... SET value = value + delta)
+    """
+    if not delta:
+        return
+    if not StatCounter.objects.filter(name=name).update(value=F('value') + delta):
+        StatCounter.objects.get_or_create(name=name)
+        StatCounter.objects.filter(name=name).update(value=F('value') + delta)
+
+
+def read_counters():
+    """Tüm sayaçları tek sorguda {ad: değer} sözlüğü olarak döndür"""
+    values = dict.fromkeys(ALL_COUNTERS, Decimal('0'))
+    values.update(StatCounter.objects.filter(name__in=ALL_COUNTERS).values_list('name', 'value'))
+    return values
+
+
+def agent_counter_rows(agent_id):
+    """Temsilcinin çağrılarının durum bazında sayı, değerlendirme sayısı ve puan toplamı"""
+    return (
+        Call.objects.filter(agent_id=agent_id).order_by().values('status')
+        .annotate(total=Count('id'), evaluations=Count('evaluation'), score_sum=Sum('evaluation__total_score'))
+    )
+
+
+def read_agent_counters(agent_id):
+    """
+    Temsilcinin kendi çağrılarından read_counters ile aynı biçimde sayaçlar (tek sorgu)
+    """
+    values = dict.fromkeys(ALL_COUNTERS, Decimal('0'))
+    for row in agent_counter_rows(agent_id):
+        values[call_status_counter(row['status'])] = row['total']
+        values[CALLS_TOTAL] += row['total']
+        values[EVALUATIONS_TOTAL] += row['evaluations']
+        values[EVALUATION_SCORE_SUM] += row['score_sum'] or 0
+    return values
+
+
+@transaction.atomic
+def rebuild_counters():
+    """
+    Sayaçları Call ve Evaluation tablolarından sıfırdan hesapla
+    """
+    values = dict.fromkeys(ALL_COUNTERS, Decimal('0'))
+    for row in Call.objects.order_by().values('status').annotate(total=Count('id')):
+        values[call_status_counter(row['status'])] = row['total']
+        values[CALLS_TOTAL] += row['total']
+
+    evaluations = Evaluation.objects.order_by().aggregate(total=Count('id'), score_sum=Sum('total_score'))
+    values[EVALUATIONS_TOTAL] = evaluations['total']
+    values[EVALUATION_SCORE_SUM] = evaluations['score_sum'] or 0
+
+    StatCounter.objects.all().delete()
+    StatCounter.objects.bulk_create(
+        [StatCounter(name=name, value=value) for name, value in values.items()]
+    )
+    return values
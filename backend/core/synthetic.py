@@ -0,0 +1,316 @@
+"""
+Performans ölçümleri için üretim biçiminde sentetik veri üretimi.
+
+Kullanıcılar, çağrılar, değerlendirmeler ve kriter puanları bir tohumdan
+belirlenimci olarak üretilir (tarihler üretim gününe göredir): çağrılar sabit
+boyutlu parçalara bölünür, her parça kendi (tohum, parça no) rastgele
+üretecini kullanır ve kayıtlara açık id verilir. Böylece çıktı işçi süreç
+sayısından bağımsızdır ve parçalar birbirinden habersiz, paralel olarak
+eklenebilir.
+
+Kullanıcılar bulk_create ile, hacimli tablolar (çağrı, değerlendirme, kriter
+puanı) ise `insert_rows` ile büyük gruplar halinde eklenir. Sinyal
+gönderilmediği için phone_e164 ve search_text gibi türetilmiş alanlar üretim
+sırasında doldurulur, sayaçlar ve performans özetleri sonda yeniden
+hesaplanır. Kayıtlar mevcut verinin üzerine eklenir (silme yapılmaz).
+"""
+import datetime
+import multiprocessing
+import random
+from dataclasses import dataclass
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, connections, router, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from backend.core import reference_data, rollups, search, stats
+from backend.core.models import Call, Evaluation, EvaluationCriteria, EvaluationScore, User
+from backend.core.scoring import compute_total_score
+
+# (kuyruk, ağırlık, ortalama süre saniye)
+QUEUES = (
+    ('Destek', 40, 240),
+    ('Satış', 25, 360),
+    ('Teknik Destek', 20, 540),
+    ('Şikayet', 10, 420),
+    ('İptal', 5, 300),
+)
+# Sicil numarasındaki rol kodu (rollerin baş harfleri çakışmamalı)
+ROLE_CODES = {'agent': 'AG', 'expert': 'EX', 'admin': 'AD'}
+# Saat bazında çağrı yoğunluğu (mesai saatlerinde yoğun)
+HOUR_WEIGHTS = (1, 1, 1, 1, 1, 1, 2, 4, 9, 12, 12, 11, 9, 10, 11, 11, 10, 8, 6, 4, 3, 2, 1, 1)
+COMMENTS = (
+    'Müşteriyi nazikçe karşıladı ve sorununu dikkatle dinledi.',
+    'Çözüm önerisi doğru ancak bekletme süresi uzun.',
+    'Fatura itirazında süreci net biçimde açıkladı.',
+    'Kampanya koşullarını eksik anlattı, müşteri tekrar arayabilir.',
+    'Şikayet kaydı açıldı, müşteri bilgilendirildi.',
+    'İade talebi kurallara uygun şekilde yönlendirildi.',
+    'Ses tonu ılık, kapanışta teşekkür etmedi.',
+    'Teknik arızayı hızlı tespit etti ve uzak bağlantıyla çözdü.',
+    'KVKK doğrulaması eksik yapıldı.',
+    'Görüşme boyunca empati kurdu, müşteri memnun ayrıldı.',
+)
+IMPROVEMENT_AREAS = (
+    '',
+    'Bekletme öncesi müşteriden izin alınmalı.',
+    'Kapanış cümlesi standartlara uygun olmalı.',
+    'Ürün bilgisi güncellenmeli.',
+    'Kimlik doğrulama adımları eksiksiz uygulanmalı.',
+    'Aktif dinleme geliştirilmeli.',
+)
+# Değeri veritabanına olduğu gibi gönderilebilen alan tipleri
+PASSTHROUGH_FIELDS = {'AutoField', 'BigAutoField', 'CharField', 'TextField', 'FileField', 'ForeignKey',
+                      'OneToOneField', 'IntegerField'}
+CALL_FIELDS = ('id', 'agent', 'call_date', 'phone_number', 'phone_e164', 'duration', 'mp3_file', 'waveform',
+               'queue', 'status', 'created_at', 'updated_at')
+EVALUATION_FIELDS = ('id', 'call', 'evaluator', 'scores', 'total_score', 'comments', 'improvement_areas',
+                     'search_text', 'created_at', 'updated_at')
+SCORE_FIELDS = ('evaluation', 'criterion', 'score')
+DEFAULT_CRITERIA = (
+    ('Müşteri Selamlama', 'Standart karşılama ve kendini tanıtma', 10),
+    ('Problem Anlama', 'Müşteri talebinin doğru anlaşılması', 20),
+    ('Çözüm Sunma', 'Doğru ve eksiksiz çözüm sunulması', 30),
+    ('İletişim Becerileri', 'Ses tonu, empati ve anlaşılır ifade', 25),
+    ('Kapanış', 'Standart kapanış ve ek ihtiyaç sorgusu', 15),
+)
+
+
+@dataclass
+class GenerationPlan:
+    """Parça üretimi için işçi süreçlere aktarılan, seçilebilir (picklable) parametreler"""
+    seed: int
+    calls: int
+    chunk_size: int
+    batch_size: int
+    start: datetime.datetime
+    days: int
+    evaluated_ratio: float
+    customers: int
+    agent_ids: tuple
+    expert_ids: tuple
+    criteria: tuple  # ((id, weight), ...)
+    call_id_base: int
+    evaluation_id_base: int
+    mp3_file: str = ''
+
+
+def insert_rows(model, field_names, rows, batch_size):
+    """
+    Satırları (field_names sırasında değer demetleri) doğrudan INSERT ile ekle.
+    Değerler bulk_create'te olduğu gibi alanın get_db_prep_save'i ile veritabanı
+    biçimine çevrilir; model örneği oluşturma ve satır başına SQL derleme
+    maliyeti olmadığı için bulk_create'ten kat kat hızlıdır. Sinyal gönderilmez,
+    auto_now alanları verilen değerle yazılır.
+    """
+    # Proxy yerine gerçek bağlantı nesnesi: satır başına thread-local araması yapılmaz
+    db = connections[router.db_for_write(model)]
+    fields = [model._meta.get_field(name) for name in field_names]
+    converters = [
+        None if field.get_internal_type() in PASSTHROUGH_FIELDS else field.get_db_prep_save for field in fields
+    ]
+    prepared = [
+        tuple(value if convert is None else convert(value, db) for value, convert in zip(row, converters))
+        for row in rows
+    ]
+    quote = db.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES '.format(
+        quote(model._meta.db_table), ', '.join(quote(field.column) for field in fields),
+    )
+    placeholder = '({})'.format(', '.join(['%s'] * len(fields)))
+    with db.cursor() as cursor:
+        if db.vendor == 'sqlite':
+            # sqlite3'ün executemany döngüsü C'de çalışır ve parametre sınırına takılmaz
+            cursor.executemany(sql + placeholder, prepared)
+            return
+        per_statement = max(1, min(batch_size, (db.features.max_query_params or 65535) // len(fields)))
+        for offset in range(0, len(prepared), per_statement):
+            batch = prepared[offset:offset + per_statement]
+            cursor.execute(sql + ', '.join([placeholder] * len(batch)), [value for row in batch for value in row])
+
+
+def customer_number(customer):
+    """Müşteri no'dan belirlenimci ulusal cep numarası (10 hane)"""
+    return f'5{30 + customer % 30}{customer * 2654435761 % 10 ** 7:07d}'
+
+
+def format_number(national, variant):
+    """Aynı numarayı farklı serbest biçimlerde yaz (E.164 normalizasyonu hepsini eşler)"""
+    if variant == 0:
+        return f'+90 {national[:3]} {national[3:6]} {national[6:8]} {national[8:]}'
+    if variant == 1:
+        return f'0{national}'
+    return f'+90{national}'
+
+
+def create_users(prefix, agents, teams, experts, admins, password, batch_size):
+    """Eksik sentetik kullanıcıları ekle; (agent, expert, admin id'leri) döndür"""
+    password_hash = make_password(password)
+    code = prefix[:4].upper()
+    users = []
+    for role, count in (('agent', agents), ('expert', experts), ('admin', admins)):
+        for index in range(count):
+            users.append(User(
+                username=f'{prefix}_{role}_{index}', password=password_hash, role=role,
+                first_name=role.title(), last_name=str(index),
+                employee_id=f'{code}-{ROLE_CODES[role]}{index:07d}',
+                team=f'Takım {index % teams + 1:03d}' if role == 'agent' else '',
+                is_staff=role == 'admin', is_superuser=role == 'admin',
+            ))
+    User.objects.bulk_create(users, batch_size=batch_size, ignore_conflicts=True)
+
+    def ids(role, count):
+        names = [f'{prefix}_{role}_{index}' for index in range(count)]
+        found = dict(User.objects.filter(username__in=names).values_list('username', 'id'))
+        # ignore_conflicts çakışan satırları sessizce atlar (örn. başka kullanıcıda aynı sicil no)
+        missing = [name for name in names if name not in found]
+        if missing:
+            raise ValueError(f'{len(missing)} kullanıcı oluşturulamadı (ilk: {missing[0]}); '
+                             f'kullanıcı adı veya sicil numarası çakışıyor olabilir')
+        return tuple(found[name] for name in names)
+
+    return ids('agent', agents), ids('expert', experts), ids('admin', admins)
+
+
+def live_criteria():
+    """Mevcut değerlendirme kriterleri; hiç yoksa varsayılan set oluşturulur"""
+    if not EvaluationCriteria.objects.exists():
+        EvaluationCriteria.objects.bulk_create(
+            EvaluationCriteria(name=name, description=description, weight=weight)
+            for name, description, weight in DEFAULT_CRITERIA
+        )
+        reference_data.criteria.invalidate()
+    return tuple((criterion['id'], criterion['weight']) for criterion in reference_data.get_criteria())
+
+
+def build_chunk(plan, chunk_index):
+    """Bir parçanın Call, Evaluation ve EvaluationScore satırlarını (*_FIELDS sırasında) üret"""
+    rng = random.Random(f'{plan.seed}:{chunk_index}')
+    first = chunk_index * plan.chunk_size
+    last = min(first + plan.chunk_size, plan.calls)
+    queue_names = [name for name, _, _ in QUEUES]
+    queue_weights = [weight for _, weight, _ in QUEUES]
+    mean_durations = {name: seconds for name, _, seconds in QUEUES}
+    weights = dict(plan.criteria)
+    documents = {}
+    now = timezone.now()
+
+    calls, evaluations, scores = [], [], []
+    for index in range(first, last):
+        call_id = plan.call_id_base + index
+        day = plan.start + datetime.timedelta(days=rng.randrange(plan.days))
+        call_date = day.replace(hour=rng.choices(range(24), HOUR_WEIGHTS)[0],
+                                minute=rng.randrange(60), second=rng.randrange(60))
+        if call_date > now:
+            # Bugünün henüz gelmemiş saatleri bir gün geriye alınır
+            call_date -= datetime.timedelta(days=1)
+        queue = rng.choices(queue_names, queue_weights)[0]
+        duration = datetime.timedelta(seconds=int(min(3600, max(15, rng.lognormvariate(0, 0.6)
+                                                               * mean_durations[queue]))))
+        national = customer_number(rng.randrange(plan.customers))
+        evaluated = rng.random() < plan.evaluated_ratio
+        calls.append((
+            call_id, rng.choice(plan.agent_ids), call_date, format_number(national, rng.randrange(3)),
+            f'+90{national}', duration, plan.mp3_file or f'call_records/synthetic/{call_id}.mp3', '', queue,
+            Call.CallStatus.COMPLETED if evaluated else Call.CallStatus.PENDING, call_date, call_date,
+        ))
+        if not evaluated:
+            continue
+
+        evaluation_id = plan.evaluation_id_base + index
+        call_scores = {str(criterion_id): int(min(100, max(0, rng.gauss(80, 12)))) for criterion_id in weights}
+        comment = rng.randrange(len(COMMENTS))
+        improvement = rng.randrange(len(IMPROVEMENT_AREAS))
+        if (comment, improvement) not in documents:
+            documents[comment, improvement] = search.document(COMMENTS[comment], IMPROVEMENT_AREAS[improvement])
+        evaluated_at = min(now, call_date + datetime.timedelta(minutes=rng.randrange(30, 60 * 72)))
+        evaluations.append((
+            evaluation_id, call_id, rng.choice(plan.expert_ids), call_scores,
+            compute_total_score(call_scores, weights), COMMENTS[comment], IMPROVEMENT_AREAS[improvement],
+            documents[comment, improvement], evaluated_at, evaluated_at,
+        ))
+        scores.extend(
+            (evaluation_id, int(criterion_id), score) for criterion_id, score in call_scores.items()
+        )
+    return calls, evaluations, scores
+
+
+def insert_chunk(plan, chunk_index):
+    """Parçayı üretip tek işlemde ekle; (çağrı, değerlendirme) sayısını döndür"""
+    calls, evaluations, scores = build_chunk(plan, chunk_index)
+    with transaction.atomic():
+        insert_rows(Call, CALL_FIELDS, calls, plan.batch_size)
+        insert_rows(Evaluation, EVALUATION_FIELDS, evaluations, plan.batch_size)
+        insert_rows(EvaluationScore, SCORE_FIELDS, scores, plan.batch_size)
+    return len(calls), len(evaluations)
+
+
+def _insert_chunk_in_worker(args):
+    return insert_chunk(*args)
+
+
+def reset_sequences():
+    """Açık id'lerle eklemeden sonra PostgreSQL dizilerini ilerlet"""
+    statements = connection.ops.sequence_reset_sql(no_style(), [Call, Evaluation, EvaluationScore, User])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def generate(calls, agents, teams, experts, admins, seed=1, days=730, evaluated_ratio=0.3, customers=None,
+             workers=1, chunk_size=50000, batch_size=5000, prefix='synthetic', password='synthetic',
+             mp3_file='', refresh_derived=True, progress=None):
+    """
+    Sentetik veriyi üret. `progress(eklenen_çağrı, toplam)` her parçadan sonra çağrılır.
+    Özet sözlüğü döndürür.
+    """
+    if connection.vendor == 'sqlite':
+        # SQLite aynı anda tek yazara izin verir; paralel süreçler sadece kilit bekler
+        workers = 1
+    agent_ids, expert_ids, admin_ids = create_users(prefix, agents, teams, experts, admins, password, batch_size)
+    if calls and not (agent_ids and expert_ids):
+        raise ValueError('Çağrı üretmek için en az bir temsilci ve bir uzman gerekir')
+    today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    plan = GenerationPlan(
+        seed=seed, calls=calls, chunk_size=chunk_size, batch_size=batch_size,
+        start=today - datetime.timedelta(days=days - 1), days=days, evaluated_ratio=evaluated_ratio,
+        customers=customers or max(1, calls // 5), agent_ids=agent_ids, expert_ids=expert_ids,
+        criteria=live_criteria(),
+        call_id_base=(Call.objects.aggregate(last=Max('id'))['last'] or 0) + 1,
+        evaluation_id_base=(Evaluation.objects.aggregate(last=Max('id'))['last'] or 0) + 1,
+        mp3_file=mp3_file,
+    )
+
+    chunks = [(plan, index) for index in range((calls + chunk_size - 1) // chunk_size)]
+    created_calls = created_evaluations = 0
+    if workers > 1:
+        # Çatallanan süreçler ebeveynin açık bağlantısını paylaşmamalı
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            for call_count, evaluation_count in pool.imap_unordered(_insert_chunk_in_worker, chunks):
+                created_calls += call_count
+                created_evaluations += evaluation_count
+                if progress:
+                    progress(created_calls, calls)
+    else:
+        for chunk in chunks:
+            call_count, evaluation_count = insert_chunk(*chunk)
+            created_calls += call_count
+            created_evaluations += evaluation_count
+            if progress:
+                progress(created_calls, calls)
+
+    if connection.vendor == 'postgresql':
+        reset_sequences()
+    if refresh_derived:
+        stats.rebuild_counters()
+        rollups.refresh_rollups(full=True)
+    with connection.cursor() as cursor:
+        # Planlayıcı istatistikleri yeni veri dağılımını yansıtsın
+        cursor.execute('ANALYZE')
+    return {
+        'agents': len(agent_ids), 'experts': len(expert_ids), 'admins': len(admin_ids),
+        'calls': created_calls, 'evaluations': created_evaluations,
+    }
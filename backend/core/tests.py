@@ -1,9 +1,30 @@
-from django.test import TestCase
-from backend.core.models import User, Call, Evaluation, EvaluationCriteria
+from django.core.management import call_command
+from django.db.models import Avg
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from backend.core import (
+    audio_analysis, claims, criterion_scores, phone, query_plans, reference_data, rollups, scoring, search,
+    stats, synthetic, waveform,
+)
+from backend.core.models import (
+    User, Call, Evaluation, EvaluationCriteria, EvaluationScore, PerformanceRollup, RollupInvalidation, StatCounter,
+)
+from backend.core.query_plans import QueryPlanAssertionsMixin
+from backend.api.v1.views import UserViewSet, CallViewSet, EvaluationViewSet
+from unittest import mock
 from django.utils import timezone
+from decimal import Decimal
+from io import StringIO
 import datetime
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
 
-class ModelTests(TestCase):
+class CoreTestCase(TestCase):
+    """Çekirdek testlerinin ortak verisi: admin, agent ve uzman kullanıcılar, bir çağrı, kriter ve değerlendirme"""
     def setUp(self):
         # Test kullanıcısı oluştur
         self.admin_user = User.objects.create_superuser(
@@ -58,7 +79,9 @@ class ModelTests(TestCase):
             comments='Good call',
             improvement_areas='None'
         )
-        
+
+
+class ModelTests(CoreTestCase):
     def test_user_creation(self):
         """Kullanıcılar doğru şekilde oluşturuldu mu testi"""
         self.assertEqual(self.admin_user.username, 'admin_test')
@@ -74,4 +97,449 @@ class ModelTests(TestCase):
         """Değerlendirme doğru şekilde oluşturuldu mu testi"""
         self.assertEqual(self.evaluation.call, self.call)
         self.assertEqual(self.evaluation.evaluator, self.expert_user)
-        self.assertEqual(self.evaluation.total_score, 80) 
\ No newline at end of file
+        self.assertEqual(self.evaluation.total_score, 80) 
+
+class DashboardStatsTests(CoreTestCase):
+    def test_counters_follow_call_and_evaluation_changes(self):
+        """Sayaçlar kayıt ekleme, güncelleme ve silme ile güncel kalmalı"""
+        counters = stats.read_counters()
+        self.assertEqual(counters[stats.CALLS_TOTAL], 1)
+        self.assertEqual(counters['calls_pending'], 1)
+        self.assertEqual(counters[stats.EVALUATIONS_TOTAL], 1)
+        self.assertEqual(counters[stats.EVALUATION_SCORE_SUM], 80)
+
+        self.call.status = Call.CallStatus.COMPLETED
+        self.call.save()
+        self.evaluation.total_score = Decimal('90.50')
+        self.evaluation.save()
+        counters = stats.read_counters()
+        self.assertEqual(counters['calls_pending'], 0)
+        self.assertEqual(counters['calls_completed'], 1)
+        self.assertEqual(counters[stats.EVALUATION_SCORE_SUM], Decimal('90.50'))
+
+        # Çağrı silinince bağlı değerlendirme de sayaçlardan düşülmeli
+        Call.objects.get(pk=self.call.pk).delete()
+        counters = stats.read_counters()
+        self.assertEqual(counters[stats.CALLS_TOTAL], 0)
+        self.assertEqual(counters['calls_completed'], 0)
+        self.assertEqual(counters[stats.EVALUATIONS_TOTAL], 0)
+        self.assertEqual(counters[stats.EVALUATION_SCORE_SUM], 0)
+
+    def test_rebuild_matches_incremental_counters(self):
+        """Yeniden hesaplama artımlı sayaçlarla aynı sonucu vermeli"""
+        incremental = stats.read_counters()
+        StatCounter.objects.all().delete()
+        call_command('rebuild_dashboard_stats', stdout=StringIO())
+        self.assertEqual(stats.read_counters(), incremental)
+
+
+class QueryPlanTests(QueryPlanAssertionsMixin, CoreTestCase):
+    """views.py'deki rol bazlı querysetlerin ve admin filtrelerinin indeks kullandığını doğrular"""
+
+    def request_for(self, user):
+        return mock.Mock(user=user, query_params={})
+
+    def test_role_scoped_querysets_use_indexes(self):
+        for user in (self.admin_user, self.expert_user, self.agent_user):
+            querysets = [
+                UserViewSet(request=self.request_for(user)).get_queryset(),
+                CallViewSet(request=self.request_for(user)).get_queryset(),
+                EvaluationViewSet(request=self.request_for(user)).get_queryset(),
+            ]
+            for queryset in querysets:
+                with self.subTest(user=user.role, model=queryset.model.__name__):
+                    self.assertNoFullTableScan(queryset[:20])
+
+    def test_filter_shapes_use_indexes(self):
+        querysets = [
+            Call.objects.filter(status='pending').order_by('-call_date')[:20],
+            Call.objects.filter(queue='Support').order_by('-call_date')[:20],
+            Evaluation.objects.filter(total_score__gte=80)[:20],
+            phone.filter_calls(Call.objects.order_by('-call_date'), phone='0555 111 22 33')[:20],
+            phone.filter_calls(Call.objects.order_by('-call_date'), prefix='0555')[:20],
+            User.objects.filter(team='Test Team'),
+            # Agent dashboard sayıları (stats.read_agent_counters)
+            stats.agent_counter_rows(self.agent_user.id),
+        ]
+        for queryset in querysets:
+            with self.subTest(query=str(queryset.query)):
+                self.assertNoFullTableScan(queryset)
+
+
+class WaveformTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_compute_peaks_reduces_blocks_to_absolute_maxima(self):
+        samples = np.array([0, -32768, 100, 200, 32767, -5, 7], dtype=np.int16)
+        peaks = waveform.compute_peaks(samples, 3)
+        self.assertEqual(peaks.tolist(), [255, 254, 0])
+
+    def test_analyze_file_streams_pcm_and_writes_sidecar(self):
+        """ffmpeg yerine ham PCM döken sahte bir ikili ile uçtan uca analiz"""
+        fake_ffmpeg = os.path.join(self.tmp, 'ffmpeg')
+        with open(fake_ffmpeg, 'w') as f:
+            f.write('#!/bin/sh\nexec cat "$5"\n')
+        os.chmod(fake_ffmpeg, 0o755)
+
+        sample_rate = 8000
+        samples = (np.sin(np.linspace(0, 400 * np.pi, sample_rate * 3)) * 16000).astype('<i2')
+        audio_path = os.path.join(self.tmp, 'call.mp3')
+        samples.tofile(audio_path)
+        sidecar_path = audio_path + waveform.SIDECAR_SUFFIX
+
+        duration = waveform.analyze_file(audio_path, sidecar_path, sample_rate, 20, fake_ffmpeg)
+        self.assertAlmostEqual(duration, 3.0)
+        rate, samples_per_peak, peaks = waveform.read_sidecar(sidecar_path)
+        self.assertEqual((rate, samples_per_peak, peaks.size), (sample_rate, 400, 60))
+        self.assertTrue((peaks > 120).all())
+
+    def test_verbose_stderr_does_not_block_decoding(self):
+        """Boru tamponunu aşan stderr çıktısı okunmasa da ffmpeg'i kilitlememeli"""
+        fake_ffmpeg = os.path.join(self.tmp, 'ffmpeg')
+        with open(fake_ffmpeg, 'w') as f:
+            f.write('#!/bin/sh\nhead -c 1000000 /dev/zero >&2\necho bozuk >&2\nexit 1\n')
+        os.chmod(fake_ffmpeg, 0o755)
+        with self.assertRaisesMessage(waveform.DecodeError, 'bozuk'):
+            list(waveform.iter_pcm_blocks('/yok.mp3', 8000, 1024, fake_ffmpeg))
+
+    def test_decode_error_is_reported(self):
+        result = waveform.run_job((1, '/yok.mp3', os.path.join(self.tmp, 'x.peaks'), 8000, 20, 'false'))
+        self.assertEqual(result[:2], (1, None))
+
+    def test_job_runs_in_spawned_worker_pool(self):
+        """İşçi giriş noktası Django kurulmamış spawn sürecinde de içe aktarılabilmeli"""
+        fake_ffmpeg = os.path.join(self.tmp, 'ffmpeg')
+        with open(fake_ffmpeg, 'w') as f:
+            f.write('#!/bin/sh\nexec cat "$5"\n')
+        os.chmod(fake_ffmpeg, 0o755)
+        audio_path = os.path.join(self.tmp, 'call.mp3')
+        np.zeros(8000, dtype='<i2').tofile(audio_path)
+        sidecar_path = audio_path + waveform.SIDECAR_SUFFIX
+
+        with audio_analysis.create_executor(1) as executor:
+            result = executor.submit(waveform.run_job, (7, audio_path, sidecar_path, 8000, 20, fake_ffmpeg)).result()
+        self.assertEqual(result, (7, 1.0, None))
+        self.assertTrue(os.path.exists(sidecar_path))
+
+
+class ScoringTests(CoreTestCase):
+    def test_compute_total_score_uses_scored_criteria_weights(self):
+        weights = {1: 10, 2: 30, 3: 60}
+        self.assertEqual(scoring.compute_total_score({'1': 100, '2': 50}, weights), Decimal('62.50'))
+        self.assertEqual(scoring.compute_total_score({'1': 70, '9': 10}, weights), Decimal('70.00'))
+        self.assertEqual(scoring.compute_total_score({}, weights), Decimal('0.00'))
+
+    def test_bulk_recompute_matches_single_computation(self):
+        """Vektörel toplu hesaplama tekil hesaplamayla aynı sonucu vermeli"""
+        second = EvaluationCriteria.objects.create(name='İkinci', description='', weight=30)
+        criterion_id = str(self.criteria.id)
+        calls = [Call.objects.create(agent=self.agent_user, call_date=timezone.now(), phone_number='1',
+                                     duration=datetime.timedelta(minutes=1), queue='Support')
+                 for _ in range(7)]
+        for index, call in enumerate(calls):
+            scores = {criterion_id: 60 + index * 5}
+            if index % 2:
+                scores[str(second.id)] = 91 - index
+            Evaluation.objects.create(call=call, evaluator=self.expert_user, scores=scores,
+                                      total_score=0, comments='')
+
+        EvaluationCriteria.objects.filter(pk=second.pk).update(weight=45)
+        # Sayaçlar yeniden kurulmamalı (canlı sinyal artışlarıyla yarışırdı); sadece fark eklenir
+        with mock.patch.object(stats, 'rebuild_counters') as rebuild:
+            updated = scoring.recompute_total_scores(batch_size=3)
+        rebuild.assert_not_called()
+        self.assertEqual(updated, 7)
+
+        # update() sinyal göndermez; önbellek yerine veritabanındaki ağırlıklarla karşılaştır
+        weights = dict(EvaluationCriteria.objects.values_list('id', 'weight'))
+        for evaluation in Evaluation.objects.all():
+            self.assertEqual(evaluation.total_score, scoring.compute_total_score(evaluation.scores, weights))
+        # Sayaçlar toplu güncellemeden sonra da tutarlı olmalı
+        total = sum(e.total_score for e in Evaluation.objects.all())
+        self.assertEqual(stats.read_counters()[stats.EVALUATION_SCORE_SUM], total)
+        self.assertEqual(scoring.recompute_total_scores(), 0)
+
+    def test_weight_change_schedules_recompute(self):
+        with mock.patch.object(scoring, 'schedule_recompute') as schedule:
+            self.criteria.description = 'Yalnızca açıklama'
+            self.criteria.save()
+            schedule.assert_not_called()
+            self.criteria.weight = 70
+            self.criteria.save()
+            schedule.assert_called_once()
+
+
+class CriterionScoreTableTests(CoreTestCase):
+    def create_evaluation(self, scores, agent=None):
+        call = Call.objects.create(agent=agent or self.agent_user, call_date=timezone.now(), phone_number='1',
+                                   duration=datetime.timedelta(minutes=1), queue='Support')
+        return Evaluation.objects.create(call=call, evaluator=self.expert_user, scores=scores,
+                                         total_score=0, comments='')
+
+    def test_table_follows_scores_on_every_write(self):
+        second = EvaluationCriteria.objects.create(name='Problem Anlama', description='', weight=20)
+        evaluation = self.create_evaluation({str(self.criteria.id): 70, str(second.id): 90, '999': 10})
+        self.assertEqual(
+            set(evaluation.criterion_scores.values_list('criterion_id', 'score')),
+            {(self.criteria.id, Decimal('70')), (second.id, Decimal('90'))},
+        )
+        evaluation.scores = {str(second.id): 40}
+        evaluation.save()
+        self.assertEqual(list(evaluation.criterion_scores.values_list('criterion_id', 'score')),
+                         [(second.id, Decimal('40'))])
+
+    def test_backfill_and_single_query_aggregates(self):
+        other_agent = User.objects.create_user(username='other', password='x', employee_id='2000', team='B')
+        self.create_evaluation({str(self.criteria.id): 60})
+        self.create_evaluation({str(self.criteria.id): 95}, agent=other_agent)
+        EvaluationScore.objects.all().delete()
+        call_command('backfill_evaluation_scores', batch_size=2, stdout=StringIO())
+        self.assertEqual(EvaluationScore.objects.count(), 3)
+
+        team_scores = EvaluationScore.objects.filter(evaluation__call__agent__team='Test Team')
+        with self.assertNumQueries(1):
+            averages = criterion_scores.criterion_averages(team_scores)
+        self.assertEqual(averages[0]['count'], 2)
+        self.assertEqual(averages[0]['average'], 70)
+
+        distribution = criterion_scores.criterion_distribution(self.criteria.id)
+        self.assertEqual([(row['bucket'], row['count']) for row in distribution], [(60, 1), (80, 1), (90, 1)])
+        trend = criterion_scores.criterion_trend(self.criteria.id)
+        self.assertEqual(trend[0]['count'], 3)
+
+    def test_aggregates_use_indexes(self):
+        self.assertEqual(query_plans.full_table_scans(
+            EvaluationScore.objects.filter(criterion_id=self.criteria.id).values('criterion_id')
+            .annotate(average=Avg('score'))), [])
+
+class PerformanceRollupTests(CoreTestCase):
+    def snapshot(self):
+        return sorted(PerformanceRollup.objects.values_list(
+            'grain', 'dimension', 'key', 'period_start', 'call_count', 'duration_seconds',
+            'evaluation_count', 'score_sum'))
+
+    def test_full_refresh(self):
+        call_command('refresh_rollups', stdout=StringIO())
+        rollup = PerformanceRollup.objects.get(grain='day', dimension='agent', key=str(self.agent_user.id))
+        self.assertEqual(rollup.period_start, timezone.localdate(self.call.call_date))
+        self.assertEqual((rollup.call_count, rollup.duration_seconds, rollup.evaluation_count),
+                         (1, 330, 1))
+        self.assertEqual(rollup.average_score, Decimal('80.00'))
+        self.assertTrue(PerformanceRollup.objects.filter(grain='week', dimension='team', key='Test Team').exists())
+        self.assertTrue(PerformanceRollup.objects.filter(grain='day', dimension='queue', key='Support').exists())
+
+    def test_incremental_refresh_matches_full_rebuild(self):
+        rollups.refresh_rollups()
+        Call.objects.create(agent=self.agent_user, call_date=timezone.now() - datetime.timedelta(days=10),
+                            phone_number='1', duration=datetime.timedelta(minutes=2), queue='Sales')
+        self.evaluation.total_score = 60
+        self.evaluation.save()
+
+        self.assertEqual(rollups.refresh_rollups(), 2)
+        incremental = self.snapshot()
+        rollups.refresh_rollups(full=True)
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_moved_call_refreshes_previous_day(self):
+        rollups.refresh_rollups()
+        old_day = timezone.localdate(self.call.call_date)
+        call = Call.objects.get(pk=self.call.pk)
+        call.call_date -= datetime.timedelta(days=3)
+        call.save()
+        self.assertEqual(list(RollupInvalidation.objects.values_list('day', flat=True)), [old_day])
+
+        rollups.refresh_rollups()
+        incremental = self.snapshot()
+        self.assertFalse(PerformanceRollup.objects.filter(grain='day', period_start=old_day).exists())
+        rollups.refresh_rollups(full=True)
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_changed_days_use_updated_at_indexes(self):
+        for queryset in rollups.changed_day_querysets(timezone.now()):
+            with self.subTest(model=queryset.model.__name__):
+                self.assertEqual(query_plans.full_table_scans(queryset), [])
+
+    def test_deleted_rows_are_removed_from_rollups(self):
+        rollups.refresh_rollups()
+        self.call.delete()
+        self.assertEqual(RollupInvalidation.objects.count(), 1)
+        rollups.refresh_rollups()
+        self.assertFalse(PerformanceRollup.objects.exists())
+        self.assertFalse(RollupInvalidation.objects.exists())
+
+class ReferenceDataCacheTests(CoreTestCase):
+    @override_settings(REFERENCE_DATA_CHECK_INTERVAL=0)
+    def test_reloads_only_when_version_changes(self):
+        self.assertEqual([c['name'] for c in reference_data.get_criteria()], ['Test Criterion'])
+        with self.assertNumQueries(0):
+            self.assertEqual(scoring.criteria_weights(), {self.criteria.id: 50})
+
+        # Başka bir süreçteki değişiklik: veritabanı güncellenir ve damga yenilenir
+        EvaluationCriteria.objects.filter(pk=self.criteria.pk).update(weight=20)
+        with self.assertNumQueries(0):
+            self.assertEqual(scoring.criteria_weights(), {self.criteria.id: 50})
+        cache.set(reference_data.criteria.version_key, 'other-process')
+        with self.assertNumQueries(1):
+            self.assertEqual(scoring.criteria_weights(), {self.criteria.id: 20})
+
+    @override_settings(REFERENCE_DATA_CHECK_INTERVAL=0, REFERENCE_DATA_MAX_AGE=60)
+    def test_reloads_after_max_age_without_version_change(self):
+        """Damga yenilemesi görünmese de (süreç içi önbellek) veri en fazla max age kadar eski kalır"""
+        reference_data.get_criteria()
+        EvaluationCriteria.objects.filter(pk=self.criteria.pk).update(weight=20)
+        loaded_at = time.monotonic()
+        with mock.patch.object(reference_data.time, 'monotonic', return_value=loaded_at + 30):
+            self.assertEqual(scoring.criteria_weights(), {self.criteria.id: 50})
+        with mock.patch.object(reference_data.time, 'monotonic', return_value=loaded_at + 61):
+            self.assertEqual(scoring.criteria_weights(), {self.criteria.id: 20})
+
+    def test_check_interval_skips_shared_cache(self):
+        reference_data.get_criteria()
+        with mock.patch.object(reference_data.cache, 'get') as cache_get:
+            reference_data.get_criteria()
+        cache_get.assert_not_called()
+
+class CallClaimQueueTests(CoreTestCase):
+    def test_abandoned_claims_are_reclaimed_and_released(self):
+        self.evaluation.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(claims.claim_next_call(self.expert_user.id).pk, self.call.pk)
+        self.assertIsNone(claims.claim_next_call(self.admin_user.id))
+
+        Call.objects.filter(pk=self.call.pk).update(
+            claimed_at=timezone.now() - settings.CALL_CLAIM_TIMEOUT - datetime.timedelta(minutes=1))
+        # Terk edilmiş üstlenme başka bir uzmana verilebilir
+        self.assertEqual(claims.claim_next_call(self.admin_user.id).claimed_by_id, self.admin_user.id)
+        self.assertEqual(stats.read_counters()[stats.call_status_counter('in_progress')], 1)
+
+        Call.objects.filter(pk=self.call.pk).update(
+            claimed_at=timezone.now() - settings.CALL_CLAIM_TIMEOUT - datetime.timedelta(minutes=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('release_stale_claims', stdout=StringIO())
+        self.call.refresh_from_db()
+        self.assertEqual((self.call.status, self.call.claimed_by_id), ('pending', None))
+        counters = stats.read_counters()
+        self.assertEqual(counters[stats.call_status_counter('pending')], 1)
+        self.assertEqual(counters[stats.call_status_counter('in_progress')], 0)
+
+    def test_counters_are_updated_after_commit(self):
+        """Sayaç satırları üstlenme işleminin içinde güncellenmemeli"""
+        self.evaluation.delete()
+        before = stats.read_counters()
+        with self.captureOnCommitCallbacks() as callbacks:
+            claims.claim_next_call(self.expert_user.id)
+        self.assertEqual(stats.read_counters(), before)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(stats.read_counters()[stats.call_status_counter('in_progress')], 1)
+
+    def test_evaluated_calls_are_not_claimable(self):
+        """Değerlendirilmiş çağrı ne bekleyen ne de süresi dolmuş üstlenme olarak verilmeli"""
+        self.assertIsNone(claims.claim_next_call(self.expert_user.id))
+        Call.objects.filter(pk=self.call.pk).update(
+            status=Call.CallStatus.IN_PROGRESS, claimed_by=self.admin_user,
+            claimed_at=timezone.now() - settings.CALL_CLAIM_TIMEOUT - datetime.timedelta(minutes=1))
+        self.assertIsNone(claims.claim_next_call(self.expert_user.id))
+
+        # Seçim değerlendirme kaydedilmeden önce yapılmış olsa bile güncelleme reddedilmeli
+        for status in (Call.CallStatus.PENDING, Call.CallStatus.IN_PROGRESS):
+            Call.objects.filter(pk=self.call.pk).update(status=status)
+            with self.subTest(status=status), \
+                    mock.patch.object(claims, 'claimable_calls', lambda **_: Call.objects.filter(pk=self.call.pk)):
+                self.assertIsNone(claims.claim_next_call(self.expert_user.id))
+                self.assertEqual(Call.objects.get(pk=self.call.pk).claimed_by_id, self.admin_user.id)
+
+
+class EvaluationSearchTests(QueryPlanAssertionsMixin, CoreTestCase):
+
+    def test_turkish_normalization(self):
+        self.assertEqual(search.normalize('İSTANBUL ILIK Müşteri, şikâyet!'), 'istanbul ilik musteri sikayet')
+        self.assertEqual(search.search_terms('Çağrı çağrı  ÇAĞRI'), ['cagri'])
+
+    def test_index_follows_writes(self):
+        self.evaluation.comments = 'Müşteriye ILIK davrandı'
+        self.evaluation.save()
+        matches = lambda query: list(search.filter_evaluations(Evaluation.objects.all(), query))
+        self.assertEqual(matches('müşteri ılık'), [self.evaluation])
+        self.assertEqual(matches('MUSTERIYE'), [self.evaluation])
+        self.assertEqual(matches('good'), [])
+
+        # update() sinyal göndermez; backfill arama metnini ve indeksi eşitler
+        Evaluation.objects.filter(pk=self.evaluation.pk).update(comments='Bekletme süresi uzun')
+        self.assertEqual(matches('bekletme'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(matches('bekletme sure'), [self.evaluation])
+
+        self.evaluation.delete()
+        self.assertEqual(matches('bekletme'), [])
+
+    def test_search_uses_index(self):
+        queryset = search.filter_evaluations(Evaluation.objects.order_by('-created_at', '-id'), 'müşteri')
+        self.assertNoFullTableScan(queryset[:20])
+
+
+class PhoneNormalizationTests(CoreTestCase):
+    def test_normalize(self):
+        for value in ('+90 555 111 22 33', '0555 111 22 33', '(555) 111-2233', '905551112233', '0090 5551112233'):
+            with self.subTest(value=value):
+                self.assertEqual(phone.normalize(value), '+905551112233')
+        self.assertEqual(phone.normalize('+1 415 555 0100'), '+14155550100')
+        self.assertEqual(phone.normalize('12345'), '')
+        self.assertEqual(phone.normalize_prefix('0555'), '+90555')
+        self.assertEqual(phone.prefix_range('+90559'), ('+90559', '+9056'))
+        self.assertEqual(phone.prefix_range('+99'), ('+99', None))
+
+    def test_populated_on_write_and_backfilled(self):
+        self.assertEqual(self.call.phone_e164, '+905551112233')
+        self.call.phone_number = '0532 000 00 00'
+        self.call.save()
+        self.assertEqual(Call.objects.get(pk=self.call.pk).phone_e164, '+905320000000')
+
+        Call.objects.filter(pk=self.call.pk).update(phone_number='+90 (542) 000 00 00')
+        call_command('backfill_phone_numbers', stdout=StringIO())
+        self.assertEqual(Call.objects.get(pk=self.call.pk).phone_e164, '+905420000000')
+
+
+class SyntheticDataTests(CoreTestCase):
+    def generate(self, **options):
+        return synthetic.generate(calls=300, agents=6, teams=2, experts=2, admins=1, days=30, chunk_size=120,
+                                  batch_size=50, **options)
+
+    def test_generates_consistent_data(self):
+        summary = self.generate(seed=7)
+        calls = Call.objects.filter(agent__username__startswith='synthetic_')
+        self.assertEqual(summary['calls'], 300)
+        self.assertEqual(calls.count(), 300)
+        self.assertEqual(User.objects.filter(username__startswith='synthetic_agent_').count(), 6)
+        self.assertEqual(User.objects.filter(username__startswith='synthetic_admin_', role='admin').count(), 1)
+        self.assertEqual((summary['agents'], summary['experts'], summary['admins']), (6, 2, 1))
+        self.assertEqual(set(calls.values_list('agent__team', flat=True)), {'Takım 001', 'Takım 002'})
+
+        criteria = {criterion.id: criterion.weight for criterion in EvaluationCriteria.objects.all()}
+        evaluations = Evaluation.objects.filter(call__in=calls)
+        self.assertEqual(evaluations.count(), summary['evaluations'])
+        self.assertEqual(calls.filter(status=Call.CallStatus.COMPLETED).count(), summary['evaluations'])
+        for evaluation in evaluations[:20]:
+            self.assertEqual(set(evaluation.scores), {str(criterion_id) for criterion_id in criteria})
+            self.assertEqual(evaluation.total_score, scoring.compute_total_score(evaluation.scores, criteria))
+            self.assertEqual(evaluation.search_text,
+                             search.document(evaluation.comments, evaluation.improvement_areas))
+            self.assertEqual(evaluation.criterion_scores.count(), len(criteria))
+        for call in calls[:20]:
+            self.assertEqual(call.phone_e164, phone.normalize(call.phone_number))
+
+        # Sinyaller çalışmasa da sayaçlar ve arama indeksi güncel
+        self.assertEqual(stats.read_counters()[stats.CALLS_TOTAL], Call.objects.count())
+        self.assertTrue(search.filter_evaluations(evaluations, evaluations[0].comments.split()[0]).exists())
+
+    def test_deterministic(self):
+        self.generate(seed=3)
+        first = list(Call.objects.filter(agent__username__startswith='synthetic_')
+                     .order_by('id').values_list('call_date', 'phone_number', 'queue', 'duration'))
+        Call.objects.filter(agent__username__startswith='synthetic_').delete()
+        self.generate(seed=3)
+        second = list(Call.objects.filter(agent__username__startswith='synthetic_')
+                      .order_by('id').values_list('call_date', 'phone_number', 'queue', 'duration'))
+        self.assertEqual(first, second)
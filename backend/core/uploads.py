@@ -0,0 +1,153 @@
+"""
+Parça parça ses kaydı yükleme.
+
+Parçalar istek gövdesinden sabit boyutlu bloklar halinde okunup doğrudan
+`call_records/%Y/%m/%d/` altındaki geçici `.part` dosyasına, kendi
+ofsetlerine yazılır; dosya hiçbir zaman belleğe alınmaz. Tüm parçalar
+geldiğinde SHA-256 doğrulanır, dosya son adına taşınır ve çağrıya bağlanır.
+Tamamlama oturum satırı kilitliyken yapılır: eşzamanlı tamamlama istekleri ve
+parça kayıtları sırayla işlenir. Çağrının önceki kaydı (başka çağrıda
+kullanılmıyorsa) commit sonrasında silinir.
+"""
+import hashlib
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from backend.core import waveform
+from backend.core.models import Call, UploadSession
+
+# İstek gövdesinden ve dosyadan okuma blok boyutu
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """Yükleme oturumu ile ilgili istemci hatası"""
+
+
+def build_file_name(call):
+    """Çağrı kaydı için `call_records/%Y/%m/%d/` altında benzersiz bir dosya adı üret"""
+    directory = timezone.now().strftime(Call._meta.get_field('mp3_file').upload_to)
+    return os.path.join(directory, f'{call.pk}-{uuid.uuid4().hex}.mp3')
+
+
+def start_session(call, user_id, total_size, checksum, chunk_size=None):
+    """
+    Yeni bir yükleme oturumu aç ve boş `.part` dosyasını oluştur
+    """
+    chunk_size = chunk_size or settings.CALL_UPLOAD_CHUNK_SIZE
+    if not 0 < chunk_size <= settings.CALL_UPLOAD_MAX_CHUNK_SIZE:
+        raise UploadError(f'Parça boyutu en fazla {settings.CALL_UPLOAD_MAX_CHUNK_SIZE} bayt olabilir.')
+    if not 0 < total_size <= settings.CALL_UPLOAD_MAX_FILE_SIZE:
+        raise UploadError(f'Dosya boyutu en fazla {settings.CALL_UPLOAD_MAX_FILE_SIZE} bayt olabilir.')
+
+    session = UploadSession(
+        call=call,
+        created_by_id=user_id,
+        file_name=build_file_name(call),
+        total_size=total_size,
+        chunk_size=chunk_size,
+        checksum=checksum.lower(),
+    )
+    path = default_storage.path(session.partial_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    session.save()
+    return session
+
+
+def write_chunk(session, index, stream, length):
+    """
+    `stream`den `length` bayt okuyup parçayı dosyadaki ofsetine yaz
+    """
+    if session.status != UploadSession.SessionStatus.ACTIVE:
+        raise UploadError('Yükleme oturumu tamamlanmış.')
+    if not 0 <= index < session.chunk_count:
+        raise UploadError('Geçersiz parça sırası.')
+    expected = session.expected_chunk_length(index)
+    if length != expected:
+        raise UploadError(f'Parça boyutu {expected} bayt olmalıdır.')
+
+    written = 0
+    try:
+        with open(default_storage.path(session.partial_name), 'r+b') as destination:
+            destination.seek(index * session.chunk_size)
+            while written < expected:
+                block = stream.read(min(COPY_BLOCK_SIZE, expected - written))
+                if not block:
+                    break
+                destination.write(block)
+                written += len(block)
+    except FileNotFoundError:
+        # Oturum bu arada tamamlandı ve dosya taşındı
+        raise UploadError('Yükleme oturumu tamamlanmış.')
+    if written != expected:
+        raise UploadError('Parça eksik alındı, tekrar gönderin.')
+
+    # Aynı oturuma paralel gelen parçalar listeyi ezmesin diye satırı kilitle
+    with transaction.atomic():
+        locked = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if locked.status != UploadSession.SessionStatus.ACTIVE:
+            raise UploadError('Yükleme oturumu tamamlanmış.')
+        if index not in locked.received_chunks:
+            locked.received_chunks = sorted(locked.received_chunks + [index])
+            locked.save(update_fields=['received_chunks', 'updated_at'])
+    return locked
+
+
+def file_checksum(path):
+    """Dosyanın SHA-256 özetini bloklar halinde okuyarak hesapla"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(COPY_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def remove_replaced_recording(call_id, name):
+    """Çağrının yerine yenisi konan kaydını (ve dalga formunu), başka çağrı kullanmıyorsa sil"""
+    if name and not Call.objects.filter(mp3_file=name).exclude(pk=call_id).exists():
+        default_storage.delete(name)
+        default_storage.delete(waveform.sidecar_name(name))
+
+
+def complete_session(session):
+    """
+    Tüm parçalar alındıysa özeti doğrula, dosyayı son adına taşı ve çağrıya bağla
+    """
+    checksum_failed = False
+    with transaction.atomic():
+        # Eşzamanlı tamamlama/parça istekleri oturum satırında sıraya girer
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if session.status == UploadSession.SessionStatus.COMPLETED:
+            return session
+        if session.missing_chunks:
+            raise UploadError('Eksik parçalar var.')
+
+        partial_path = default_storage.path(session.partial_name)
+        try:
+            checksum = file_checksum(partial_path)
+        except FileNotFoundError:
+            raise UploadError('Geçici yükleme dosyası bulunamadı, yeni bir oturum açın.')
+        if checksum != session.checksum:
+            # Bozuk veri tekrar kullanılmasın; istemci parçaları baştan göndermeli
+            session.received_chunks = []
+            session.save(update_fields=['received_chunks', 'updated_at'])
+            checksum_failed = True
+        else:
+            call = Call.objects.select_for_update().get(pk=session.call_id)
+            previous = call.mp3_file.name
+            os.replace(partial_path, default_storage.path(session.file_name))
+            call.mp3_file.name = session.file_name
+            call.save(update_fields=['mp3_file', 'updated_at'])
+            session.status = UploadSession.SessionStatus.COMPLETED
+            session.save(update_fields=['status', 'updated_at'])
+            if previous and previous != session.file_name:
+                transaction.on_commit(lambda: remove_replaced_recording(call.pk, previous))
+    if checksum_failed:
+        raise UploadError('SHA-256 doğrulaması başarısız.')
+    return session
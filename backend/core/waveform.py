@@ -0,0 +1,134 @@
+"""
+Ses kaydından dalga formu (peak) ve süre çıkarımı.
+
+Bu modül Django'ya bağımlı değildir; süreç havuzundaki işçilerde çalışır.
+MP3 dosyası ffmpeg ile mono 16-bit PCM'e açılıp akış halinde okunur, her
+blok NumPy ile vektörel olarak sabit aralıklı tepe değerlerine indirgenir.
+Sonuç, kaydın yanında küçük bir ikili dosyada (sidecar) saklanır:
+
+    başlık  : magic(4s) sürüm(B) örnekleme hızı(I) peak başına örnek(I) peak sayısı(Q)
+    gövde   : peak sayısı kadar uint8 (0-255, mutlak genlik)
+"""
+import os
+import struct
+import subprocess
+import tempfile
+
+import numpy as np
+
+SIDECAR_MAGIC = b'QMWF'
+SIDECAR_VERSION = 1
+SIDECAR_HEADER = struct.Struct('<4sBIIQ')
+SIDECAR_SUFFIX = '.peaks'
+
+DEFAULT_SAMPLE_RATE = 8000
+DEFAULT_PEAKS_PER_SECOND = 20
+# ffmpeg çıktısından tek seferde okunacak peak sayısı
+PEAKS_PER_READ = 4096
+
+
+class DecodeError(Exception):
+    """Ses dosyası açılamadı"""
+
+
+def sidecar_name(audio_name):
+    """Ses kaydının dalga formu dosyasının adı"""
+    return audio_name + SIDECAR_SUFFIX
+
+
+def compute_peaks(samples, samples_per_peak):
+    """
+    int16 örnek dizisini her `samples_per_peak` örnek için bir mutlak tepe
+    değerine (uint8) indirger. Son eksik blok da tek peak olarak sayılır.
+    """
+    if samples.size == 0:
+        return np.zeros(0, dtype=np.uint8)
+    # int16'da abs(-32768) taşar; int32 üzerinden hesapla
+    samples = np.abs(samples.astype(np.int32))
+    full = samples.size // samples_per_peak * samples_per_peak
+    peaks = samples[:full].reshape(-1, samples_per_peak).max(axis=1)
+    if full < samples.size:
+        peaks = np.append(peaks, samples[full:].max())
+    return (peaks * 255 // 32768).astype(np.uint8)
+
+
+def iter_pcm_blocks(path, sample_rate, block_samples, ffmpeg='ffmpeg'):
+    """
+    Dosyayı ffmpeg ile mono int16 PCM'e açıp `block_samples` örneklik bloklar üret
+    """
+    command = [ffmpeg, '-loglevel', 'error', '-nostdin', '-i', path,
+               '-f', 's16le', '-ac', '1', '-ar', str(sample_rate), '-']
+    # stderr boru değil geçici dosyaya yazılır: okunmayan boru dolarsa ffmpeg
+    # ve onu bekleyen işçi kilitlenir
+    errors = tempfile.TemporaryFile()
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors)
+    except OSError as exc:
+        errors.close()
+        raise DecodeError(f'ffmpeg çalıştırılamadı: {exc}')
+    try:
+        block_bytes = block_samples * 2
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            # Tek sayıda bayt gelirse son yarım örneği at
+            yield np.frombuffer(data[:len(data) // 2 * 2], dtype='<i2')
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+        errors.seek(0)
+        stderr = errors.read()
+        errors.close()
+        if returncode != 0:
+            raise DecodeError(stderr.decode(errors='replace').strip() or 'ffmpeg hatası')
+
+
+def write_sidecar(path, peaks, sample_rate, samples_per_peak):
+    """Peak dizisini başlıkla birlikte ikili dosyaya yaz"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as destination:
+        destination.write(SIDECAR_HEADER.pack(
+            SIDECAR_MAGIC, SIDECAR_VERSION, sample_rate, samples_per_peak, peaks.size))
+        destination.write(peaks.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_sidecar(path):
+    """Dalga formu dosyasını (örnekleme hızı, peak başına örnek, peak dizisi) olarak oku"""
+    with open(path, 'rb') as source:
+        magic, version, sample_rate, samples_per_peak, count = SIDECAR_HEADER.unpack(
+            source.read(SIDECAR_HEADER.size))
+        if magic != SIDECAR_MAGIC or version != SIDECAR_VERSION:
+            raise ValueError('Geçersiz dalga formu dosyası')
+        peaks = np.frombuffer(source.read(count), dtype=np.uint8)
+    return sample_rate, samples_per_peak, peaks
+
+
+def analyze_file(audio_path, sidecar_path, sample_rate=DEFAULT_SAMPLE_RATE,
+                 peaks_per_second=DEFAULT_PEAKS_PER_SECOND, ffmpeg='ffmpeg'):
+    """
+    Ses dosyasını açıp dalga formu dosyasını yaz ve gerçek süreyi saniye olarak döndür.
+    Bellek kullanımı dosya boyutundan bağımsızdır; sadece peak dizisi bellekte tutulur.
+    """
+    samples_per_peak = max(1, sample_rate // peaks_per_second)
+    chunks = []
+    total_samples = 0
+    for block in iter_pcm_blocks(audio_path, sample_rate, samples_per_peak * PEAKS_PER_READ, ffmpeg):
+        total_samples += block.size
+        chunks.append(compute_peaks(block, samples_per_peak))
+    peaks = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8)
+    write_sidecar(sidecar_path, peaks, sample_rate, samples_per_peak)
+    return total_samples / sample_rate
+
+
+def run_job(job):
+    """
+    Süreç havuzundaki işçide çalışır: (çağrı id, süre saniye veya None, hata mesajı) döndürür
+    """
+    call_id, audio_path, sidecar_path, sample_rate, peaks_per_second, ffmpeg = job
+    try:
+        duration = analyze_file(audio_path, sidecar_path, sample_rate, peaks_per_second, ffmpeg)
+    except (DecodeError, OSError) as exc:
+        return call_id, None, str(exc)
+    return call_id, duration, None
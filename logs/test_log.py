@@ -1,19 +1,39 @@
 """
 Çağrı Merkezi Kalite Yönetimi Sistemi - Test Log Modülü (Python)
 
-Bu modül, test işlemlerini kaydetmek için kullanılır.
+Bu modül, test işlemlerini ve backend olaylarını yapılandırılmış olarak kaydetmek için kullanılır.
 Backend uygulamasına entegre edilebilir.
+
+- Son MAX_LOGS kayıt bellekte sabit boyutlu bir halka tamponda (deque) tutulur.
+- Her kayıt qm_test_logs.ndjson dosyasına tek satırlık JSON olarak eklenir
+  (dosya LOG_MAX_BYTES boyutuna ulaşınca döndürülür, LOG_BACKUP_COUNT yedek saklanır).
+- Dosya ve konsol yazmaları çağıran thread'de değil, QueueHandler/QueueListener
+  ile arka plandaki dinleyici thread'inde yapılır; add_log sadece kuyruğa ekler.
+- flush_logs kuyruğa bir işaret kaydı ekler ve dinleyici ona ulaşana (önceki
+  kayıtlar yazılana) kadar bekler; dinleyici durdurulmaz.
 """
 
 import os
 import json
+import queue
+import atexit
 import logging
 import datetime
+import threading
+from collections import deque
 from enum import Enum
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-# Log dosyasının yolu
+# Log dosyalarının yolu
 LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs')
 LOG_FILE = os.path.join(LOG_DIR, 'qm_test_log.log')
+EVENT_LOG_FILE = os.path.join(LOG_DIR, 'qm_test_logs.ndjson')
+# Eski sürümün tüm listeyi yeniden yazdığı dosya; sadece ilk yüklemede okunur
+LEGACY_LOG_FILE = os.path.join(LOG_DIR, 'qm_test_logs.json')
+
+# Dosya döndürme ayarları
+LOG_MAX_BYTES = int(os.getenv('QM_LOG_MAX_BYTES', str(10 * 1024 * 1024)))  # 10MB
+LOG_BACKUP_COUNT = int(os.getenv('QM_LOG_BACKUP_COUNT', '5'))
 
 # Log seviyeleri
 class LogLevel(Enum):
@@ -23,18 +43,83 @@ class LogLevel(Enum):
     SUCCESS = "SUCCESS"
     DEBUG = "DEBUG"
 
+# SUCCESS için INFO ile WARNING arasında özel bir logging seviyesi
+SUCCESS = 25
+logging.addLevelName(SUCCESS, LogLevel.SUCCESS.value)
+
+LOGGING_LEVELS = {
+    LogLevel.INFO: logging.INFO,
+    LogLevel.WARNING: logging.WARNING,
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.SUCCESS: SUCCESS,
+    LogLevel.DEBUG: logging.DEBUG,
+}
+
+
+class EventFormatter(logging.Formatter):
+    """add_log kayıtlarını tek satırlık JSON (NDJSON) olarak biçimlendirir"""
+
+    def format(self, record):
+        entry = getattr(record, 'entry', None)
+        if entry is None:
+            entry = {
+                'timestamp': datetime.datetime.fromtimestamp(record.created).isoformat(),
+                'level': record.levelname,
+                'message': record.getMessage(),
+                'data': None,
+            }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class FlushingQueueListener(QueueListener):
+    """
+    İşaret kayıtlarını (flush_event niteliği olan) yazmak yerine işleyen dinleyici:
+    varsa işaretin işlemini çalıştırır, handler'ları diske iter ve bekleyeni uyandırır.
+    Kuyruk sırayla işlendiği için işaretten önceki tüm kayıtlar yazılmış olur.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.running = False
+
+    def start(self):
+        super().start()
+        self.running = True
+
+    def stop(self):
+        self.running = False
+        super().stop()
+
+    def handle(self, record):
+        flush_event = getattr(record, 'flush_event', None)
+        if flush_event is None:
+            super().handle(record)
+            return
+        try:
+            if record.flush_action:
+                record.flush_action()
+            for handler in self.handlers:
+                handler.flush()
+        except Exception as exc:
+            record.flush_error = exc
+        finally:
+            flush_event.set()
+
+
 # Logging yapılandırması
 if not os.path.exists(LOG_DIR):
     os.makedirs(LOG_DIR)
 
-# Logger yapılandırması
-logger = logging.getLogger('qm_test_logger')
-logger.setLevel(logging.DEBUG)
-
-# Dosya handler
-file_handler = logging.FileHandler(LOG_FILE)
+# Dosya handler (metin)
+file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
 file_handler.setLevel(logging.DEBUG)
 
+# Olay handler (NDJSON, döndürmeli)
+event_handler = RotatingFileHandler(EVENT_LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                    encoding='utf-8')
+event_handler.setLevel(logging.DEBUG)
+event_handler.setFormatter(EventFormatter())
+
 # Konsol handler
 console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
@@ -44,99 +129,136 @@ formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
 file_handler.setFormatter(formatter)
 console_handler.setFormatter(formatter)
 
-# Handler'ları ekle
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+# Logger yapılandırması: logger sadece kuyruğa yazar, handler'lar dinleyici thread'inde çalışır
+log_queue = queue.SimpleQueue()
+logger = logging.getLogger('qm_test_logger')
+logger.setLevel(logging.DEBUG)
+logger.propagate = False
+logger.addHandler(QueueHandler(log_queue))
 
-# Log kayıtlarını tutacak liste
-logs = []
+listener = FlushingQueueListener(log_queue, file_handler, event_handler, console_handler,
+                                 respect_handler_level=True)
+_listener_lock = threading.Lock()
 
 # Maksimum log sayısı
 MAX_LOGS = 1000
 
+# Son MAX_LOGS log kaydını tutan halka tampon (en eskisi otomatik düşer)
+logs = deque(maxlen=MAX_LOGS)
+_logs_lock = threading.Lock()
+
 def add_log(message, level=LogLevel.INFO, data=None):
     """
     Yeni bir log kaydı ekler
-    
+
     Args:
         message (str): Log mesajı
         level (LogLevel): Log seviyesi
         data (dict, optional): İlgili veri
-    
+
     Returns:
         dict: Eklenen log kaydı
     """
     timestamp = datetime.datetime.now().isoformat()
-    
+
     log_entry = {
         'timestamp': timestamp,
         'level': level.value,
         'message': message,
-        'data': json.dumps(data) if data else None
+        'data': json.dumps(data, ensure_ascii=False, default=str) if data else None
     }
-    
-    logs.append(log_entry)
-    
-    # Maksimum log sayısını aşarsa en eski logu sil
-    if len(logs) > MAX_LOGS:
-        logs.pop(0)
-    
-    # Log seviyesine göre kaydet
-    if level == LogLevel.INFO:
-        logger.info(message)
-    elif level == LogLevel.WARNING:
-        logger.warning(message)
-    elif level == LogLevel.ERROR:
-        logger.error(message)
-    elif level == LogLevel.SUCCESS:
-        logger.info(f"[SUCCESS] {message}")
-    elif level == LogLevel.DEBUG:
-        logger.debug(message)
-    
-    # Veri varsa ekstra log
-    if data:
-        logger.debug(f"Data: {json.dumps(data)}")
-    
-    # Log dosyasına kaydet
-    save_logs_to_file()
-    
+
+    with _logs_lock:
+        logs.append(log_entry)
+
+    # Dosya/konsol yazması dinleyici thread'inde yapılır
+    logger.log(LOGGING_LEVELS[level], message, extra={'entry': log_entry})
+
     return log_entry
 
+def _flush_queue(action=None):
+    """
+    Kuyruğa işaret kaydı ekle ve dinleyici thread'i ona ulaşana kadar bekle.
+    `action` dinleyici thread'inde, önceki kayıtlar yazıldıktan sonra çalışır.
+    """
+    with _listener_lock:
+        if not listener.running:
+            # Dinleyici durdurulmuşsa (çıkış) kuyruk zaten boşaltılmıştır
+            if action:
+                action()
+            return
+        record = logging.makeLogRecord({'msg': 'flush'})
+        record.flush_event = threading.Event()
+        record.flush_action = action
+        record.flush_error = None
+        log_queue.put_nowait(record)
+    record.flush_event.wait()
+    if record.flush_error is not None:
+        raise record.flush_error
+
+def _stop_listener():
+    with _listener_lock:
+        if listener.running:
+            listener.stop()
+
+def flush_logs():
+    """Kuyrukta bekleyen kayıtların dosyalara yazılmasını bekler"""
+    _flush_queue()
+
 def save_logs_to_file():
-    """Log kayıtlarını JSON dosyasına kaydeder"""
-    try:
-        with open(os.path.join(LOG_DIR, 'qm_test_logs.json'), 'w') as f:
-            json.dump(logs, f, indent=2)
-    except Exception as e:
-        logger.error(f"Loglar dosyaya kaydedilemedi: {str(e)}")
+    """Geriye dönük uyumluluk: kayıtlar zaten eklenirken dosyaya yazılır; sadece kuyruğu boşaltır"""
+    flush_logs()
+
+def _read_tail(path, count):
+    """NDJSON dosyasının son `count` kaydı (bozuk satırlar atlanır)"""
+    entries = deque(maxlen=count)
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
 
 def load_logs_from_file():
-    """Log kayıtlarını JSON dosyasından yükler"""
-    global logs
+    """Son log kayıtlarını NDJSON dosyasından (yoksa eski JSON dosyasından) halka tampona yükler"""
     try:
-        log_file = os.path.join(LOG_DIR, 'qm_test_logs.json')
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                logs = json.load(f)
+        if os.path.exists(EVENT_LOG_FILE) and os.path.getsize(EVENT_LOG_FILE):
+            entries = _read_tail(EVENT_LOG_FILE, MAX_LOGS)
+        elif os.path.exists(LEGACY_LOG_FILE):
+            with open(LEGACY_LOG_FILE, 'r', encoding='utf-8') as f:
+                entries = json.load(f)[-MAX_LOGS:]
+        else:
+            return
+        with _logs_lock:
+            logs.clear()
+            logs.extend(entries)
     except Exception as e:
         logger.error(f"Loglar dosyadan yüklenemedi: {str(e)}")
 
 def get_logs():
     """Tüm log kayıtlarını döndürür"""
-    return logs.copy()
+    with _logs_lock:
+        return list(logs)
 
 def filter_logs_by_level(level):
     """Belirli bir seviyedeki log kayıtlarını filtreler"""
-    return [log for log in logs if log['level'] == level.value]
+    return [log for log in get_logs() if log['level'] == level.value]
+
+def _remove_event_files():
+    event_handler.close()
+    paths = [EVENT_LOG_FILE, LEGACY_LOG_FILE]
+    paths += [f'{EVENT_LOG_FILE}.{index}' for index in range(1, LOG_BACKUP_COUNT + 1)]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
 
 def clear_logs():
-    """Log kayıtlarını temizler"""
-    global logs
-    logs = []
+    """Log kayıtlarını ve olay dosyalarını temizler"""
+    with _logs_lock:
+        logs.clear()
     try:
-        log_file = os.path.join(LOG_DIR, 'qm_test_logs.json')
-        if os.path.exists(log_file):
-            os.remove(log_file)
+        _flush_queue(_remove_event_files)
     except Exception as e:
         logger.error(f"Log dosyası silinemedi: {str(e)}")
 
@@ -161,8 +283,11 @@ def log_debug(message, data=None):
     """Debug seviyesinde log"""
     return add_log(message, LogLevel.DEBUG, data)
 
-# Başlangıçta dosyadan logları yükle
+# Başlangıçta dosyadan logları yükle ve yazıcı thread'i başlat
 load_logs_from_file()
+listener.start()
+# Çıkışta kuyruktaki kayıtlar yazılsın
+atexit.register(_stop_listener)
 
 # Test
 if __name__ == "__main__":
@@ -171,6 +296,6 @@ if __name__ == "__main__":
     log_error("Bu bir hata mesajıdır", {"error_code": 404, "detail": "Sayfa bulunamadı"})
     log_success("İşlem başarıyla tamamlandı")
     log_debug("Debug bilgisi", {"memory_usage": "45MB", "cpu": "12%"})
-    
+
     print(f"Toplam {len(get_logs())} log kaydı bulunuyor")
-    print(f"Hata logları: {len(filter_logs_by_level(LogLevel.ERROR))}") 
\ No newline at end of file
+    print(f"Hata logları: {len(filter_logs_by_level(LogLevel.ERROR))}")
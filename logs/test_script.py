@@ -1,321 +1,577 @@
 """
-Çağrı Merkezi Kalite Yönetimi Sistemi - Test Senaryoları
+Çağrı Merkezi Kalite Yönetimi Sistemi - API Yük Testi
 
-Bu script, test senaryolarını çalıştırmak ve sonuçları loglamak için kullanılır.
+Geçici bir SQLite veritabanını test verisiyle doldurur, gerçek bir sunucu
+başlatır ve rol karışımlarına (agent/expert/admin) göre /api/token/ ile
+/api/v1/ uç noktalarına eşzamanlı HTTP istekleri gönderir. Rota bazında
+p50/p95/p99 gecikme, throughput ve istek başına sorgu sayısı JSON olarak
+raporlanır; --compare ile önceki bir çalıştırmanın raporuyla karşılaştırılır.
+
+Sorgu sayıları sunucunun X-DB-Query-Count başlığından okunur
+(API_QUERY_COUNT_HEADER=True; harness'in başlattığı sunucuda otomatik açılır).
+
+Kullanım:
+    python logs/test_script.py --duration 30 --concurrency 16 --output bench.json
+    python logs/test_script.py --compare bench.json --output bench-new.json
+    python logs/test_script.py --server-command "gunicorn backend.api.wsgi -w 4 -b {host}:{port}"
+    python logs/test_script.py --base-url http://127.0.0.1:8000   # çalışan sunucu, hazır kullanıcılar
 """
 
 import os
 import sys
-import time
 import json
+import time
 import random
-from datetime import datetime
+import shutil
+import socket
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import http.client
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from urllib.parse import urlencode, urlsplit
 
 # Log modülünü import et
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from logs.test_log import log_info, log_warning, log_error, log_success, log_debug, LogLevel, get_logs, clear_logs
-
-def test_login():
-    """Giriş yapma testi"""
-    log_info("Giriş testi başlatılıyor")
-    
-    # Test kullanıcıları
-    users = [
-        {"username": "admin", "password": "admin123", "role": "admin"},
-        {"username": "expert", "password": "expert123", "role": "expert"},
-        {"username": "agent", "password": "agent123", "role": "agent"}
-    ]
-    
-    for user in users:
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT_DIR, 'backend')
+sys.path.append(ROOT_DIR)
+from logs.test_log import log_info, log_warning, log_error, log_success, flush_logs
+
+# Tohumlanan kullanıcıların ortak şifresi (kullanıcı adları: loadtest_<rol>_<n>)
+LOADTEST_PASSWORD = 'loadtest-password'
+# Sunucunun sayfa boyutu (REST_FRAMEWORK['PAGE_SIZE'])
+API_PAGE_SIZE = 20
+ROLES = ('agent', 'expert', 'admin')
+COMMENT_WORDS = ['müşteri', 'şikayet', 'iade', 'bekletme', 'nazik', 'çözüm', 'fatura', 'kampanya', 'ılık', 'hızlı']
+
+# Rol bazında senaryo adımları: (ağırlık, VirtualUser metodu)
+ROLE_SCENARIOS = {
+    'agent': [
+        (1, 'login'), (4, 'calls_list'), (2, 'call_detail'), (1, 'call_audio'), (3, 'evaluations_list'),
+        (1, 'evaluation_detail'), (2, 'dashboard_stats'), (1, 'performance_report'),
+    ],
+    'expert': [
+        (1, 'login'), (3, 'calls_list'), (2, 'call_detail'), (1, 'calls_by_phone'), (1, 'call_audio'),
+        (3, 'evaluations_list'), (1, 'evaluations_search'), (1, 'evaluation_detail'), (2, 'criteria_list'),
+        (1, 'dashboard_stats'), (1, 'performance_report'), (1, 'claim_and_release'),
+    ],
+    'admin': [
+        (1, 'login'), (2, 'users_list'), (2, 'calls_list'), (1, 'calls_export'), (2, 'evaluations_list'),
+        (1, 'evaluations_export'), (1, 'criteria_list'), (1, 'dashboard_stats'), (1, 'performance_report'),
+    ],
+}
+
+
+def parse_mix(value):
+    """'agent=6,expert=3,admin=1' -> {'agent': 6, 'expert': 3, 'admin': 1}"""
+    mix = {}
+    for part in value.split(','):
+        role, _, weight = part.partition('=')
+        if role.strip() not in ROLES or not weight.strip().isdigit():
+            raise argparse.ArgumentTypeError(f'Geçersiz rol karışımı: {part}')
+        mix[role.strip()] = int(weight)
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    """En yakın sıra yöntemiyle yüzdelik (sıralı liste)"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+# --- Test verisi ------------------------------------------------------------
+
+def seed_database(args, media_root):
+    """
+    Sunucunun kullanacağı veritabanını migrate edip sentetik veri üreticisiyle
+    (core/synthetic.py) doldur; sayaçlar ve özetler üretici tarafından hesaplanır.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.api.settings')
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from backend.core import synthetic
+    from backend.core.models import User
+
+    call_command('migrate', verbosity=0)
+    rng = random.Random(args.seed)
+
+    audio_name = 'loadtest/sample.mp3'
+    os.makedirs(os.path.join(media_root, 'loadtest'), exist_ok=True)
+    with open(os.path.join(media_root, audio_name), 'wb') as f:
+        f.write(b'ID3' + bytes(rng.getrandbits(8) for _ in range(256 * 1024)))
+
+    summary = synthetic.generate(
+        calls=args.agents * args.calls_per_agent, agents=args.agents, teams=4, experts=args.experts,
+        admins=args.admins, seed=args.seed, days=90, evaluated_ratio=args.evaluated_ratio,
+        prefix='loadtest', password=LOADTEST_PASSWORD, mp3_file=audio_name,
+    )
+    # Sanal kullanıcıların giriş yapacağı her hesap gerçekten oluşturulmuş olmalı
+    for role, count in (('agent', args.agents), ('expert', args.experts), ('admin', args.admins)):
+        names = [f'loadtest_{role}_{index}' for index in range(count)]
+        found = User.objects.filter(username__in=names, role=role, is_active=True).count()
+        if found != count:
+            raise RuntimeError(f'{role} rolü için {count} kullanıcı bekleniyordu, {found} bulundu')
+    return {'users': summary['agents'] + summary['experts'] + summary['admins'], 'calls': summary['calls'],
+            'evaluations': summary['evaluations']}
+
+
+def start_server(args, env, log_path):
+    """Sunucuyu başlat ve port bağlantı kabul edene kadar bekle (sunucu çıktısı log_path'e yazılır)"""
+    host, port = '127.0.0.1', free_port()
+    if args.server_command:
+        command = args.server_command.format(host=host, port=port).split()
+    else:
+        command = [sys.executable, 'manage.py', 'runserver', f'{host}:{port}', '--noreload']
+    with open(log_path, 'wb') as server_log:
+        process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=server_log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            with open(log_path, encoding='utf-8', errors='replace') as server_log:
+                raise RuntimeError(f'Sunucu başlatılamadı:\n{server_log.read()}')
         try:
-            # Giriş simülasyonu
-            log_info(f"{user['username']} kullanıcısı ile giriş deneniyor", user)
-            time.sleep(0.5)  # Giriş işlemi simülasyonu
-            
-            # Başarılı giriş
-            if random.random() > 0.2:  # %80 başarı oranı
-                log_success(f"{user['username']} kullanıcısı başarıyla giriş yaptı", 
-                           {"role": user["role"], "login_time": datetime.now().isoformat()})
-            else:
-                # Başarısız giriş
-                log_error(f"{user['username']} kullanıcısı için giriş başarısız", 
-                         {"error": "Geçersiz kullanıcı adı veya şifre"})
-        except Exception as e:
-            log_error(f"Giriş sırasında beklenmeyen hata: {str(e)}")
-    
-    log_info("Giriş testleri tamamlandı")
-    return True
-
-def test_evaluation_form():
-    """Değerlendirme formu testi"""
-    log_info("Değerlendirme formu testi başlatılıyor")
-    
-    try:
-        # Form doldurma simülasyonu
-        log_info("Değerlendirme formu doldurulacak")
-        
-        # Temsilci seçimi
-        agent_id = random.randint(1, 5)
-        agent_name = f"Temsilci {agent_id}"
-        log_info(f"Temsilci seçildi: {agent_name}", {"agent_id": agent_id})
-        
-        # Çağrı bilgileri
-        call_data = {
-            "queue": random.choice(["Destek", "Satış", "Teknik Destek", "Şikayet"]),
-            "phone_number": f"555{random.randint(1000000, 9999999)}",
-            "call_date": datetime.now().isoformat(),
-            "duration": f"00:{random.randint(1, 15)}:{random.randint(10, 59)}"
+            with socket.create_connection((host, port), timeout=1):
+                return process, f'http://{host}:{port}'
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('Sunucu 60 saniye içinde hazır olmadı')
+
+
+# --- Yük üretimi ------------------------------------------------------------
+
+class VirtualUser:
+    """Tek bir HTTP bağlantısı (keep-alive) üzerinden rol senaryosunu oynatan sanal kullanıcı"""
+
+    def __init__(self, base_url, role, username, rng, samples):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.role = role
+        self.username = username
+        self.rng = rng
+        self.samples = samples
+        self.token = None
+        self.call_ids = []
+        self.call_pages = 1
+        self.evaluation_ids = []
+        self.phone_numbers = []
+        self.connection = None
+        self.recording = False
+
+    def request(self, route, method, path, params=None, body=None, headers=None):
+        """İsteği gönder, süresini ve sorgu sayısını kaydet; (status, gövde) döndür"""
+        if params:
+            path = f'{path}?{urlencode(params)}'
+        request_headers = {'Accept': 'application/json'}
+        if self.token:
+            request_headers['Authorization'] = f'Bearer {self.token}'
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            request_headers['Content-Type'] = 'application/json'
+        request_headers.update(headers or {})
+
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            started = time.perf_counter()
+            try:
+                self.connection.request(method, path, body=payload, headers=request_headers)
+                response = self.connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # Sunucu keep-alive bağlantısını kapattıysa yeni bağlantıyla bir kez tekrar dene
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    self.record(route, 'error', (time.perf_counter() - started) * 1000, 0, None, 0)
+                    return None, None
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            if response.getheader('Connection', '').lower() == 'close':
+                self.connection.close()
+                self.connection = None
+            queries = response.getheader('X-DB-Query-Count')
+            db_time = response.getheader('X-DB-Query-Time')
+            self.record(route, response.status, elapsed, int(queries) if queries else None,
+                        float(db_time) if db_time else None, len(data))
+            return response.status, data
+        return None, None
+
+    def record(self, route, status, elapsed, queries, db_time, size):
+        if self.recording:
+            self.samples.append((route, status, elapsed, queries, db_time, size))
+
+    def get_json(self, route, path, params=None):
+        status, data = self.request(route, 'GET', path, params)
+        if status == 200 and data:
+            return json.loads(data)
+        return None
+
+    def login(self):
+        status, data = self.request('POST /api/token/', 'POST', '/api/token/',
+                                    body={'username': self.username, 'password': LOADTEST_PASSWORD})
+        if status != 200:
+            raise RuntimeError(f'{self.username} giriş yapamadı (HTTP {status})')
+        self.token = json.loads(data)['access']
+
+    def remember(self, page, target):
+        if page and page.get('results'):
+            ids = [row['id'] for row in page['results']]
+            target[:] = ids
+            return page['results']
+        return []
+
+    # Senaryo adımları
+    def users_list(self):
+        self.get_json('GET /api/v1/users/', '/api/v1/users/')
+
+    def calls_list(self):
+        # Sadece var olan sayfalar istenir (sayfa sayısı önceki yanıtın count alanından)
+        params = None
+        if self.call_pages > 1 and self.rng.random() < 0.3:
+            params = {'page': self.rng.randint(1, min(self.call_pages, 5))}
+        page = self.get_json('GET /api/v1/calls/', '/api/v1/calls/', params)
+        if page and 'count' in page:
+            self.call_pages = max(1, -(-page['count'] // API_PAGE_SIZE))
+        rows = self.remember(page, self.call_ids)
+        self.phone_numbers = [row['phone_number'] for row in rows] or self.phone_numbers
+
+    def call_detail(self):
+        if self.call_ids:
+            self.get_json('GET /api/v1/calls/{id}/', f'/api/v1/calls/{self.rng.choice(self.call_ids)}/')
+        else:
+            self.calls_list()
+
+    def call_audio(self):
+        if self.call_ids:
+            self.request('GET /api/v1/calls/{id}/audio/', 'GET',
+                         f'/api/v1/calls/{self.rng.choice(self.call_ids)}/audio/',
+                         headers={'Range': 'bytes=0-65535'})
+        else:
+            self.calls_list()
+
+    def calls_by_phone(self):
+        if self.phone_numbers:
+            self.get_json('GET /api/v1/calls/?phone=', '/api/v1/calls/', {'phone': self.rng.choice(self.phone_numbers)})
+        self.get_json('GET /api/v1/calls/?phone_prefix=', '/api/v1/calls/',
+                      {'phone_prefix': f'05{self.rng.randint(30, 59)}'})
+
+    def calls_export(self):
+        self.request('GET /api/v1/calls/export/', 'GET', '/api/v1/calls/export/',
+                     {'start': (datetime.now() - timedelta(days=1)).date().isoformat()})
+
+    def evaluations_list(self):
+        self.remember(self.get_json('GET /api/v1/evaluations/', '/api/v1/evaluations/'), self.evaluation_ids)
+
+    def evaluations_search(self):
+        self.get_json('GET /api/v1/evaluations/?search=', '/api/v1/evaluations/',
+                      {'search': ' '.join(self.rng.sample(COMMENT_WORDS, 2))})
+
+    def evaluation_detail(self):
+        if self.evaluation_ids:
+            self.get_json('GET /api/v1/evaluations/{id}/',
+                          f'/api/v1/evaluations/{self.rng.choice(self.evaluation_ids)}/')
+        else:
+            self.evaluations_list()
+
+    def evaluations_export(self):
+        self.request('GET /api/v1/evaluations/export/', 'GET', '/api/v1/evaluations/export/',
+                     {'start': (datetime.now() - timedelta(days=1)).date().isoformat()})
+
+    def criteria_list(self):
+        self.get_json('GET /api/v1/criteria/', '/api/v1/criteria/')
+
+    def dashboard_stats(self):
+        self.get_json('GET /api/v1/dashboard/stats/', '/api/v1/dashboard/stats/')
+
+    def performance_report(self):
+        self.get_json('GET /api/v1/reports/performance/', '/api/v1/reports/performance/',
+                      {'grain': self.rng.choice(['day', 'week']), 'dimension': self.rng.choice(['agent', 'team'])})
+
+    def claim_and_release(self):
+        status, data = self.request('POST /api/v1/calls/claim/', 'POST', '/api/v1/calls/claim/', body={})
+        if status == 200:
+            call_id = json.loads(data)['id']
+            self.request('POST /api/v1/calls/{id}/release/', 'POST', f'/api/v1/calls/{call_id}/release/')
+
+    def run(self, warmup_until, stop_at):
+        steps = ROLE_SCENARIOS[self.role]
+        weights = [weight for weight, _ in steps]
+        names = [name for _, name in steps]
+        self.login()
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            self.recording = now >= warmup_until
+            getattr(self, self.rng.choices(names, weights)[0])()
+        if self.connection is not None:
+            self.connection.close()
+
+
+def assign_roles(mix, concurrency):
+    """Sanal kullanıcılara karışım ağırlıklarına göre rol dağıt (her önekte oranlar korunur)"""
+    total = sum(mix.values())
+    assigned = Counter()
+    roles = []
+    for index in range(concurrency):
+        role = max(mix, key=lambda r: mix[r] * (index + 1) / total - assigned[r])
+        assigned[role] += 1
+        roles.append(role)
+    return roles
+
+
+def check_logins(base_url, users):
+    """
+    Yükten önce sanal kullanıcıların hesaplarıyla giriş yapılabildiğini doğrula;
+    giriş yapamayan hesap varsa rolü ölçülmeden kalacağı için test durdurulur.
+    """
+    failures = defaultdict(list)
+    for role, username in sorted({(user.role, user.username) for user in users}):
+        probe = VirtualUser(base_url, role, username, random.Random(), [])
+        try:
+            probe.login()
+        except RuntimeError as exc:
+            failures[role].append(str(exc))
+        finally:
+            if probe.connection is not None:
+                probe.connection.close()
+    if failures:
+        for role, errors in failures.items():
+            log_error('Rol için giriş yapılamadı', {'role': role, 'errors': errors})
+        raise RuntimeError(f'Giriş yapılamayan roller: {", ".join(sorted(failures))}')
+
+
+def run_load(args, base_url):
+    roles = assign_roles(args.mix, args.concurrency)
+    counts = {'agent': args.agents, 'expert': args.experts, 'admin': args.admins}
+    per_role = defaultdict(int)
+    users, sample_lists = [], []
+    for index, role in enumerate(roles):
+        username = f'loadtest_{role}_{per_role[role] % max(counts[role], 1)}'
+        per_role[role] += 1
+        samples = []
+        sample_lists.append(samples)
+        users.append(VirtualUser(base_url, role, username, random.Random(args.seed * 1000 + index), samples))
+    check_logins(base_url, users)
+
+    started = time.monotonic()
+    warmup_until = started + args.warmup
+    stop_at = warmup_until + args.duration
+    errors = []
+
+    def worker(user):
+        try:
+            user.run(warmup_until, stop_at)
+        except Exception as exc:
+            errors.append(f'{user.username}: {exc}')
+
+    threads = [threading.Thread(target=worker, args=(user,), daemon=True) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for error in errors:
+        log_error('Sanal kullanıcı durdu', {'error': error})
+    measured = max(time.monotonic() - warmup_until, 1e-9)
+    return [sample for samples in sample_lists for sample in samples], measured, dict(Counter(roles))
+
+
+# --- Rapor ------------------------------------------------------------------
+
+def latency_summary(latencies):
+    latencies = sorted(latencies)
+    if not latencies:
+        return None
+    return {
+        'p50': round(percentile(latencies, 0.50), 2),
+        'p95': round(percentile(latencies, 0.95), 2),
+        'p99': round(percentile(latencies, 0.99), 2),
+        'mean': round(sum(latencies) / len(latencies), 2),
+        'max': round(latencies[-1], 2),
+    }
+
+
+def build_report(samples, duration):
+    by_route = defaultdict(list)
+    for sample in samples:
+        by_route[sample[0]].append(sample)
+
+    routes = {}
+    for route, rows in sorted(by_route.items()):
+        statuses = defaultdict(int)
+        for row in rows:
+            statuses[str(row[1])] += 1
+        queries = sorted(row[3] for row in rows if row[3] is not None)
+        db_times = [row[4] for row in rows if row[4] is not None]
+        routes[route] = {
+            'requests': len(rows),
+            'errors': sum(1 for row in rows if row[1] == 'error' or row[1] >= 400),
+            'status_codes': dict(statuses),
+            'throughput_rps': round(len(rows) / duration, 2),
+            'latency_ms': latency_summary([row[2] for row in rows]),
+            'queries_per_request': {
+                'mean': round(sum(queries) / len(queries), 2),
+                'p95': percentile(queries, 0.95),
+                'max': queries[-1],
+            } if queries else None,
+            'db_time_ms_mean': round(sum(db_times) / len(db_times), 2) if db_times else None,
+            'response_bytes_mean': round(sum(row[5] for row in rows) / len(rows)),
         }
-        log_info("Çağrı bilgileri girildi", call_data)
-        
-        # Kriterler ve puanlar
-        criteria = [
-            {"id": 1, "name": "Müşteri Selamlama", "weight": 10},
-            {"id": 2, "name": "Problem Anlama", "weight": 20},
-            {"id": 3, "name": "Çözüm Sunma", "weight": 30},
-            {"id": 4, "name": "İletişim Becerileri", "weight": 25},
-            {"id": 5, "name": "Kapanış", "weight": 15}
-        ]
-        
-        scores = {}
-        total_score = 0
-        total_weight = 0
-        
-        for criterion in criteria:
-            score = random.randint(60, 100)
-            scores[criterion["id"]] = score
-            total_score += score * criterion["weight"]
-            total_weight += criterion["weight"]
-            
-            log_debug(f"{criterion['name']} kriteri için puan: {score}", 
-                     {"criterion_id": criterion["id"], "score": score})
-        
-        # Toplam puan hesaplama
-        final_score = total_score / total_weight if total_weight > 0 else 0
-        log_info(f"Toplam puan hesaplandı: {final_score:.2f}")
-        
-        # Kritik hatalar
-        critical_errors = {}
-        if random.random() < 0.3:  # %30 ihtimalle kritik hata
-            error_type = random.choice([
-                "callTermination", "recordingError", "rudeBehavior", 
-                "noContactInfo", "lineLeftOpen", "kvkkViolation"
-            ])
-            critical_errors[error_type] = True
-            log_warning(f"Kritik hata tespit edildi: {error_type}")
-        
-        # Açıklama
-        comments = "Bu bir test değerlendirmesidir. " + \
-                  f"Temsilci {agent_name} genel olarak " + \
-                  ("iyi" if final_score >= 80 else "ortalama" if final_score >= 60 else "zayıf") + \
-                  " performans gösterdi."
-        
-        # Form gönderimi
-        evaluation_data = {
-            "agent_id": agent_id,
-            "agent_name": agent_name,
-            "call_data": call_data,
-            "scores": scores,
-            "critical_errors": critical_errors,
-            "comments": comments,
-            "total_score": final_score
+
+    queries = [sample[3] for sample in samples if sample[3] is not None]
+    return {
+        'summary': {
+            'requests': len(samples),
+            'errors': sum(route['errors'] for route in routes.values()),
+            'duration_s': round(duration, 2),
+            'throughput_rps': round(len(samples) / duration, 2),
+            'latency_ms': latency_summary([sample[2] for sample in samples]),
+            'queries_per_request_mean': round(sum(queries) / len(queries), 2) if queries else None,
+        },
+        'routes': routes,
+    }
+
+
+def compare_reports(baseline, current):
+    """Rota bazında p50/p95/p99 ve sorgu sayısı farkları (yeni - eski)"""
+    comparison = {}
+    for route, stats in current['routes'].items():
+        old = baseline.get('routes', {}).get(route)
+        if not old or not old.get('latency_ms') or not stats.get('latency_ms'):
+            continue
+        entry = {
+            key: round(stats['latency_ms'][key] - old['latency_ms'][key], 2) for key in ('p50', 'p95', 'p99')
         }
-        
-        log_info("Değerlendirme formu gönderiliyor", evaluation_data)
-        time.sleep(1)  # Form gönderimi simülasyonu
-        
-        # Başarılı kayıt
-        if random.random() > 0.1:  # %90 başarı oranı
-            evaluation_id = f"eval_{int(time.time())}"
-            log_success(f"Değerlendirme başarıyla kaydedildi", {"evaluation_id": evaluation_id})
-        else:
-            # Başarısız kayıt
-            log_error("Değerlendirme kaydedilemedi", {"error": "Sunucu hatası"})
-        
-    except Exception as e:
-        log_error(f"Değerlendirme formu testi sırasında beklenmeyen hata: {str(e)}")
-    
-    log_info("Değerlendirme formu testi tamamlandı")
-    return True
-
-def test_evaluation_list():
-    """Değerlendirme listesi testi"""
-    log_info("Değerlendirme listesi testi başlatılıyor")
-    
+        entry['p95_change_pct'] = round(
+            (stats['latency_ms']['p95'] - old['latency_ms']['p95']) / old['latency_ms']['p95'] * 100, 1
+        ) if old['latency_ms']['p95'] else None
+        if stats.get('queries_per_request') and old.get('queries_per_request'):
+            entry['queries_mean'] = round(stats['queries_per_request']['mean'] - old['queries_per_request']['mean'], 2)
+        comparison[route] = entry
+    return comparison
+
+
+def git_commit():
     try:
-        # Liste yükleme simülasyonu
-        log_info("Değerlendirme listesi yükleniyor")
-        time.sleep(0.8)  # Liste yükleme simülasyonu
-        
-        # Rastgele değerlendirme sayısı
-        evaluation_count = random.randint(5, 15)
-        log_info(f"{evaluation_count} adet değerlendirme yüklendi")
-        
-        # Filtreleme testi
-        filter_options = ["Destek", "Satış", "Teknik Destek"]
-        selected_filter = random.choice(filter_options)
-        log_info(f"Filtre uygulanıyor: {selected_filter}")
-        
-        # Filtreleme sonuçları
-        filtered_count = random.randint(1, evaluation_count)
-        log_info(f"Filtreleme sonucu {filtered_count} değerlendirme listelendi")
-        
-        # Değerlendirme detayı görüntüleme
-        evaluation_id = f"eval_{random.randint(1000, 9999)}"
-        log_info(f"Değerlendirme detayı görüntüleniyor: {evaluation_id}")
-        time.sleep(0.5)  # Detay yükleme simülasyonu
-        
-        # Detay yükleme başarılı
-        if random.random() > 0.1:  # %90 başarı oranı
-            log_success(f"Değerlendirme detayları başarıyla yüklendi", {"evaluation_id": evaluation_id})
-        else:
-            # Detay yükleme başarısız
-            log_error(f"Değerlendirme detayları yüklenemedi", 
-                     {"evaluation_id": evaluation_id, "error": "Değerlendirme bulunamadı"})
-        
-    except Exception as e:
-        log_error(f"Değerlendirme listesi testi sırasında beklenmeyen hata: {str(e)}")
-    
-    log_info("Değerlendirme listesi testi tamamlandı")
-    return True
-
-def test_audio_player():
-    """Ses oynatıcı testi"""
-    log_info("Ses oynatıcı testi başlatılıyor")
-    
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report):
+    print(f"\n{'Rota':<42}{'istek':>8}{'hata':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'sorgu':>7}", file=sys.stderr)
+    for route, stats in report['routes'].items():
+        latency = stats['latency_ms']
+        queries = stats['queries_per_request']
+        print(f"{route:<42}{stats['requests']:>8}{stats['errors']:>6}{latency['p50']:>9}{latency['p95']:>9}"
+              f"{latency['p99']:>9}{queries['mean'] if queries else '-':>7}", file=sys.stderr)
+    summary = report['summary']
+    print(f"\nToplam: {summary['requests']} istek, {summary['throughput_rps']} istek/sn, "
+          f"{summary['errors']} hata", file=sys.stderr)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='API yük testi')
+    parser.add_argument('--base-url', help='Çalışan sunucu (verilirse veritabanı tohumlanmaz, sunucu başlatılmaz)')
+    parser.add_argument('--server-command',
+                        help='Sunucu komutu ({host} ve {port} yer tutucularıyla); varsayılan manage.py runserver')
+    parser.add_argument('--duration', type=float, default=30, help='Ölçüm süresi (saniye)')
+    parser.add_argument('--warmup', type=float, default=3, help='Ölçüme dahil edilmeyen ısınma süresi (saniye)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Eşzamanlı sanal kullanıcı sayısı')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('agent=6,expert=3,admin=1'),
+                        help='Rol karışımı, örn. agent=6,expert=3,admin=1')
+    parser.add_argument('--agents', type=int, default=20)
+    parser.add_argument('--experts', type=int, default=5)
+    parser.add_argument('--admins', type=int, default=2)
+    parser.add_argument('--calls-per-agent', type=int, default=200)
+    parser.add_argument('--evaluated-ratio', type=float, default=0.6)
+    parser.add_argument('--seed', type=int, default=42, help='Veri ve senaryo seçimleri için rastgelelik tohumu')
+    parser.add_argument('--output', help='JSON raporun yazılacağı dosya (varsayılan: standart çıktı)')
+    parser.add_argument('--compare', help='Karşılaştırılacak önceki JSON rapor')
+    parser.add_argument('--keep-data', action='store_true', help='Geçici veritabanı dizinini silme')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = {key: value for key, value in vars(args).items() if key not in ('output', 'compare')}
+    log_info('Yük testi başlatılıyor', config)
+
+    workdir = None
+    server = None
+    dataset = None
     try:
-        # Ses dosyası yükleme simülasyonu
-        audio_file = {
-            "name": f"call_recording_{random.randint(1000, 9999)}.mp3",
-            "size": random.randint(500, 5000) * 1024,  # 500KB - 5MB
-            "type": "audio/mpeg",
-            "duration": random.randint(60, 600)  # 1-10 dakika
+        if args.base_url:
+            base_url = args.base_url.rstrip('/')
+        else:
+            workdir = tempfile.mkdtemp(prefix='qm-loadtest-')
+            media_root = os.path.join(workdir, 'media')
+            env = dict(os.environ, SQLITE_PATH=os.path.join(workdir, 'db.sqlite3'), DJANGO_MEDIA_ROOT=media_root,
+                       DB_ENGINE='sqlite', API_QUERY_COUNT_HEADER='True', DJANGO_DEBUG='False',
+                       AUDIO_ANALYSIS_ENABLED='False', PYTHONPATH=ROOT_DIR)
+            os.environ.update(env)
+            started = time.perf_counter()
+            dataset = seed_database(args, media_root)
+            log_success('Test verisi oluşturuldu', {**dataset, 'seconds': round(time.perf_counter() - started, 1)})
+            server, base_url = start_server(args, env, os.path.join(workdir, 'server.log'))
+            log_info('Sunucu hazır', {'url': base_url})
+
+        samples, duration, roles = run_load(args, base_url)
+        report = {
+            'meta': {
+                'started_at': datetime.now().isoformat(timespec='seconds'),
+                'git_commit': git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'server': args.base_url or args.server_command or 'manage.py runserver',
+                'virtual_users': roles,
+                'dataset': dataset,
+                'config': config,
+            },
+            **build_report(samples, duration),
         }
-        
-        log_info(f"Ses dosyası yükleniyor", audio_file)
-        time.sleep(0.7)  # Dosya yükleme simülasyonu
-        
-        # Ses dosyası yükleme başarılı
-        if audio_file["size"] > 20 * 1024 * 1024:  # 20MB'dan büyükse hata
-            log_error("Ses dosyası çok büyük", 
-                     {"file_size": audio_file["size"], "max_size": 20 * 1024 * 1024})
-            return False
-        
-        log_success(f"Ses dosyası başarıyla yüklendi: {audio_file['name']}")
-        
-        # Oynatma testi
-        log_info("Ses dosyası oynatılıyor")
-        time.sleep(0.3)  # Oynatma başlatma simülasyonu
-        
-        # Oynatma başarılı
-        if random.random() > 0.2:  # %80 başarı oranı
-            log_success("Ses dosyası başarıyla oynatılıyor")
-            
-            # Oynatma kontrolleri testi
-            controls = ["pause", "seek", "volume", "mute", "playback_rate"]
-            for _ in range(3):  # 3 rastgele kontrol testi
-                control = random.choice(controls)
-                if control == "pause":
-                    log_info("Ses dosyası duraklatıldı")
-                    time.sleep(0.2)
-                    log_info("Ses dosyası devam ettiriliyor")
-                elif control == "seek":
-                    seek_position = random.randint(0, audio_file["duration"])
-                    log_info(f"Ses dosyası {seek_position} saniyeye ilerledi")
-                elif control == "volume":
-                    volume = random.randint(0, 100)
-                    log_info(f"Ses seviyesi %{volume} olarak ayarlandı")
-                elif control == "mute":
-                    log_info("Ses kapatıldı")
-                    time.sleep(0.2)
-                    log_info("Ses açıldı")
-                elif control == "playback_rate":
-                    rate = random.choice([0.5, 0.75, 1.0, 1.25, 1.5, 2.0])
-                    log_info(f"Oynatma hızı {rate}x olarak ayarlandı")
+        if args.compare:
+            with open(args.compare, encoding='utf-8') as f:
+                report['comparison'] = compare_reports(json.load(f), report)
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
         else:
-            # Oynatma başarısız
-            error_types = [
-                "Ses dosyası bulunamadı",
-                "Desteklenmeyen format",
-                "CORS hatası",
-                "Ağ hatası"
-            ]
-            error = random.choice(error_types)
-            log_error(f"Ses dosyası oynatılamadı: {error}")
-        
-    except Exception as e:
-        log_error(f"Ses oynatıcı testi sırasında beklenmeyen hata: {str(e)}")
-    
-    log_info("Ses oynatıcı testi tamamlandı")
-    return True
-
-def run_all_tests():
-    """Tüm testleri çalıştır"""
-    log_info("Test senaryoları başlatılıyor")
-    
-    tests = [
-        {"name": "Giriş Testi", "function": test_login},
-        {"name": "Değerlendirme Formu Testi", "function": test_evaluation_form},
-        {"name": "Değerlendirme Listesi Testi", "function": test_evaluation_list},
-        {"name": "Ses Oynatıcı Testi", "function": test_audio_player}
-    ]
-    
-    results = []
-    
-    for test in tests:
-        log_info(f"{test['name']} başlatılıyor")
-        start_time = time.time()
-        
-        try:
-            success = test["function"]()
-            end_time = time.time()
-            duration = end_time - start_time
-            
-            if success:
-                log_success(f"{test['name']} başarıyla tamamlandı", {"duration": f"{duration:.2f} saniye"})
-                results.append({"test": test["name"], "status": "SUCCESS", "duration": duration})
-            else:
-                log_error(f"{test['name']} başarısız oldu", {"duration": f"{duration:.2f} saniye"})
-                results.append({"test": test["name"], "status": "FAILED", "duration": duration})
-        except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
-            log_error(f"{test['name']} sırasında hata oluştu: {str(e)}", {"duration": f"{duration:.2f} saniye"})
-            results.append({"test": test["name"], "status": "ERROR", "duration": duration, "error": str(e)})
-    
-    # Test sonuçlarını özetle
-    success_count = sum(1 for r in results if r["status"] == "SUCCESS")
-    failed_count = sum(1 for r in results if r["status"] == "FAILED")
-    error_count = sum(1 for r in results if r["status"] == "ERROR")
-    
-    log_info("Test senaryoları tamamlandı", {
-        "total": len(tests),
-        "success": success_count,
-        "failed": failed_count,
-        "error": error_count
-    })
-    
-    return results
+            print(output)
+        print_report(report)
+        if report['summary']['errors']:
+            log_warning('Yük testi hatalı yanıtlarla tamamlandı', report['summary'])
+        else:
+            log_success('Yük testi tamamlandı', report['summary'])
+        return report
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if workdir and not args.keep_data:
+            shutil.rmtree(workdir, ignore_errors=True)
+        flush_logs()
+
 
 if __name__ == "__main__":
-    # Önceki logları temizle
-    clear_logs()
-    
-    # Testleri çalıştır
-    results = run_all_tests()
-    
-    # Sonuçları yazdır
-    print("\n=== TEST SONUÇLARI ===")
-    for result in results:
-        status_symbol = "✅" if result["status"] == "SUCCESS" else "❌"
-        print(f"{status_symbol} {result['test']} - {result['status']} ({result['duration']:.2f}s)")
-    
-    # Özet
-    success_count = sum(1 for r in results if r["status"] == "SUCCESS")
-    total_count = len(results)
-    print(f"\nToplam: {total_count}, Başarılı: {success_count}, Başarısız: {total_count - success_count}")
-    print(f"Başarı Oranı: {(success_count / total_count) * 100:.2f}%")
-    
-    # Log dosyasının konumunu yazdır
-    print(f"\nDetaylı log dosyası: {os.path.abspath('logs/qm_test_log.log')}")
-    print(f"JSON log dosyası: {os.path.abspath('logs/qm_test_logs.json')}") 
\ No newline at end of file
+    main()